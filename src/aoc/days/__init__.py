@@ -1,55 +1,53 @@
-from . import (
-    day01,
-    day02,
-    day03,
-    day04,
-    day05,
-    day06,
-    day07,
-    day08,
-    day09,
-    day10,
-    day11,
-    day12,
-    day13,
-    day14,
-    day15,
-    day16,
-    day17,
-    day18,
-    day19,
-    day20,
-    day21,
-    day22,
-    day23,
-    day24,
-    day25,
-)
-
-__all__ = (
-    'day01',
-    'day02',
-    'day03',
-    'day04',
-    'day05',
-    'day06',
-    'day07',
-    'day08',
-    'day09',
-    'day10',
-    'day11',
-    'day12',
-    'day13',
-    'day14',
-    'day15',
-    'day16',
-    'day17',
-    'day18',
-    'day19',
-    'day20',
-    'day21',
-    'day22',
-    'day23',
-    'day24',
-    'day25',
-)
+"""
+Registry of the day modules.
+
+Day modules are discovered from the directories in this package, but they are
+only imported when first accessed (``days.day05``, ``get_day(5)`` or
+``from aoc.days import day05``), so running a single day does not pay for
+importing all the others.
+"""
+import importlib
+from pathlib import Path
+from types import ModuleType
+
+
+def module_name(day: int) -> str:
+    """Name of the module for a given day number, e.g. 5 -> 'day05'"""
+    return f"day{day:02d}"
+
+
+def _discover_days() -> dict[int, str]:
+    found = {}
+    for entry in Path(__file__).parent.iterdir():
+        name = entry.name
+        if name.startswith("day") and name[3:].isdigit() and (entry / "__init__.py").exists():
+            found[int(name[3:])] = name
+    return dict(sorted(found.items()))
+
+
+DAYS = _discover_days()  # Day number -> module name, without importing anything
+
+__all__ = tuple(DAYS.values())
+
+
+def available_days() -> list[int]:
+    """Day numbers that have a module, in order"""
+    return list(DAYS)
+
+
+def get_day(day: int) -> ModuleType | None:
+    """Import (if needed) and return the module for a day, None if there isn't one"""
+    name = DAYS.get(day)
+    if name is None:
+        return None
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
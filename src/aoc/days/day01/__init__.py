@@ -1,9 +1,19 @@
-import re
+import functools
 import logging
+import operator
+import re
+from collections import Counter
 from pathlib import Path
+from typing import Iterator, Mapping
+
+from aoc.utils import InputSource
+from aoc.utils.mapreduce import map_reduce
 
 log = logging.getLogger(__name__)
-_debug = False  ## Whether we are in debug mode
+_debug = False  # Whether we are in debug mode
+
+VECTORIZE_MIN_SIZE = 1024 * 1024  # Bytes, smaller documents are faster to scan than to set arrays up for
+VECTOR_BLOCK_SIZE = 16 * 1024 * 1024  # Bytes per block of lines, bounds the memory of the arrays
 
 NUMBERS = {
     'one': '1', 'two': '2', 'three': '3',
@@ -12,55 +22,151 @@ NUMBERS = {
 }
 
 
-def solve_first(input_file: Path):
-    with input_file.open("r") as fin:
-        total = 0
-        for line in fin:
-            digits = [c for c in line if str.isnumeric(c)]
-            calibration = int(digits[0] + digits[-1])
-            total += calibration
-
-            log.debug(f"{digits=}")
-            log.debug(f"{calibration=}")
-            log.debug(f"{total=}")
-    return str(total)
-
+DIGITS = {digit: digit for digit in "0123456789"}
+DIGITS_AND_NAMES = {**{digit: digit for digit in NUMBERS.values()}, **NUMBERS}
+BLANK_LINE = re.compile(rb'^[^\S\n]*$', re.MULTILINE)
+
+
+class CalibrationScanner:
+    """
+    Finds the first and the last calibration value of every line of a document,
+    from a dictionary of the tokens to look for (like '7' or 'seven') and the
+    digits they stand for.
+
+    Both searches are precompiled alternations of every token, run by the
+    regular expression engine over the whole document in one go, so no line
+    is ever split or copied. The first value is searched for lazily forward
+    from the start of each line, and the last one greedily: to the end of the
+    line and then backwards, one position at a time. Either way only the ends
+    of a line are looked at, up to its first and last tokens. Tokens can
+    overlap ('oneight' is 1 and 8), and when several start at the same place
+    the longest one wins. Blank lines have no values, any other line without
+    them is a ValueError.
+    """
+
+    def __init__(self, tokens: Mapping[str, str]):
+        self.values = {token.encode(): value for token, value in tokens.items()}
+        alternation = b'|'.join(re.escape(token) for token in sorted(self.values, key=len, reverse=True))
+        self._first = re.compile(rb'^.*?(' + alternation + rb')', re.MULTILINE)
+        self._last = re.compile(rb'^.*(' + alternation + rb')', re.MULTILINE)
+
+    def first_and_last(self, data: bytes) -> Iterator[tuple[str, str]]:
+        """The first and last values of every line with any"""
+        values = self.values.__getitem__
+        return zip(map(values, self._first.findall(data)), map(values, self._last.findall(data)))
+
+    def check_values(self, data: bytes, found: int):
+        """
+        Raise a ValueError for the first line that is not blank and has no
+        values, given how many lines with values were found. The count of lines
+        tells whether there is one, so only then are lines looked at one by one.
+        """
+        if found == data.count(b'\n') + (bool(data) and not data.endswith(b'\n')):
+            return
+        if found == data.count(b'\n') + 1 - len(BLANK_LINE.findall(data)):
+            return  # Only blank lines have none
+        for lineno, line in enumerate(data.split(b'\n'), 1):
+            if line.strip() and not self._first.match(line):
+                raise ValueError(f"No calibration value in line {lineno}: {line.decode(errors='replace')}")
+
+    def calibration_sum(self, data: bytes) -> int:
+        firsts = self._first.findall(data)
+        self.check_values(data, len(firsts))
+        # Few different pairs of tokens, each one only converted once
+        pairs = Counter(zip(firsts, self._last.findall(data)))
+        return sum(int(self.values[first] + self.values[last]) * count for (first, last), count in pairs.items())
+
+
+FIRST_PART_SCANNER = CalibrationScanner(DIGITS)
+SECOND_PART_SCANNER = CalibrationScanner(DIGITS_AND_NAMES)
+
+
+@functools.cache
+def _has_numpy() -> bool:
+    """
+    NumPy is optional, only to go faster on large documents, and it is only
+    imported for them: importing it costs more than scanning a puzzle input
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _vectorized_block(block: 'np.ndarray', scanner: CalibrationScanner) -> tuple[int, int]:
+    """The sum of the calibration values of a block, and how many lines had them"""
+    import numpy as np
+    tokens = list(scanner.values)
+    size = len(block)
+    # Index of the token that starts at every offset, -1 if none. Shortest
+    # tokens are marked first, so that the longest one wins where several start.
+    token_at = np.full(size, -1, dtype=np.int16)
+    for index in sorted(range(len(tokens)), key=lambda i: len(tokens[i])):
+        token = tokens[index]
+        starts = size - len(token) + 1
+        if starts <= 0:
+            continue
+        match = block[:starts] == token[0]
+        for offset in range(1, len(token)):
+            match &= block[offset:starts + offset] == token[offset]
+        token_at[:starts][match] = index
+
+    matched = np.flatnonzero(token_at >= 0)
+    if not matched.size:
+        return 0, 0
+    # Tokens have no line ends, so the line ends up to a match are the number of its line
+    line_of = np.cumsum(block == ord('\n'), dtype=np.int32)[matched]
+    line_changes = np.flatnonzero(np.diff(line_of)) + 1
+    firsts = token_at[matched[np.concatenate(([0], line_changes))]]
+    lasts = token_at[matched[np.concatenate((line_changes, [matched.size])) - 1]]
+
+    values = np.array([int(scanner.values[token]) for token in tokens], dtype=np.int64)
+    scales = np.array([10 ** len(scanner.values[token]) for token in tokens], dtype=np.int64)
+    return int((values[firsts] * scales[lasts] + values[lasts]).sum()), firsts.size
+
+
+def vectorized_calibration_sum(data: bytes, scanner: CalibrationScanner) -> int:
+    """
+    Same as scanner.calibration_sum, with NumPy: every token is matched at every
+    offset at once, and the first and last match of each line are taken from
+    where the line number of the matches changes. Goes over blocks of whole
+    lines, to keep the arrays of large documents within bounds.
+    """
+    import numpy as np
+    total = found = 0
+    for start, end in InputSource.from_bytes(data).line_chunks(VECTOR_BLOCK_SIZE):
+        block_sum, block_found = _vectorized_block(np.frombuffer(data, dtype=np.uint8, count=end - start,
+                                                                 offset=start), scanner)
+        total += block_sum
+        found += block_found
+    scanner.check_values(data, found)
+    return total
+
+
+def calibration_sum(data: bytes, scanner: CalibrationScanner) -> int:
+    """Sum of the calibration values of every line, the fold for both parts"""
+    if _debug:
+        for lineno, (first, last) in enumerate(scanner.first_and_last(data)):
+            log.debug("%d -> first=%s last=%s", lineno + 1, first, last)
+    if len(data) >= VECTORIZE_MIN_SIZE and _has_numpy():
+        return vectorized_calibration_sum(data, scanner)
+    return scanner.calibration_sum(data)
 
-def _get_digits_with_names(line: str) -> list[str]:
-    # Make a pattern oring all digits and number names
-    pattern = f"{'|'.join(list(NUMBERS.keys()) + list(NUMBERS.values()))}"
-    regex = re.compile(pattern)
 
-    values = []
+def solve_first(input_file: Path):
+    return str(calibration_sum(input_file.read_bytes(), FIRST_PART_SCANNER))
 
-    # User re.search with a position parameter to ensure we consider digit names
-    # that are overlapping (by starting the next search one character after the
-    # start of the last match.)
-    pos = 0
-    while m := regex.search(line, pos):
-        pos = m.start() + 1
-        values.append(m.group(0))
 
-    log.debug(f"{values=}")
+def solve_second(input_file: Path):
+    return str(calibration_sum(input_file.read_bytes(), SECOND_PART_SCANNER))
 
-    def _to_digit(value):
-        """Turn '1' or 'one' into '1', '2' or 'two' into '2', etc."""
-        return value if value.isnumeric() else str(NUMBERS.get(value))
 
-    return [_to_digit(v) for v in (values[0], values[-1])]
+def solve_first_parallel(input_file: Path, jobs: int | None = None):
+    mapper = functools.partial(calibration_sum, scanner=FIRST_PART_SCANNER)
+    return str(map_reduce(input_file, mapper, operator.add, jobs=jobs, binary=True))
 
 
-def solve_second(input_file: Path):
-    with input_file.open("r") as fin:
-        total = 0
-        for lineno, line in enumerate(fin):
-            log.debug(f"\n{lineno + 1} -> {line.strip()}")
-
-            digits = _get_digits_with_names(line)
-            calibration = int(digits[0] + digits[-1])
-            total += calibration
-
-            log.debug(f"{digits=}")
-            log.debug(f"{calibration=}")
-            log.debug(f"{total=}")
-    return str(total)
+def solve_second_parallel(input_file: Path, jobs: int | None = None):
+    mapper = functools.partial(calibration_sum, scanner=SECOND_PART_SCANNER)
+    return str(map_reduce(input_file, mapper, operator.add, jobs=jobs, binary=True))
@@ -0,0 +1,32 @@
+"""
+Synthetic calibration documents of any size
+"""
+import random
+
+from aoc.days.day01 import NUMBERS
+from aoc.utils import Part
+
+BASE_SIZE = 100  # Lines
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def generate_line(rng: random.Random) -> str:
+    pieces = [str(rng.randint(1, 9))]  # Every line needs a digit for the first part
+    for _ in range(rng.randint(2, 10)):
+        kind = rng.random()
+        if kind < 0.6:
+            pieces.append("".join(rng.choices(LETTERS, k=rng.randint(1, 4))))
+        elif kind < 0.8:
+            pieces.append(rng.choice(list(NUMBERS)))
+        else:
+            pieces.append(str(rng.randint(1, 9)))
+    rng.shuffle(pieces)
+    return "".join(pieces)
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A document with as many lines as the size"""
+    rng = random.Random(seed)
+    return "".join(f"{generate_line(rng)}\n" for _ in range(size))
@@ -1,3 +1,9 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
 from aoc.days import day01 as today
 
 
@@ -32,3 +38,57 @@ def test_first_solution(day_input, part1_solution):
 def test_second_solution(day_input, part2_solution):
     assert part2_solution is not None
     assert today.solve_second(day_input) == part2_solution
+
+
+def test_second_overlapping_names(input_file_factory):
+    input_file = input_file_factory("""
+        oneight
+        7twone
+        """)
+    assert today.solve_second(input_file) == str(18 + 71)
+
+
+def test_scanner_with_other_names():
+    scanner = today.CalibrationScanner({**today.DIGITS, 'uno': '1', 'dos': '2', 'seis': '6', 'diez': '10'})
+    data = b"xdosx3seisx\r\nunodiez\r\n4\r\n"
+    assert list(scanner.first_and_last(data)) == [('2', '6'), ('1', '10'), ('4', '4')]
+    assert scanner.calibration_sum(data) == 26 + 110 + 44
+
+
+@pytest.mark.parametrize('scanner', (today.FIRST_PART_SCANNER, today.SECOND_PART_SCANNER))
+def test_vectorized_calibration_sum(scanner):
+    pytest.importorskip('numpy')
+    data = b"two1nine\r\neightwo3three\n\n \r\n1oneight\n7pqrstsixteen\n5"
+    assert today.vectorized_calibration_sum(data, scanner) == scanner.calibration_sum(data)
+    assert today.vectorized_calibration_sum(b"", scanner) == 0
+    with pytest.raises(ValueError, match="line 2: no digits"):
+        today.vectorized_calibration_sum(b"1\nno digits\n2\n", scanner)
+
+
+@pytest.mark.parametrize('data, expected', (
+    (b"", 0),
+    (b"\n\n", 0),
+    (b"a1b\n\n \t\r\n2\n", 11 + 22),
+    (b"a1b\r\n\r\nc2", 11 + 22),
+))
+def test_blank_lines_have_no_calibration_value(data, expected):
+    assert today.FIRST_PART_SCANNER.calibration_sum(data) == expected
+
+
+@pytest.mark.parametrize('data, message', (
+    (b"1\nno digits\n2\n", "line 2: no digits"),
+    (b"1\n\nnine\n", "line 3: nine"),
+    (b"nothing", "line 1: nothing"),
+))
+def test_lines_without_calibration_value(data, message):
+    with pytest.raises(ValueError, match=message):
+        today.FIRST_PART_SCANNER.calibration_sum(data)
+
+
+def test_numpy_is_only_imported_for_large_documents():
+    # A fresh interpreter, as anything else in the session may have imported it
+    script = ("import sys; from aoc.days import day01; from aoc.utils import InputSource; "
+              "day01.solve_second(InputSource.from_text('two1nine\\n')); print('numpy' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, check=True, encoding='utf-8',
+                            cwd=Path(today.__file__).parents[3])
+    assert result.stdout.strip() == 'False'
@@ -1,10 +1,18 @@
+import bisect
+import functools
+import heapq
+import operator
 import re
-from dataclasses import dataclass, astuple
+from array import array
+from dataclasses import dataclass, astuple, field
 import logging
 from pathlib import Path
 
+from aoc.utils import Part
+from aoc.utils.mapreduce import map_reduce
+
 log = logging.getLogger(__name__)
-_debug = False  ## Whether we are in debug mode
+_debug = False  # Whether we are in debug mode
 
 CUBE_LIMITS = {
     'red': 12,
@@ -12,6 +20,12 @@ CUBE_LIMITS = {
     'blue': 14,
 }
 
+COLOUR_PATTERN = re.compile(r'(\d+) (red|green|blue)')
+GAME_PATTERN = re.compile(r'Game (\d+): (.+)\s*')
+# The start of a game, a number of cubes of a colour or the end of a play, for a single pass over a whole record
+TOKEN_PATTERN = re.compile(rb'Game (\d+):|(\d+) (red|green|blue)|;')
+NEGATIVE_PATTERN = re.compile(rb'-\d+ (?:red|green|blue)')
+
 
 @dataclass
 class CubeSet:
@@ -31,12 +45,12 @@ class CubeSet:
 
     @classmethod
     def from_line(cls, play: str):
-        colour_pattern = re.compile(r'(\d+) (red|green|blue)')
         cubes = {colour: 0 for colour in ('red', 'green', 'blue')}
-        play_cubes = {colour: int(number) for number, colour in colour_pattern.findall(play)}
+        play_cubes = {colour: int(number) for number, colour in COLOUR_PATTERN.findall(play)}
 
         result = cls(**dict(cubes, **play_cubes))
-        log.debug("Extracted %s -> %s", play_cubes, result)
+        if _debug:
+            log.debug("Extracted %s -> %s", play_cubes, result)
         return result
 
 
@@ -47,8 +61,7 @@ class Game:
 
     @classmethod
     def from_line(cls, line: str):
-        game_pattern = re.compile(r'Game (\d+): (.+)\s*')
-        m = game_pattern.match(line)
+        m = GAME_PATTERN.match(line)
         if not m:
             raise ValueError(f"Unexpected line format: {line}")
         game_id, plays_spec = m.groups()
@@ -65,15 +78,199 @@ class Game:
         return red * green * blue
 
 
+@dataclass
+class CubeLimits(CubeSet):
+    """How many cubes of each colour are in the bag, which unlike a play can be none at all"""
+
+    def __post_init__(self):
+        if any(v < 0 for v in (self.red, self.green, self.blue)):
+            raise ValueError("Negative values not allowed")
+
+
+class _Fenwick:
+    """Sums over the prefixes [1, position] of 1..size, with point additions"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, position: int, value: int):
+        while position <= self.size:
+            self._tree[position] += value
+            position += position & -position
+
+    def prefix_sum(self, position: int) -> int:
+        total = 0
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+
+_POINT, _QUERY = 0, 1  # Points go first among events with the same x, so they count for the queries there
+
+
+def _dominance_sums(points: list[tuple[int, int, int, int]], queries: list[tuple[int, int, int]],
+                    size: int) -> list[int]:
+    """
+    For every query (x, y, z), the sum of the weights of the points (x, y, z,
+    weight) that are at most the query in every coordinate, with z a position
+    in 1..size.
+
+    Offline, by divide and conquer over the points and queries in order of x
+    (CDQ): each half is solved on its own, and then the points of the first
+    half are added up for the queries of the second, sweeping both by y with a
+    Fenwick tree over z. That is O(n log² n) for n points and queries, with
+    memory linear in them.
+    """
+    events = sorted([(x, _POINT, y, z, weight) for x, y, z, weight in points]
+                    + [(x, _QUERY, y, z, index) for index, (x, y, z) in enumerate(queries)])
+    sums = [0] * len(queries)
+    tree = _Fenwick(size)
+
+    def by_y(lo: int, hi: int) -> list[tuple]:
+        """Count the points for the queries within events[lo:hi], and return those events sorted by y"""
+        if hi - lo == 1:
+            return [events[lo]]
+        mid = (lo + hi) // 2
+        first, second = by_y(lo, mid), by_y(mid, hi)
+        added = []
+        next_point = 0
+        for _, kind, y, z, index in second:
+            if kind != _QUERY:
+                continue
+            while next_point < len(first) and first[next_point][2] <= y:
+                point = first[next_point]
+                if point[1] == _POINT:
+                    tree.add(point[3], point[4])
+                    added.append(point)
+                next_point += 1
+            sums[index] += tree.prefix_sum(z)
+        for point in added:
+            tree.add(point[3], -point[4])  # Empty again for the next merge
+        return list(heapq.merge(first, second, key=operator.itemgetter(2)))
+
+    if events:
+        by_y(0, len(events))
+    return sums
+
+
+def _uint_column() -> array:
+    return array('I')
+
+
+@dataclass
+class GameMaxima:
+    """
+    The most cubes of each colour shown in every game, which is all that either
+    part needs, in a column per colour. Parsing straight into these columns
+    skips building a Game and its CubeSets for every line.
+    """
+    ids: array = field(default_factory=_uint_column)
+    red: array = field(default_factory=_uint_column)
+    green: array = field(default_factory=_uint_column)
+    blue: array = field(default_factory=_uint_column)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'GameMaxima':
+        maxima = cls()
+        columns = {b'red': maxima.red, b'green': maxima.green, b'blue': maxima.blue}
+        if negative := NEGATIVE_PATTERN.search(data):
+            raise ValueError(f"Negative values not allowed: {negative[0].decode()}")
+        empty_play = False  # Whether the current play has shown no cubes yet
+        try:
+            for game_id, number, colour in TOKEN_PATTERN.findall(data):
+                if number:
+                    column = columns[colour]
+                    if (count := int(number)) > column[-1]:
+                        column[-1] = count
+                    empty_play = False
+                elif game_id:
+                    if empty_play:
+                        raise ValueError(f"Zero Set not valid in game {maxima.ids[-1]}")
+                    maxima.ids.append(int(game_id))
+                    for column in columns.values():
+                        column.append(0)
+                    empty_play = True
+                elif maxima.ids:  # A ; before any game is left to the check of the lines
+                    if empty_play:
+                        raise ValueError(f"Zero Set not valid in game {maxima.ids[-1]}")
+                    empty_play = True
+        except IndexError:  # No game to count the cubes for
+            raise ValueError("Cubes shown before the first game") from None
+        if empty_play:
+            raise ValueError(f"Zero Set not valid in game {maxima.ids[-1]}")
+        lines = data.count(b'\n') + (bool(data) and not data.endswith(b'\n'))
+        if len(maxima.ids) != lines:
+            # Only worth looking for the culprit when there is one
+            for line in data.decode().splitlines():
+                if not GAME_PATTERN.match(line):
+                    raise ValueError(f"Unexpected line format: {line}")
+        return maxima
+
+    def possible_id_sum(self, available_cubes: CubeSet) -> int:
+        red, green, blue = astuple(available_cubes)
+        return sum(game_id for game_id, r, g, b in zip(self.ids, self.red, self.green, self.blue)
+                   if r <= red and g <= green and b <= blue)
+
+    def possible_id_sums(self, limits: list[CubeSet]) -> list[int]:
+        """
+        possible_id_sum for many limits at once, without going over every game
+        for each: the sums of the ids of the games that have no more cubes of
+        any colour than each limit, counted offline over the games and limits
+        ordered by red (see _dominance_sums). O((games + limits) log²).
+        """
+        blues = sorted(set(self.blue))
+        games = [(red, green, bisect.bisect_left(blues, blue) + 1, game_id)
+                 for game_id, red, green, blue in zip(self.ids, self.red, self.green, self.blue)]
+        # The positions of the blues of the games that a limit allows are 1 up to this one
+        queries = [(limit.red, limit.green, bisect.bisect_right(blues, limit.blue)) for limit in limits]
+        return _dominance_sums(games, queries, len(blues))
+
+    def power_sum(self) -> int:
+        return sum(map(operator.mul, map(operator.mul, self.red, self.green), self.blue))
+
+    def answer(self, part: Part) -> int:
+        if part == Part.FIRST:
+            return self.possible_id_sum(CubeSet(**CUBE_LIMITS))
+        return self.power_sum()
+
+
+def parse(input_file: Path) -> GameMaxima:
+    return GameMaxima.from_bytes(input_file.read_bytes())
+
+
+def solve(maxima: GameMaxima, part: Part) -> str | None:
+    return str(maxima.answer(part))
+
+
+def parse_limits(queries_file: Path) -> list[CubeLimits]:
+    """A set of cube limits per line, written like a play: 12 red, 13 green, 14 blue"""
+    return [CubeLimits.from_line(line) for line in queries_file.read_text().splitlines() if line.strip()]
+
+
+def solve_queries(input_file: Path, queries_file: Path) -> list[str]:
+    """The first part for every set of cube limits in the queries file, in order"""
+    return [str(answer) for answer in parse(input_file).possible_id_sums(parse_limits(queries_file))]
+
+
+def _chunk_answer(data: bytes, part: Part) -> int:
+    return GameMaxima.from_bytes(data).answer(part)
+
+
 def solve_first(input_file: Path) -> str | None:
-    with input_file.open("r") as fin:
-        max_cubes = CubeSet(**CUBE_LIMITS)
-        games = (Game.from_line(line) for line in fin)
-        possible_games = (game for game in games if game.possible_with(max_cubes))
-        total = sum(game.id for game in possible_games)
-        return str(total)
+    return solve(parse(input_file), Part.FIRST)
 
 
 def solve_second(input_file: Path) -> str | None:
-    with input_file.open("r") as fin:
-        return str(sum(Game.from_line(line).power for line in fin))
+    return solve(parse(input_file), Part.SECOND)
+
+
+def solve_first_parallel(input_file: Path, jobs: int | None = None) -> str | None:
+    return str(map_reduce(input_file, functools.partial(_chunk_answer, part=Part.FIRST), operator.add, jobs=jobs,
+                          binary=True))
+
+
+def solve_second_parallel(input_file: Path, jobs: int | None = None) -> str | None:
+    return str(map_reduce(input_file, functools.partial(_chunk_answer, part=Part.SECOND), operator.add, jobs=jobs,
+                          binary=True))
@@ -0,0 +1,26 @@
+"""
+Synthetic game records of any size
+"""
+import random
+
+from aoc.utils import Part
+
+BASE_SIZE = 100  # Games
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+COLOURS = ("red", "green", "blue")
+
+
+def generate_play(rng: random.Random) -> str:
+    colours = rng.sample(COLOURS, rng.randint(1, 3))
+    return ", ".join(f"{rng.randint(1, 20)} {colour}" for colour in colours)
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A record with as many games as the size"""
+    rng = random.Random(seed)
+    lines = []
+    for game_id in range(1, size + 1):
+        plays = "; ".join(generate_play(rng) for _ in range(rng.randint(1, 6)))
+        lines.append(f"Game {game_id}: {plays}\n")
+    return "".join(lines)
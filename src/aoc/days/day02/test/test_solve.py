@@ -1,4 +1,9 @@
 import logging
+import random
+from dataclasses import astuple
+
+import pytest
+
 from aoc.days import day02 as today
 
 logging.basicConfig(level=logging.DEBUG)
@@ -30,3 +35,62 @@ def test_first_solution(day_input, part1_solution):
 def test_second_solution(day_input, part2_solution):
     assert part2_solution is not None
     assert today.solve_second(day_input) == part2_solution
+
+
+def test_game_maxima_match_games():
+    lines = [line.strip() for line in EXAMPLE_INPUT.strip().splitlines()]
+    maxima = today.GameMaxima.from_bytes("\n".join(lines).encode())
+    games = [today.Game.from_line(line) for line in lines]
+    assert list(maxima.ids) == [game.id for game in games]
+    for game, red, green, blue in zip(games, maxima.red, maxima.green, maxima.blue):
+        assert (red, green, blue) == tuple(max(cubes) for cubes in zip(*(astuple(play) for play in game.plays)))
+    assert maxima.power_sum() == sum(game.power for game in games)
+
+
+def test_possible_id_sums(input_file_factory):
+    maxima = today.parse(input_file_factory(EXAMPLE_INPUT))
+    limits = [today.CubeSet(red, green, blue) for red in (0, 4, 12, 20) for green in (0, 3, 13) for blue in (1, 6, 15)]
+    assert maxima.possible_id_sums(limits) == [maxima.possible_id_sum(limit) for limit in limits]
+    assert maxima.possible_id_sums([]) == []
+
+
+def test_possible_id_sums_random_games():
+    rng = random.Random(2)
+    lines = [f"Game {game_id}: {rng.randint(1, 30)} red, {rng.randint(1, 30)} green, {rng.randint(1, 30)} blue"
+             for game_id in range(1, 301)]
+    maxima = today.GameMaxima.from_bytes("\n".join(lines).encode())
+    limits = [today.CubeLimits(0, 0, 0)] + [today.CubeLimits(*(rng.randint(0, 32) for _ in range(3)))
+                                            for _ in range(200)]
+    assert maxima.possible_id_sums(limits) == [maxima.possible_id_sum(limit) for limit in limits]
+
+
+def test_solve_queries(input_file_factory, tmp_path):
+    queries_file = tmp_path / 'queries'
+    queries_file.write_text("12 red, 13 green, 14 blue\n\n20 red, 20 green, 20 blue\n1 red\n0 red, 0 green, 0 blue\n")
+    assert today.solve_queries(input_file_factory(EXAMPLE_INPUT), queries_file) == ['8', '15', '0', '0']
+
+
+def test_limits_cannot_be_negative():
+    with pytest.raises(ValueError):
+        today.CubeLimits(-1, 0, 0)
+
+
+@pytest.mark.parametrize('record, message', (
+    ("3 red\nGame 1: 1 blue", "before the first game"),
+    ("Game 1: 1 blue; ; 2 red", "Zero Set not valid in game 1"),
+    ("Game 1: 1 blue\nGame 2: \nGame 3: 2 red", "Zero Set not valid in game 2"),
+    ("Game 1: 1 blue;", "Zero Set not valid in game 1"),
+    ("Game 1: 1 blue, -2 red", "Negative values not allowed"),
+    ("Game 1: 3 rainbow", "Zero Set not valid in game 1"),
+))
+def test_game_maxima_reject_invalid_records(record, message):
+    with pytest.raises(ValueError, match=message):
+        today.GameMaxima.from_bytes(record.encode())
+
+
+def test_game_maxima_only_count_colour_names():
+    line = "Game 1: 3 rainbow, 2 green; 4 blueberries"
+    maxima = today.GameMaxima.from_bytes(line.encode())
+    game = today.Game.from_line(line)
+    assert (maxima.red[0], maxima.green[0], maxima.blue[0]) == (0, 2, 4)
+    assert [astuple(play) for play in game.plays] == [(0, 2, 0), (0, 0, 4)]
@@ -1,10 +1,12 @@
 import logging
 import re
-from typing import Generator, NamedTuple
+from typing import Generator, Iterator, NamedTuple
 from pathlib import Path
 
+from aoc.utils import Part
+
 log = logging.getLogger(__name__)
-_debug = False  ## Whether we are in debug mode
+_debug = False  # Whether we are in debug mode
 
 PATTERN = re.compile(r"(?P<number>\d+)|(?P<symbol>[^0-9.\n])")
 
@@ -62,44 +64,90 @@ class Symbol(NamedTuple):
         return num1.value * num2.value
 
 
-def parse_input(input_content: str) -> tuple[set[Symbol], set[Number]]:
-    symbols: set[Symbol] = set()
-    numbers: set[Number] = set()
-    for line_no, line in enumerate(input_content.splitlines()):
+class Schematic(NamedTuple):
+    """
+    Symbols and numbers, and a grid of what is at every cell, so that what is
+    adjacent to something is found by looking at the cells around it, and not
+    by checking every symbol against every number.
+
+    The grid is flat, a row after another, with an empty border all around so
+    that the cells around any symbol or number are always in it. The cells
+    around a number or a symbol are then three slices of the grid, one per row.
+    """
+    symbols: set[Symbol]
+    numbers: set[Number]
+    width: int  # Of the rows of the grid, border included
+    symbol_at: list[Symbol | None]
+    number_at: list[Number | None]  # Every cell of every number
+
+    def cell(self, line: int, col: int) -> int:
+        return (line + 1) * self.width + col + 1
+
+    def around(self, line: int, col_first: int, col_last: int) -> Iterator[slice]:
+        """Slices of the three rows of cells of a span of a line, and around it"""
+        for row in (line - 1, line, line + 1):
+            start = self.cell(row, col_first - 1)
+            yield slice(start, start + col_last - col_first + 3)
+
+
+def parse_input(input_content: str) -> Schematic:
+    lines = input_content.splitlines()
+    width = max(map(len, lines), default=0) + 2
+    size = (len(lines) + 2) * width
+    schematic = Schematic(set(), set(), width, [None] * size, [None] * size)
+    for line_no, line in enumerate(lines):
         for m in PATTERN.finditer(line):
             if m.group("symbol") is not None:
                 symbol = Symbol.from_match(m, line_no)
-                symbols.add(symbol)
-                log.debug("Symbol %s at %s", symbol.value, (symbol.line, symbol.col))
+                schematic.symbols.add(symbol)
+                schematic.symbol_at[schematic.cell(symbol.line, symbol.col)] = symbol
+                if _debug:
+                    log.debug("Symbol %s at %s", symbol.value, (symbol.line, symbol.col))
             elif m.group("number") is not None:
                 number = Number.from_match(m, line_no)
-                numbers.add(number)
-                log.debug(
-                    "Number %s at %s", number.value, (number.line, number.col_first)
-                )
-    return symbols, numbers
+                schematic.numbers.add(number)
+                start = schematic.cell(number.line, number.col_first)
+                length = number.col_last - number.col_first + 1
+                schematic.number_at[start:start + length] = [number] * length
+                if _debug:
+                    log.debug("Number %s at %s", number.value, (number.line, number.col_first))
+    return schematic
+
+
+def get_parts(schematic: Schematic) -> Generator[int, None, None]:
+    symbol_at = schematic.symbol_at
+    for number in schematic.numbers:
+        if any(any(symbol_at[cells]) for cells in schematic.around(number.line, number.col_first, number.col_last)):
+            yield number.value
 
 
-def get_parts(symbols: set[Symbol], numbers: set[Number]) -> Generator[int, None, None]:
-    for number in numbers:
-        if any(number.is_adjacent_to(symbol) for symbol in symbols):
-            yield number.value
+def get_gear_ratios(schematic: Schematic) -> Generator[int, None, None]:
+    number_at = schematic.number_at
+    for symbol in schematic.symbols:
+        if symbol.value != "*":
+            continue
+        adjacent_numbers = set()
+        for cells in schematic.around(symbol.line, symbol.col, symbol.col):
+            adjacent_numbers.update(number_at[cells])
+        adjacent_numbers.discard(None)
+        if len(adjacent_numbers) == 2:
+            num1, num2 = adjacent_numbers
+            yield num1.value * num2.value
+
+
+def parse(input_file: Path) -> Schematic:
+    return parse_input(input_file.read_text())
 
 
-def get_gear_ratios(
-    symbols: set[Symbol], numbers: set[Number]
-) -> Generator[int, None, None]:
-    for symbol in symbols:
-        ratio = symbol.gear_ratio(numbers)
-        if ratio is not None:
-            yield ratio
+def solve(schematic: Schematic, part: Part) -> str:
+    if part == Part.FIRST:
+        return str(sum(get_parts(schematic)))
+    return str(sum(get_gear_ratios(schematic)))
 
 
 def solve_first(input_file: Path) -> str:
-    symbols, numbers = parse_input(input_file.read_text())
-    return str(sum(get_parts(symbols, numbers)))
+    return solve(parse(input_file), Part.FIRST)
 
 
 def solve_second(input_file: Path) -> str:
-    symbols, numbers = parse_input(input_file.read_text())
-    return str(sum(get_gear_ratios(symbols, numbers)))
+    return solve(parse(input_file), Part.SECOND)
@@ -0,0 +1,33 @@
+"""
+Synthetic engine schematics of any size
+"""
+import random
+
+from aoc.utils import Part
+
+BASE_SIZE = 100  # Rows
+WIDTH = 20
+# Only the cells around each number and symbol are looked at
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+SYMBOLS = "*#+$/@=%&-"
+
+
+def generate_row(rng: random.Random) -> str:
+    row = []
+    while len(row) < WIDTH:
+        kind = rng.random()
+        if kind < 0.15:
+            row.extend(str(rng.randint(1, 999)))
+            row.append(".")
+        elif kind < 0.25:
+            row.append("*" if rng.random() < 0.4 else rng.choice(SYMBOLS))
+        else:
+            row.append(".")
+    return "".join(row[:WIDTH])
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A schematic with as many rows as the size"""
+    rng = random.Random(seed)
+    return "".join(f"{generate_row(rng)}\n" for _ in range(size))
@@ -32,3 +32,12 @@ def test_first_solution(day_input, part1_solution):
 def test_second_solution(day_input, part2_solution):
     assert part2_solution is not None
     assert today.solve_second(day_input) == part2_solution
+
+
+def test_grid_index_matches_pairwise_checks():
+    from aoc.days.day03.generator import generate
+    schematic = today.parse_input(generate(50, seed=3) + "*12\n3*4\n")
+    parts = [n.value for n in schematic.numbers if any(n.is_adjacent_to(s) for s in schematic.symbols)]
+    ratios = [ratio for s in schematic.symbols if (ratio := s.gear_ratio(schematic.numbers)) is not None]
+    assert sorted(today.get_parts(schematic)) == sorted(parts)
+    assert sorted(today.get_gear_ratios(schematic)) == sorted(ratios)
@@ -1,9 +1,13 @@
 import logging
+import operator
 import re
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 
+from aoc.utils import Part
+from aoc.utils.mapreduce import map_reduce
+
 log = logging.getLogger(__name__)
 _debug = False  # Whether we are in debug mode
 
@@ -48,21 +52,42 @@ class Card:
 def parse_input(input_file: Path):
     for line in input_file.read_text().splitlines():
         card = Card.from_line(line)
-        log.debug(f"{card=}")
+        if _debug:
+            log.debug("card=%s", card)
         yield card
 
 
-def solve_first(input_file: Path) -> str | None:
-    return str(sum(card.worth for card in parse_input(input_file)))
-
-
-def solve_second(input_file: Path) -> str | None:
-    cards = list(parse_input(input_file))
+def total_cards(cards: list[Card]) -> int:
     card_counts = Counter()
     for card in cards:
         card_counts[card.id] += 1
         for _ in range(card_counts[card.id]):
             for copy_id in card.copies_won:
                 card_counts[copy_id] += 1
+    return sum(card_counts.values())
+
+
+def parse(input_file: Path) -> list[Card]:
+    return list(parse_input(input_file))
+
+
+def solve(cards: list[Card], part: Part) -> str | None:
+    if part == Part.FIRST:
+        return str(sum(card.worth for card in cards))
+    return str(total_cards(cards))
+
+
+def solve_first(input_file: Path) -> str | None:
+    return str(sum(card.worth for card in parse_input(input_file)))
+
+
+def solve_second(input_file: Path) -> str | None:
+    return solve(parse(input_file), Part.SECOND)
+
+
+def _worth_sum(text: str) -> int:
+    return sum(Card.from_line(line).worth for line in text.splitlines())
+
 
-    return str(sum(card_counts.values()))
+def solve_first_parallel(input_file: Path, jobs: int | None = None) -> str | None:
+    return str(map_reduce(input_file, _worth_sum, operator.add, jobs=jobs))
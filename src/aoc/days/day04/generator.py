@@ -0,0 +1,36 @@
+"""
+Synthetic scratchcard tables of any size
+"""
+import random
+
+from aoc.utils import Part
+
+BASE_SIZE = 10  # Cards
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+NUMBERS = 10
+WINNING = 25
+# Matches per card and their weights. Fewer than one match on average keeps the
+# number of copies bounded, as in the real puzzle, instead of exploding.
+MATCHES = (0, 1, 2, 3, 4)
+MATCH_WEIGHTS = (60, 25, 8, 5, 2)
+
+
+def generate_card(rng: random.Random, card_id: int, matches: int) -> str:
+    pool = rng.sample(range(1, 100), NUMBERS + WINNING - matches)
+    numbers = pool[:NUMBERS]
+    winning = numbers[:matches] + pool[NUMBERS:]
+    rng.shuffle(winning)
+    return (f"Card {card_id:>3}: {' '.join(f'{n:>2}' for n in numbers)} | "
+            f"{' '.join(f'{n:>2}' for n in winning)}")
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A table with as many cards as the size"""
+    rng = random.Random(seed)
+    lines = []
+    for card_id in range(1, size + 1):
+        # Cards never make copies past the end of the table
+        matches = min(rng.choices(MATCHES, MATCH_WEIGHTS)[0], size - card_id)
+        lines.append(f"{generate_card(rng, card_id, matches)}\n")
+    return "".join(lines)
@@ -1,11 +1,14 @@
+import bisect
 import itertools
 import logging
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
 
+from aoc.utils import Part
+
 log = logging.getLogger(__name__)
 _debug = False  # Whether we are in debug mode
 
@@ -122,6 +125,7 @@ class MultiRangeMap:
     name: str
     range_maps: list[RangeMap]
     full_range: Range = field(init=False, repr=False, hash=False)
+    _starts: list[int] = field(init=False, repr=False, hash=False)  # Where each map starts, to bisect
 
     def __post_init__(self):
         range_maps = list(sorted(self.range_maps))
@@ -130,6 +134,7 @@ class MultiRangeMap:
         full_range = Range(first, last - first + 1)
         object.__setattr__(self, 'range_maps', range_maps)
         object.__setattr__(self, 'full_range', full_range)
+        object.__setattr__(self, '_starts', [a_map.source.first for a_map in range_maps])
 
     def get_map_for(self, value: int) -> RangeMap:
         if not self.range_maps:
@@ -139,19 +144,17 @@ class MultiRangeMap:
             return RangeMap(Range(0, self.full_range.first), 0)
         if value > self.full_range.last:
             return RangeMap(Range(self.full_range.last + 1, sys.maxsize - self.full_range.last), 0)
-        for a_map in self.range_maps:
-            if value < a_map.source.first:
-                break
-            if value in a_map.source:
-                return a_map
-        for gap in self.gaps:
-            if value in gap:
-                return RangeMap(gap, 0)
-
-        raise NotImplementedError(f"Wrong assumption, should ahve found a map for: {value}")
+        # The last map that starts at or before the value, which is within the full range
+        index = bisect.bisect_right(self._starts, value) - 1
+        a_map = self.range_maps[index]
+        if value in a_map.source:
+            return a_map
+        # In the gap up to the next one
+        gap_first = a_map.source.last + 1
+        return RangeMap(Range(gap_first, self._starts[index + 1] - gap_first), 0)
 
     def apply(self, input_ranges: MultiRange):
-        transitioned_ranges = MultiRange()
+        transitioned_ranges = []
 
         # Put the input ranges in a stack. Check if a mapping can be applied to each range in full and if this is
         # not possible, split the range into a new range that can be mapped, and another that cannot. Then push this
@@ -159,32 +162,36 @@ class MultiRangeMap:
         # In the end there should be a collection of input ranges that represent the same elements as the original set
         # but where each of them could be mapped with a single mapping.
         # The mapping, in this case, is simply to add an offset to the first element.
-        input_range_stack = input_ranges.ranges[:]
+        input_range_stack = deque(input_ranges.ranges)
 
         while input_range_stack:
             if _debug:
                 for r in input_range_stack:
                     log.debug("Stack: %s", r)
 
-            seed_range = input_range_stack.pop(0)
+            seed_range = input_range_stack.popleft()
             a_map = self.get_map_for(seed_range.first)
             if seed_range.last <= a_map.source.last:
                 # Full range of seeds included in this mapping
-                log.debug("Seeds %s fit in mapping %s", seed_range, a_map)
-                transitioned_ranges.add_range(seed_range.first + a_map.offset, seed_range.length)
+                if _debug:
+                    log.debug("Seeds %s fit in mapping %s", seed_range, a_map)
+                transitioned_ranges.append(Range(seed_range.first + a_map.offset, seed_range.length))
             else:
                 # Break this down into one that fits and put the rest back in the stac
                 range_that_fits, excess = seed_range.split_at(a_map.source.last + 1)
-                transitioned_ranges.add_range(range_that_fits.first + a_map.offset, range_that_fits.length)
+                transitioned_ranges.append(Range(range_that_fits.first + a_map.offset, range_that_fits.length))
 
                 # And the rest goes back in the stack
-                input_range_stack.insert(0, excess)
+                input_range_stack.appendleft(excess)
 
-                log.debug("Seeds %s do not fit in mapping %s", seed_range, a_map)
-                log.debug("Split into range that fits: %s", range_that_fits)
-                log.debug("And a range that does not, which goes back to the stack: %s", excess)
+                if _debug:
+                    log.debug("Seeds %s do not fit in mapping %s", seed_range, a_map)
+                    log.debug("Split into range that fits: %s", range_that_fits)
+                    log.debug("And a range that does not, which goes back to the stack: %s", excess)
 
-        log.debug("Next ranges: %s", transitioned_ranges)
+        transitioned_ranges = MultiRange(transitioned_ranges)  # Sorted once, not on every addition
+        if _debug:
+            log.debug("Next ranges: %s", transitioned_ranges)
         return transitioned_ranges
 
     @property
@@ -200,36 +207,38 @@ class SeedFormat(Enum):
     RANGES = auto()
 
 
+SEED_FORMATS = {
+    Part.FIRST: SeedFormat.PLAIN,
+    Part.SECOND: SeedFormat.RANGES,
+}
+
+
 def parse_seed_ranges(seeds: list[int], seed_format: SeedFormat) -> MultiRange:
-    ranges = MultiRange()
     if seed_format == SeedFormat.RANGES:
         assert len(seeds) % 2 == 0
-        while seeds:
-            first, length = seeds[:2]
-            ranges.add_range(first, length)
-            seeds = seeds[2:]
-    else:
-        for first in seeds:
-            ranges.add_range(first, 1)
-
-    return ranges
+        return MultiRange([Range(first, length) for first, length in zip(seeds[::2], seeds[1::2])])
+    return MultiRange([Range(first, 1) for first in seeds])
 
 
-def parse_input(input_file: Path, seed_format: SeedFormat) -> tuple[MultiRange, list[MultiRangeMap]]:
+def parse_almanac(input_file: Path) -> tuple[list[int], list[MultiRangeMap]]:
+    """
+    Parse the seed numbers, still to be interpreted in some SeedFormat, and the maps
+    """
     current_map = None
-    seeds = None
+    seed_values = None
     maps = defaultdict(list)
     for line in input_file.read_text().splitlines():
         if line.startswith("seeds: "):
-            assert seeds is None
+            assert seed_values is None
             seed_values = [int(seed) for seed in line.split(': ')[1].split()]
-            seeds = parse_seed_ranges(seed_values, seed_format)
-            log.debug(f"{seeds=}")
+            if _debug:
+                log.debug("seed_values=%s", seed_values)
         elif line.endswith(" map:"):
             current_map = line.split()[0]
         elif not line:
             if current_map is not None:
-                log.debug("map finished %s: %s", current_map, maps[current_map])
+                if _debug:
+                    log.debug("map finished %s: %s", current_map, maps[current_map])
                 current_map = None
         else:
             if current_map is None:
@@ -237,20 +246,23 @@ def parse_input(input_file: Path, seed_format: SeedFormat) -> tuple[MultiRange,
             maps[current_map].append(RangeMap.from_line(line))
     maps_by_name = {name: MultiRangeMap(name, range_maps) for name, range_maps in maps.items()}
     maps_in_order = [maps_by_name[name] for name in MAP_ORDER]
-    return seeds, maps_in_order
+    return seed_values, maps_in_order
 
 
-def get_min_location(input_file: Path, seed_format: SeedFormat) -> int:
-    seeds, maps = parse_input(input_file, seed_format)
-    num_seeds = len(seeds)
+def parse_input(input_file: Path, seed_format: SeedFormat) -> tuple[MultiRange, list[MultiRangeMap]]:
+    seed_values, maps = parse_almanac(input_file)
+    return parse_seed_ranges(seed_values, seed_format), maps
+
 
-    log.debug(f"{num_seeds=}")
-    log.debug("Seeds: %s", seeds)
-    log.debug("Seed gaps: %s", seeds.gaps)
-    for mp in maps:
-        log.debug("Map: \n%s", mp)
-        log.debug("Gaps: %s", mp.gaps)
-        log.debug("Full range: %s", mp.full_range)
+def find_min_location(seeds: MultiRange, maps: list[MultiRangeMap]) -> int:
+    if _debug:  # The gaps take a pass over all the ranges, only compute them for tracing
+        log.debug("num_seeds=%s", len(seeds))
+        log.debug("Seeds: %s", seeds)
+        log.debug("Seed gaps: %s", seeds.gaps)
+        for mp in maps:
+            log.debug("Map: \n%s", mp)
+            log.debug("Gaps: %s", mp.gaps)
+            log.debug("Full range: %s", mp.full_range)
 
     # Chaining the pass through the maps
     res = seeds
@@ -259,10 +271,24 @@ def get_min_location(input_file: Path, seed_format: SeedFormat) -> int:
 
     min_location = min(r.first for r in res.ranges)
 
-    log.debug(f"{min_location=}")
+    log.debug("min_location=%s", min_location)
     return min_location
 
 
+def get_min_location(input_file: Path, seed_format: SeedFormat) -> int:
+    return find_min_location(*parse_input(input_file, seed_format))
+
+
+def parse(input_file: Path) -> tuple[list[int], list[MultiRangeMap]]:
+    return parse_almanac(input_file)
+
+
+def solve(parsed: tuple[list[int], list[MultiRangeMap]], part: Part) -> str | None:
+    seed_values, maps = parsed
+    seeds = parse_seed_ranges(seed_values, SEED_FORMATS[part])
+    return str(find_min_location(seeds, maps))
+
+
 def solve_first(input_file: Path) -> str | None:
     return str(get_min_location(input_file, SeedFormat.PLAIN))
 
@@ -0,0 +1,41 @@
+"""
+Synthetic almanacs of any size
+"""
+import random
+
+from aoc.days.day05 import MAP_ORDER
+from aoc.utils import Part
+
+BASE_SIZE = 1  # Seed pairs, and ranges per map
+# Every seed range finds its mapping by bisecting the ranges of a map, and seed
+# ranges only split over the few map ranges they span
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+SPAN = 1000  # Numbers covered per unit of size
+
+
+def generate_map(rng: random.Random, ranges: int, space: int) -> list[str]:
+    """Ranges that do not overlap in their source, with gaps between some of them"""
+    cuts = sorted(rng.sample(range(1, space), 2 * ranges - 1))
+    bounds = [0] + cuts + [space]
+    lines = []
+    for start, end in zip(bounds[::2], bounds[1::2]):
+        destination = rng.randrange(space)
+        lines.append(f"{destination} {start} {end - start}")
+    rng.shuffle(lines)
+    return lines
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """An almanac with as many seed pairs as the size, and as many ranges in every map"""
+    rng = random.Random(seed)
+    space = SPAN * size
+    seeds = []
+    for _ in range(size):
+        first = rng.randrange(space)
+        # Short ranges, that only span a few map ranges however big the almanac
+        seeds.extend((first, rng.randint(1, SPAN // 10)))
+    sections = [f"seeds: {' '.join(str(seed) for seed in seeds)}"]
+    for name in MAP_ORDER:
+        sections.append("\n".join([f"{name} map:"] + generate_map(rng, size, space)))
+    return "\n\n".join(sections) + "\n"
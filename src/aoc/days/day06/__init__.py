@@ -46,13 +46,13 @@ def solve_for_x(a, b, c):
 
 def ways_to_win_power(input_file: Path, input_format: InputFormat) -> str | None:
     races = parse_input(input_file, input_format)
-    log.debug(f"{races=}")
+    if _debug:
+        log.debug("races=%s", races)
     total = 1
     for race in races:
-        log.debug("Checking race: %s", race)
         edges = solve_for_x(a=-1, b=race.time, c=-race.distance)
-
-        log.debug("edges %s", edges)
+        if _debug:
+            log.debug("Checking race: %s, edges %s", race, edges)
         start_winning = floor(edges[0].real) + 1
         start_losing = ceil(edges[1].real)
 
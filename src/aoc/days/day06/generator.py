@@ -0,0 +1,24 @@
+"""
+Synthetic race sheets of any size
+"""
+import random
+
+from aoc.utils import Part
+
+BASE_SIZE = 10  # Races
+# The second part reads all the races as a single one with a huge time, which
+# the float square root cannot take beyond a few races, so it does not scale.
+EXPECTED_COMPLEXITY = {Part.FIRST: 1}
+# The answer is the product of the ways to win every race, which gets too long
+# to print past a few thousand races
+FACTORS = (1, 10, 100)
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A sheet with as many races as the size"""
+    rng = random.Random(seed)
+    times = [rng.randint(5, 99) for _ in range(size)]
+    # Anything shorter than the best possible distance (time / 2) ** 2 can be beaten
+    distances = [rng.randint(1, (time // 2) * (time - time // 2) - 1) for time in times]
+    return (f"Time:     {' '.join(f'{time:>4}' for time in times)}\n"
+            f"Distance: {' '.join(f'{distance:>4}' for distance in distances)}\n")
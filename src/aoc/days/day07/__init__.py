@@ -1,9 +1,14 @@
 import enum
+import functools
 import logging
+import operator
 from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from aoc.utils import Part
+from aoc.utils.mapreduce import map_reduce
+
 log = logging.getLogger(__name__)
 _debug = False  # Whether we are in debug mode
 
@@ -59,7 +64,7 @@ class Hand:
     bid: int
     with_jokers: bool
     type: HandType = field(init=False)
-    _card_values: tuple[int] = field(init=False)
+    _sort_key: tuple[int, tuple[int, ...]] = field(init=False)
 
     def __post_init__(self):
 
@@ -68,7 +73,12 @@ class Hand:
 
         card_values = tuple(_get_card_value(card, self.with_jokers) for card in self.cards)
         object.__setattr__(self, 'type', HandType.from_hand(self))
-        object.__setattr__(self, '_card_values', card_values)
+        object.__setattr__(self, '_sort_key', (self.type.value.value, card_values))
+
+    @property
+    def sort_key(self) -> tuple[int, tuple[int, ...]]:
+        """The strength of the type of hand, then the values of its cards in order: weaker hands sort first"""
+        return self._sort_key
 
     @property
     def effective_hand(self) -> str:
@@ -84,23 +94,65 @@ class Hand:
         return cls(cards=cards, bid=int(bid), with_jokers=with_jokers)
 
     def __lt__(self, other: 'Hand') -> bool:
-        if self.type != other.type:
-            return self.type.value.value < other.type.value.value
-        return self._card_values < other._card_values
+        return self.sort_key < other.sort_key
 
 
-def get_total(input_file: Path, *, with_jokers: bool) -> str:
-    hands = sorted([Hand.from_line(line, with_jokers) for line in input_file.read_text().splitlines()])
+def parse(input_file: Path) -> list[tuple[str, int]]:
+    """
+    The cards and bid of every hand. Hands themselves depend on the rules of each part
+    """
+    plays = []
+    for line in input_file.read_text().splitlines():
+        cards, bid = line.split()
+        plays.append((cards, int(bid)))
+    return plays
+
+
+def total_winnings(plays: list[tuple[str, int]], *, with_jokers: bool) -> str:
+    hands = sorted([Hand(cards=cards, bid=bid, with_jokers=with_jokers) for cards, bid in plays])
     total = 0
     for rank, hand in enumerate(hands, start=1):
-        log.debug("Hand: %s (%s) → type: %s, rank: %d", hand.cards, hand.effective_hand, hand.type.name, rank)
+        if _debug:
+            log.debug("Hand: %s (%s) → type: %s, rank: %d", hand.cards, hand.effective_hand, hand.type.name, rank)
         total += (rank * hand.bid)
     return str(total)
 
 
+def get_total(input_file: Path, *, with_jokers: bool) -> str:
+    return total_winnings(parse(input_file), with_jokers=with_jokers)
+
+
+def solve(plays: list[tuple[str, int]], part: Part) -> str | None:
+    return total_winnings(plays, with_jokers=part == Part.SECOND)
+
+
 def solve_first(input_file: Path) -> str | None:
     return get_total(input_file, with_jokers=False)
 
 
 def solve_second(input_file: Path) -> str | None:
     return get_total(input_file, with_jokers=True)
+
+
+def _hand_strengths(text: str, with_jokers: bool) -> list[tuple[tuple[int, tuple[int, ...]], int]]:
+    """What hands are sorted by, and the bid, of every hand. Classifying the hands is the costly bit."""
+    strengths = []
+    for line in text.splitlines():
+        hand = Hand.from_line(line, with_jokers)
+        strengths.append((hand.sort_key, hand.bid))
+    return strengths
+
+
+def get_total_parallel(input_file: Path, *, with_jokers: bool, jobs: int | None = None) -> str:
+    mapper = functools.partial(_hand_strengths, with_jokers=with_jokers)
+    strengths = map_reduce(input_file, mapper, operator.iadd, jobs=jobs)
+    strengths.sort(key=operator.itemgetter(0))
+    return str(sum(rank * bid for rank, (_, bid) in enumerate(strengths, start=1)))
+
+
+def solve_first_parallel(input_file: Path, jobs: int | None = None) -> str | None:
+    return get_total_parallel(input_file, with_jokers=False, jobs=jobs)
+
+
+def solve_second_parallel(input_file: Path, jobs: int | None = None) -> str | None:
+    return get_total_parallel(input_file, with_jokers=True, jobs=jobs)
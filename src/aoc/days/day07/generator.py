@@ -0,0 +1,27 @@
+"""
+Synthetic lists of Camel Cards hands of any size
+"""
+import random
+
+from aoc.days.day07 import CARDS_IN_HAND
+from aoc.utils import Part
+
+BASE_SIZE = 100  # Hands
+# Sorting the hands is n log n. Over a thousandfold range of sizes, the log
+# only adds about 0.1 to the fitted exponent, well within the tolerance of a
+# linear check, which still catches anything quadratic.
+EXPECTED_COMPLEXITY = {Part.FIRST: 1, Part.SECOND: 1}
+
+CARDS = "23456789TJQKA"
+
+
+def generate(size: int, seed: int = 0) -> str:
+    """A list with as many hands as the size"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        # Few distinct cards in some hands, to get every type
+        deck = rng.sample(CARDS, rng.randint(1, CARDS_IN_HAND))
+        hand = "".join(rng.choice(deck) for _ in range(CARDS_IN_HAND))
+        lines.append(f"{hand} {rng.randint(1, 1000)}\n")
+    return "".join(lines)
@@ -32,4 +32,9 @@ def test_second_solution(day_input, part2_solution):
 def test_lt_hand():
     ktjjt = today.Hand("KTJJT", bid=1, with_jokers=True)
     qqqja = today.Hand("QQQJA", bid=1, with_jokers=True)
-    assert qqqja < ktjjt
\ No newline at end of file
+    assert qqqja < ktjjt
+
+def test_sort_key():
+    hands = [today.Hand(cards, bid=1, with_jokers=False) for cards in ("32T3K", "KK677", "KTJJT", "T55J5", "QQQJA")]
+    assert sorted(hands) == sorted(hands, key=lambda hand: hand.sort_key)
+    assert [hand.cards for hand in sorted(hands)] == ["32T3K", "KTJJT", "KK677", "T55J5", "QQQJA"]
@@ -5,7 +5,70 @@ import os
 from pathlib import Path
 
 from aoc import days
-from aoc.utils import Part, EnumNameAction
+from aoc.utils import Part, EnumNameAction, InputSource, day_input_path, cache, tracing
+
+
+def day_range(spec: str) -> list[int]:
+    """
+    Parse a selection of days like "1-7" or "1,3,10-12" into a sorted list
+    """
+    selected = set()
+    try:
+        for item in spec.split(","):
+            first, _, last = item.partition("-")
+            first, last = int(first), int(last or first)
+            if first > last:
+                raise argparse.ArgumentTypeError(f"Invalid day range, {first} is after {last}: {spec!r}")
+            selected.update(range(first, last + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid day range: {spec!r}")
+    if not selected:
+        raise argparse.ArgumentTypeError(f"No days selected: {spec!r}")
+    return sorted(selected)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Must be 1 or more: {value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"Must be 0 or more: {value}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"Must be more than 0: {value}")
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"Must be 0 or more: {value}")
+    return number
+
+
+def memory_size(value: str) -> int:
+    from aoc.utils import limits
+    try:
+        return limits.parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def add_limit_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--timeout", type=positive_float, default=None, metavar="SECONDS",
+                        help="Stop a solver after this many seconds, reporting a TIMEOUT")
+    parser.add_argument("--max-memory", type=memory_size, default=None, metavar="SIZE",
+                        help="Cap the memory of a solver (like 512M or 2G, interpreter included), "
+                             "reporting an OOM when it goes over")
 
 
 def parse_args(argv):
@@ -22,13 +85,71 @@ def parse_args(argv):
     run_parser = subparsers.add_parser("run", help="Run a solution")
     run_parser.add_argument("--input", "-i",
                             nargs="?",
-                            help="Input file, with the contents as obtained in the AoC",
+                            type=Path,
+                            help="Input file, with the contents as obtained in the AoC (- for stdin)",
                             default=None)
 
-    run_parser.add_argument("--day", "-d", type=int,
-                            help="The day of the puzzle you want to run. By default today's",
-                            default=None,
-                            )
+    run_parser.add_argument("--inputs", default=None, metavar="DIR_OR_GLOB",
+                            help="Solve every file in a directory, or matching a glob pattern, in parallel. "
+                                 "Results are written as JSON lines to stdout (or --json FILE)")
+    run_parser.add_argument("--jobs", "-j", type=positive_int, default=None,
+                            help="Worker processes for --inputs, by default one per CPU. When running a "
+                                 "single day, solve the parts that have a parallel solver over chunks of the "
+                                 "input in this many processes")
+
+    run_days_group = run_parser.add_mutually_exclusive_group()
+    run_days_group.add_argument("--day", "-d", type=int,
+                                help="The day of the puzzle you want to run. By default today's",
+                                default=None,
+                                )
+    run_days_group.add_argument("--all-days", action='store_const', dest='days', const=days.available_days(),
+                                help="Run all the days, in parallel, and print a summary")
+    run_days_group.add_argument("--days", type=day_range, default=None,
+                                help="Run a range of days like 1-7 or 1,3,5-7, in parallel, and print a summary")
+
+    run_parser.add_argument("--json", type=Path, default=None, metavar="FILE",
+                            help="When running several days, also write the results as JSON to FILE (- for stdout). "
+                                 "With --inputs, write the JSON lines to FILE")
+
+    run_parser.add_argument("--queries", type=Path, default=None, metavar="FILE",
+                            help="Answer every query in FILE against the input, for days that take queries "
+                                 "(like sets of cube limits for day 2), printing an answer per line")
+
+    run_parser.add_argument("--parallel-parts", action='store_true',
+                            help="Solve the first and second parts at the same time, in separate processes")
+
+    run_parser.add_argument("--watch", "-w", action='store_true',
+                            help="Keep running, and solve again whenever the day's code, its input or aoc.utils "
+                                 "change. The result cache is not used.")
+
+    add_limit_arguments(run_parser)
+
+    run_parser.add_argument("--via-daemon", action='store_true',
+                            help="Solve in the daemon started with `serve` instead of in this process")
+    run_parser.add_argument("--socket", type=Path, default=None,
+                            help="Socket of the daemon for --via-daemon, by default that of `serve`")
+
+    run_parser.add_argument("--profile", action='store_true',
+                            help="Sample the stacks of the solvers, writing them in collapsed (flamegraph) "
+                                 "format and printing the hottest functions of each part")
+    run_parser.add_argument("--profile-interval", type=positive_float, default=1.0, metavar="MS",
+                            help="Milliseconds of CPU time between profiling samples")
+    run_parser.add_argument("--profile-output", type=Path, default=Path("."), metavar="DIR",
+                            help="Directory for the collapsed stacks files, one per part")
+    run_parser.add_argument("--profile-top", type=positive_int, default=15, metavar="N",
+                            help="How many functions to show in the profile summary")
+
+    run_parser.add_argument("--trace-memory", action='store_true',
+                            help="Report peak RSS, tracemalloc peak and top allocation sites of each part")
+
+    run_cache_group = run_parser.add_mutually_exclusive_group()
+    run_cache_group.add_argument("--cache", action='store_true', default=None,
+                                 help="Reuse answers for unchanged code and input from the result cache "
+                                      f"(enabled by default with {cache.ENV_CACHE}=1)")
+    run_cache_group.add_argument("--no-cache", action='store_false', dest='cache',
+                                 help="Do not use the result cache")
+    run_cache_group.add_argument("--refresh", action='store_true',
+                                 help="Solve again and update the result cache")
 
     run_parser.add_argument("--part", "-p", type=Part, action=EnumNameAction,
                             default=Part.ALL,
@@ -45,7 +166,52 @@ def parse_args(argv):
                              )
     test_parser.add_argument("--all", action='store_true',
                              help="Run all tests.")
+    test_parser.add_argument("--jobs", "-j", type=positive_int, default=1,
+                             help="With --all, split the test packages over this many pytest processes, "
+                                  "balanced by how long they took last time")
+    add_limit_arguments(test_parser)
+
+    # =======================================================================
+
+    # Bench parser
+    # =======================================================================
+    bench_parser = subparsers.add_parser("bench", help="Benchmark a solution")
+    bench_parser.add_argument("--input", "-i", type=Path, default=None,
+                              help="Input file, with the contents as obtained in the AoC")
+    bench_parser.add_argument("--day", "-d", type=int,
+                              help="The day of the puzzle you want to benchmark. By default today's",
+                              default=None,
+                              )
+    bench_parser.add_argument("--part", "-p", type=Part, action=EnumNameAction,
+                              default=Part.ALL,
+                              help="Which part of the day puzzle to benchmark")
+    bench_parser.add_argument("--warmup", type=positive_int, default=1,
+                              help="Untimed in-process runs before measuring")
+    bench_parser.add_argument("--repeat", "-r", type=positive_int, default=5,
+                              help="Timed in-process (warm) runs")
+    bench_parser.add_argument("--cold", type=non_negative_int, default=3,
+                              help="Timed runs in a fresh interpreter each (0 to skip)")
+    bench_parser.add_argument("--output", "-o", type=Path, default=None,
+                              help="Save the results as JSON to this file")
+    bench_parser.add_argument("--baseline", "-b", type=Path, default=None,
+                              help="Compare against the results saved in this file by an earlier run")
+    bench_parser.add_argument("--threshold", type=non_negative_float, default=0.1,
+                              help="Fraction a median can grow over the baseline before it is a regression")
+    bench_parser.add_argument("--scaling", action="store_true",
+                              help="Time the solvers over generated inputs of growing sizes instead, and "
+                                   "fail if they grow faster than expected")
+    bench_parser.add_argument("--seed", type=int, default=None,
+                              help="Seed for the generated inputs of --scaling")
+    # =======================================================================
 
+    # Serve parser
+    # =======================================================================
+    serve_parser = subparsers.add_parser("serve", help="Start a daemon that solves requests sent to a Unix socket")
+    serve_parser.add_argument("--socket", type=Path, default=None,
+                              help="Where to listen, by default daemon.sock in the cache directory "
+                                   "(or AOC_SOCKET)")
+    serve_parser.add_argument("--jobs", "-j", type=positive_int, default=None,
+                              help="Worker processes solving requests, by default one per CPU")
     # =======================================================================
 
     # Download parser
@@ -53,36 +219,132 @@ def parse_args(argv):
     dl_parser = subparsers.add_parser("dl", help="Download inputs")
     dl_parser.add_argument("--all", action='store_true',
                            help="Download all inputs.")
+    dl_parser.add_argument("--jobs", "-j", type=positive_int, default=4,
+                           help="How many inputs to download at the same time")
+    dl_parser.add_argument("--force", action='store_true',
+                           help="Download inputs even if they are already there")
     # =======================================================================
 
     args = parser.parse_args(argv[1:])
 
     module = None
 
-    if hasattr(args, 'day'):
+    if getattr(args, 'days', None) is not None:
+        if args.input is not None:
+            parser.error("--input cannot be used when running several days")
+        unknown = [day for day in args.days if day not in days.DAYS]
+        if unknown:
+            parser.error(f"Could not find code for days: {', '.join(str(day) for day in unknown)}")
+    elif args.command == 'test' and args.all:
+        pass  # No single day to look for
+    elif hasattr(args, 'day'):
         if args.day is None:
             today = datetime.date.today()
             if today.month != 12:
                 parser.error("Not in December, cannot infer day, use --day N")
             args.day = today.day
 
-        module = getattr(days, f"day{args.day:02d}", None)
+        module = days.get_day(args.day)
 
         if module is None:
             parser.error(
-                f"Could not find code for that day: {args.day}. Try between 1 and 25.")
+                f"Could not find code for that day: {args.day}. "
+                f"Try between {min(days.DAYS)} and {max(days.DAYS)}.")
 
         setattr(args, "module", module)
 
-    if args.command == 'run':
+    if args.command == 'bench' and args.scaling:
+        from aoc.utils.scaling import get_generator
+        if args.input is not None:
+            parser.error("--scaling generates its own inputs, it cannot be used with --input")
+        if get_generator(module) is None:
+            parser.error(f"There is no input generator for day {args.day}")
+    elif args.command == 'run' and args.inputs is not None:
+        from aoc.launcher.inputs import expand_inputs
+        if args.input is not None or args.days is not None:
+            parser.error("--inputs cannot be used with --input or when running several days")
+        if args.watch or args.via_daemon or args.parallel_parts or args.profile or args.trace_memory:
+            parser.error("--inputs cannot be used with --watch, --via-daemon, --parallel-parts, --profile "
+                         "or --trace-memory")
+        args.inputs = expand_inputs(args.inputs)
+        if not args.inputs:
+            parser.error("Could not find any input files in the --inputs directory or pattern")
+    elif args.command in ('run', 'bench') and module is not None:
         if args.input is None:
-            args.input = Path(module.__file__).resolve().parent / "data" / "input"
-        if not os.path.exists(args.input):
+            args.input = day_input_path(args.day)
+        if str(args.input) == '-':
+            if args.command != 'run':
+                parser.error("Reading the input from stdin is only possible with run")
+            args.input = InputSource.from_stdin()
+        elif not os.path.exists(args.input):
             parser.error(f"Could not find file {args.input}")
 
+    if args.command == 'run':
+        if args.cache is None:
+            args.cache = args.refresh or cache.cache_enabled_by_env()
+        if args.profile:
+            from aoc.launcher import profiler
+            if not profiler.is_supported():
+                parser.error("--profile needs interval timers, which this platform does not have")
+            if args.days is not None:
+                parser.error("--profile can only be used when running a single day")
+            if not args.profile_output.is_dir():
+                parser.error(f"Could not find directory {args.profile_output}")
+        if args.trace_memory and args.profile:
+            parser.error("--trace-memory slows down allocations, do not use it with --profile")
+        if args.parallel_parts and (args.profile or args.trace_memory):
+            parser.error("--parallel-parts cannot be used with --profile or --trace-memory")
+        if args.trace_memory and args.days is not None:
+            parser.error("--trace-memory can only be used when running a single day")
+        if args.watch:
+            if args.days is not None:
+                parser.error("--watch can only be used when running a single day")
+            if args.parallel_parts or args.profile or args.trace_memory:
+                parser.error("--watch cannot be used with --parallel-parts, --profile or --trace-memory")
+            if isinstance(args.input, InputSource):
+                parser.error("--watch needs an input file, it cannot read stdin")
+        args.limits = None
+        if args.timeout is not None or args.max_memory is not None:
+            from aoc.utils.limits import Limits
+            args.limits = Limits(args.timeout, args.max_memory)
+        if args.limits and (args.profile or args.trace_memory or args.watch or args.parallel_parts):
+            parser.error("--timeout and --max-memory cannot be used with --profile, --trace-memory, --watch "
+                         "or --parallel-parts")
+        if args.via_daemon:
+            if args.days is not None or args.watch:
+                parser.error("--via-daemon can only be used to run a single day once")
+            if args.parallel_parts or args.profile or args.trace_memory:
+                parser.error("--via-daemon cannot be used with --parallel-parts, --profile or --trace-memory")
+        elif args.socket is not None:
+            parser.error("--socket is only for --via-daemon")
+
+    if args.command == 'run' and args.queries is not None:
+        if args.days is not None or args.inputs is not None:
+            parser.error("--queries can only be used when running a single day with a single input")
+        if args.watch or args.via_daemon or args.parallel_parts or args.profile or args.trace_memory:
+            parser.error("--queries cannot be used with --watch, --via-daemon, --parallel-parts, --profile "
+                         "or --trace-memory")
+        if not callable(getattr(module, 'solve_queries', None)):
+            parser.error(f"Day {args.day} does not take queries")
+        if not args.queries.exists():
+            parser.error(f"Could not find file {args.queries}")
+
+    if args.command == 'run' and args.jobs is not None and args.inputs is None:
+        if args.days is not None:
+            parser.error("--jobs cannot be used when running several days")
+        if args.watch or args.via_daemon or args.parallel_parts or args.profile or args.trace_memory:
+            parser.error("--jobs cannot be used with --watch, --via-daemon, --parallel-parts, --profile "
+                         "or --trace-memory")
+
+    if args.command == 'test' and args.jobs > 1 and not args.all:
+        parser.error("--jobs can only be used with --all")
+
+    if args.command == 'bench' and args.baseline is not None and not args.baseline.exists():
+        parser.error(f"Could not find baseline file {args.baseline}")
+
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
         if module:
-            setattr(module, 'debug', True)
+            tracing.enable_tracing(module)
 
     return args
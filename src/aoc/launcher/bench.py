@@ -0,0 +1,146 @@
+"""
+Benchmarking of day solvers.
+
+Warm runs call the solver repeatedly in this process, after some warmup calls.
+Cold runs start a fresh interpreter for every sample and time importing the day
+module plus the first call to the solver, which is what a one-off launcher run
+pays on top of interpreter startup.
+"""
+import json
+import logging
+import math
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from aoc.launcher.paths import SRC_DIR
+from aoc.launcher.runner import SINGLE_PARTS, solver_for
+from aoc.utils import Part
+
+log = logging.getLogger(__name__)
+
+COLD_RUN_SCRIPT = """
+import sys, time
+from pathlib import Path
+day, part, input_file = int(sys.argv[1]), sys.argv[2], Path(sys.argv[3])
+start = time.perf_counter()
+from aoc import days
+module = days.get_day(day)
+getattr(module, 'solve_' + part)(input_file)
+print(time.perf_counter() - start)
+"""
+
+
+@dataclass
+class Stats:
+    runs: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stddev: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> 'Stats':
+        return cls(
+            runs=len(samples),
+            min=min(samples),
+            median=statistics.median(samples),
+            mean=statistics.fmean(samples),
+            p95=percentile(samples, 95),
+            stddev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+
+    def __str__(self):
+        return (f"runs={self.runs} min={self.min:.6f}s median={self.median:.6f}s mean={self.mean:.6f}s "
+                f"p95={self.p95:.6f}s stddev={self.stddev:.6f}s")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def time_warm(solver, input_file: Path, *, warmup: int, repeat: int) -> tuple[str | None, list[float]]:
+    answer = None
+    for _ in range(warmup):
+        answer = solver(input_file)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = solver(input_file)
+        samples.append(time.perf_counter() - start)
+    return answer, samples
+
+
+def time_cold(day: int, part: Part, input_file: Path, *, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_RUN_SCRIPT, str(day), part.name.lower(), str(input_file)],
+            cwd=SRC_DIR, capture_output=True, check=True, encoding="utf-8",
+        )
+        samples.append(float(result.stdout.splitlines()[-1]))
+    return samples
+
+
+def run_bench(day: int, module, part: Part, input_file: Path, *,
+              warmup: int, repeat: int, cold: int) -> dict:
+    """Benchmark the requested parts of a day, returning a JSON friendly report"""
+    report = {"day": day, "input": str(input_file), "parts": {}}
+    for single_part in SINGLE_PARTS:
+        if not part.includes(single_part):
+            continue
+        answer, samples = time_warm(solver_for(module, single_part), input_file, warmup=warmup, repeat=repeat)
+        if answer is None:
+            log.info("Skipping day %d, %s part: not implemented", day, single_part.name.lower())
+            continue
+        part_report = {"answer": answer, "warm": asdict(Stats.from_samples(samples))}
+        if cold:
+            part_report["cold"] = asdict(Stats.from_samples(time_cold(day, single_part, input_file, repeat=cold)))
+        report["parts"][single_part.name.lower()] = part_report
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare the medians of a report to those in a baseline, listing every one
+    that is slower by more than the threshold (a fraction, 0.1 is 10% slower)
+    """
+    regressions = []
+    for part_name, part_report in report["parts"].items():
+        baseline_part = baseline.get("parts", {}).get(part_name, {})
+        for kind in ("warm", "cold"):
+            if kind not in part_report or kind not in baseline_part:
+                continue
+            current, previous = part_report[kind]["median"], baseline_part[kind]["median"]
+            if current > previous * (1 + threshold):
+                regressions.append(
+                    f"{part_name} part, {kind}: median {current:.6f}s vs {previous:.6f}s "
+                    f"(+{(current / previous - 1) * 100:.1f}%)")
+    return regressions
+
+
+def print_report(report: dict):
+    for part_name, part_report in report["parts"].items():
+        title = f"Benchmark of Day {report['day']}, {part_name.capitalize()} Part"
+        print(title)
+        print("-" * len(title))
+        print(f"answer: {part_report['answer']}")
+        for kind in ("warm", "cold"):
+            if kind in part_report:
+                print(f"{kind}: {Stats(**part_report[kind])}")
+        print()
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def save_report(report: dict, path: Path):
+    path.write_text(json.dumps(report, indent=2) + "\n")
@@ -0,0 +1,324 @@
+"""
+A long-lived solver daemon listening on a Unix domain socket.
+
+Tools that solve many small inputs pay interpreter startup and the imports of
+the day modules on every launcher run. The daemon pays them once: its workers
+import every day when they start, and then solve whatever comes through the
+socket.
+
+Messages are framed the same way as for external solver workers (see
+aoc.utils.external): a 4 byte big-endian length followed by UTF-8 JSON.
+
+* Solve requests: ``{"id": 1, "day": 5, "part": "all", "input_path": "/path/input"}``,
+  or with ``"input": "<the input itself>"`` instead of ``input_path``, and
+  optionally ``"cache": true`` and ``"refresh": true`` to use the result cache,
+  and ``"timeout"`` (seconds) and ``"max_memory"`` (bytes) to solve every part
+  under those limits.
+  Responses: ``{"id": 1, "results": [...], "latency": 0.012}``, with results as
+  in ``run --json``, or ``{"id": 1, "error": "what went wrong"}``.
+* Stats requests: ``{"id": 2, "command": "stats"}``. Responses have counters of
+  the requests served since the daemon started, and their latencies.
+
+Every connection is handled in a thread of its own, and can send any number of
+requests one after the other. The solving happens in a pool of processes.
+
+The pool is started again, with fresh interpreters, when the source of the
+days or of aoc.utils changes, so the daemon never answers with stale code, and
+when a worker dies, like a solver crashing the interpreter without limits.
+"""
+import collections
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from aoc import days
+from aoc.launcher.paths import DAYS_DIR, UTILS_DIR
+from aoc.launcher.runner import PartResult, solve_parts
+from aoc.utils import InputSource, Part
+from aoc.utils.cache import ResultCache, default_cache_dir, source_files, source_stamp
+from aoc.utils.external import encode_frame, read_frame
+from aoc.utils.limits import Limits
+
+log = logging.getLogger(__name__)
+
+ENV_SOCKET = 'AOC_SOCKET'
+SOCKET_FILE_NAME = 'daemon.sock'
+LATENCY_WINDOW = 1000  # Latency stats are over this many of the latest requests
+
+
+class DaemonError(Exception):
+    pass
+
+
+def default_socket_path() -> Path:
+    if ENV_SOCKET in os.environ:
+        return Path(os.environ[ENV_SOCKET])
+    return default_cache_dir() / SOCKET_FILE_NAME
+
+
+def _preload_days():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is for the daemon, which stops the workers
+    for day in days.available_days():
+        try:
+            days.get_day(day)
+        except Exception:
+            # Like a syntax error halfway through an edit. Requests for the day
+            # get the error, the others are still served.
+            log.warning("Could not import day %d", day, exc_info=True)
+
+
+def _warm_up():
+    """Does nothing, only submitted to force the spawn workers to start and run their initializer"""
+
+
+def _code_stamp() -> tuple:
+    """Changes whenever the source of any day or of aoc.utils does"""
+    return source_stamp(source_files(DAYS_DIR) + source_files(UTILS_DIR))
+
+
+def _limit(request: dict, name: str, kind: type) -> float | int | None:
+    value = request.get(name)
+    if value is None:
+        return None
+    value = kind(value)
+    if value <= 0:
+        raise ValueError(f"The {name} must be more than 0, not {value}")
+    return value
+
+
+def solve_request(day: int, part: Part, input_path: str | None, input_data: str | None,
+                  use_cache: bool, refresh: bool, limits: Limits | None = None) -> list[dict]:
+    """Solve a request in a worker process"""
+    module = days.get_day(day)
+    if module is None:
+        raise ValueError(f"Could not find code for day {day}")
+    if input_path is not None:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Could not find file {input_path}")
+        input_file = InputSource.from_path(input_path)
+    else:
+        input_file = InputSource.from_text(input_data)
+    cache = ResultCache() if use_cache or refresh else None
+    with input_file:
+        results = solve_parts(day, module, part, input_file, cache=cache, refresh=refresh, limits=limits)
+    return [result.as_dict() for result in results]
+
+
+class Counters:
+    """Throughput and latency of the requests served, safe to update from any thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.active = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def begin(self):
+        with self._lock:
+            self.active += 1
+
+    def end(self, latency: float, failed: bool):
+        with self._lock:
+            self.active -= 1
+            self.requests += 1
+            self.errors += failed
+            self.latencies.append(latency)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            latencies = sorted(self.latencies)
+            stats = {
+                "uptime": uptime,
+                "requests": self.requests,
+                "errors": self.errors,
+                "active": self.active,
+                "throughput": self.requests / uptime if uptime else 0.0,
+            }
+        if latencies:
+            stats["latency"] = {
+                "mean": statistics.fmean(latencies),
+                "p50": latencies[len(latencies) // 2],
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+        return stats
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: 'SolverDaemon'
+
+    def handle(self):
+        while (request := read_frame(self.rfile)) is not None:
+            self.wfile.write(encode_frame(self.server.respond(request)))
+            self.wfile.flush()
+
+
+class SolverDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, jobs: int | None = None):
+        self.socket_path = Path(socket_path)
+        _remove_stale_socket(self.socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.counters = Counters()
+        self._pool_lock = threading.Lock()
+        self._code_stamp = _code_stamp()
+        self.pool = self._start_pool()
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        # Spawned and not forked, so the workers import the code as it is on
+        # disk now, and not the copies this process loaded when it started
+        pool = ProcessPoolExecutor(max_workers=self.jobs, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_preload_days)
+        # Workers start on demand, get them all started and warm before the first request
+        for warm_up in [pool.submit(_warm_up) for _ in range(self.jobs)]:
+            warm_up.result()
+        return pool
+
+    def _restart_pool(self, stale: ProcessPoolExecutor, reason: str):
+        with self._pool_lock:
+            if self.pool is not stale:
+                return  # Another request restarted it already
+            log.info("Restarting the workers: %s", reason)
+            self._code_stamp = _code_stamp()
+            self.pool = self._start_pool()
+        # Requests still running on the old workers finish there
+        stale.shutdown(wait=False, cancel_futures=True)
+
+    def _current_pool(self) -> ProcessPoolExecutor:
+        """The pool of workers, started again first if the code changed since they started"""
+        pool = self.pool
+        if _code_stamp() != self._code_stamp:
+            self._restart_pool(pool, "the code changed")
+        return self.pool
+
+    def respond(self, request: dict) -> dict:
+        if request.get("command") == "stats":
+            return {"id": request.get("id"), "stats": self.counters.as_dict()}
+
+        self.counters.begin()
+        start = time.perf_counter()
+        response = {"id": request.get("id")}
+        pool = None
+        try:
+            limits = Limits(_limit(request, "timeout", float), _limit(request, "max_memory", int))
+            pool = self._current_pool()
+            task = pool.submit(
+                solve_request, int(request["day"]), Part[request.get("part", "all").upper()],
+                request.get("input_path"), request.get("input"),
+                bool(request.get("cache")), bool(request.get("refresh")), limits or None,
+            )
+            response["results"] = task.result()
+        except BrokenProcessPool:
+            log.debug("A worker died solving %s", request, exc_info=True)
+            self._restart_pool(pool, "a worker died")
+            response["error"] = "A worker died while solving, the workers were started again"
+        except Exception as e:
+            log.debug("Request %s failed", request, exc_info=True)
+            response["error"] = f"{type(e).__name__}: {e}"
+        response["latency"] = time.perf_counter() - start
+        self.counters.end(response["latency"], failed="error" in response)
+        return response
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _remove_stale_socket(socket_path: Path):
+    """Remove the socket of a daemon that is gone, refusing to replace a live one"""
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return
+    raise DaemonError(f"A daemon is already listening on {socket_path}")
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def serve(socket_path: Path, jobs: int | None = None):
+    """Start the daemon and serve until interrupted or terminated"""
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)  # Clean up the socket on a plain kill too
+    with SolverDaemon(socket_path, jobs) as daemon:
+        print(f"Serving on {socket_path} with {daemon.jobs} workers, Ctrl+C to stop")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class DaemonClient:
+    """A connection to a running daemon, for any number of requests"""
+
+    def __init__(self, socket_path: Path | None = None, timeout: float | None = None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(str(self.socket_path))
+        except OSError as e:
+            self._socket.close()
+            raise DaemonError(f"No daemon listening on {self.socket_path}, start one with `aoc serve`") from e
+        self._stream = self._socket.makefile('rwb')
+        self._next_id = 1
+
+    def _call(self, request: dict) -> dict:
+        request["id"] = self._next_id
+        self._next_id += 1
+        self._stream.write(encode_frame(request))
+        self._stream.flush()
+        response = read_frame(self._stream)
+        if response is None:
+            raise DaemonError("The daemon closed the connection")
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response
+
+    def solve(self, day: int, part: Part = Part.ALL, *, input_path: Path | None = None,
+              input_data: str | None = None, cache: bool = False, refresh: bool = False,
+              limits: Limits | None = None) -> list[PartResult]:
+        if (input_path is None) == (input_data is None):
+            raise ValueError("Give either an input path or the input data")
+        request = {"day": day, "part": part.name.lower(), "cache": cache, "refresh": refresh}
+        if limits:
+            request.update(timeout=limits.timeout, max_memory=limits.max_memory)
+        if input_path is not None:
+            request["input_path"] = str(Path(input_path).resolve())
+        else:
+            request["input"] = input_data
+        return [PartResult.from_dict(result) for result in self._call(request)["results"]]
+
+    def stats(self) -> dict:
+        return self._call({"command": "stats"})["stats"]
+
+    def close(self):
+        self._stream.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'DaemonClient':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
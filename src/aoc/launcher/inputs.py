@@ -0,0 +1,99 @@
+"""
+Solving one day for many inputs at once.
+
+The inputs are spread over a pool of worker processes. Every worker imports
+the day module once, when it starts, and then solves input after input with it.
+Results are streamed as JSON lines as soon as each input is solved, so the
+order of the lines is that of completion, not that of the inputs.
+"""
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from aoc import days
+from aoc.launcher.runner import FAILED_STATUSES, PartResult, Status, solve_parts
+from aoc.utils import InputSource, Part
+from aoc.utils.cache import ResultCache
+from aoc.utils.limits import Limits
+
+log = logging.getLogger(__name__)
+
+
+def expand_inputs(spec: str) -> list[Path]:
+    """The files in a directory (not hidden ones), or those matching a glob pattern"""
+    path = Path(spec)
+    if path.is_dir():
+        candidates = path.iterdir()
+    else:
+        candidates = (Path(name) for name in glob.glob(spec, recursive=True))
+    return sorted(path for path in candidates if path.is_file() and not path.name.startswith('.'))
+
+
+def _import_day(day: int):
+    days.get_day(day)
+
+
+def solve_input(day: int, part: Part, input_path: Path, cache: ResultCache | None = None,
+                refresh: bool = False, limits: Limits | None = None) -> list[PartResult]:
+    """Solve one input in a worker, with the day module it already imported"""
+    with InputSource.from_path(input_path) as input_file:
+        return solve_parts(day, days.get_day(day), part, input_file, cache=cache, refresh=refresh, limits=limits)
+
+
+@dataclass
+class Throughput:
+    inputs: int = 0
+    size: int = 0  # Bytes
+    failed: int = 0
+    wall_time: float = 0.0
+
+    def summary(self) -> str:
+        seconds = self.wall_time or float('inf')
+        verdict = f", {self.failed} failed ❌" if self.failed else " ✅"
+        return (f"Solved {self.inputs} inputs ({self.size / 1e6:.2f} MB) in {self.wall_time:.3f}s: "
+                f"{self.inputs / seconds:.1f} inputs/s, {self.size / 1e6 / seconds:.2f} MB/s{verdict}")
+
+
+def solve_inputs(day: int, part: Part, input_paths: list[Path], *, jobs: int | None = None,
+                 cache: ResultCache | None = None, refresh: bool = False,
+                 limits: Limits | None = None) -> Iterator[tuple[Path, list[PartResult] | Exception]]:
+    """Solve every input, yielding the results of each one as soon as they are ready"""
+    workers = min(len(input_paths), jobs or os.cpu_count() or 1)
+    log.debug("Solving %d inputs for day %d with %d workers", len(input_paths), day, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_import_day, initargs=(day,)) as pool:
+        futures = {pool.submit(solve_input, day, part, path, cache, refresh, limits): path for path in input_paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                log.debug("Solving %s failed", futures[future], exc_info=True)
+                yield futures[future], e
+
+
+def run_inputs(day: int, part: Part, input_paths: list[Path], output: TextIO, *, jobs: int | None = None,
+               cache: ResultCache | None = None, refresh: bool = False,
+               limits: Limits | None = None) -> Throughput:
+    """Solve every input, writing a JSON line per input and part to the output as they come"""
+    throughput = Throughput()
+    start = time.perf_counter()
+    solved = solve_inputs(day, part, input_paths, jobs=jobs, cache=cache, refresh=refresh, limits=limits)
+    for path, results in solved:
+        throughput.inputs += 1
+        throughput.size += path.stat().st_size
+        if isinstance(results, Exception):
+            throughput.failed += 1
+            output.write(json.dumps({"input": str(path), "day": day, "status": Status.ERROR.name,
+                                     "error": f"{type(results).__name__}: {results}"}) + "\n")
+        else:
+            throughput.failed += any(result.status in FAILED_STATUSES for result in results)
+            for result in results:
+                output.write(json.dumps(dict(input=str(path), **result.as_dict())) + "\n")
+        output.flush()
+    throughput.wall_time = time.perf_counter() - start
+    return throughput
@@ -1,15 +1,27 @@
 import argparse
+import json
 import logging
+import os
+import signal
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from aoc.launcher.args import parse_args
-from aoc.utils import Part, fetch_input
+from aoc.utils import InputSource, Part
+
+if TYPE_CHECKING:
+    # The runner, the cache and the process pools are imported by the commands
+    # that use them, to keep them off the cold start of the launcher
+    from aoc.launcher.runner import PartResult
+    from aoc.utils.cache import ResultCache
 
 log = logging.getLogger(__name__)
 
+MAX_ANSWER_WIDTH = 40  # Longer answers (and errors) are cut short in the summary table
+
 
-def print_solution(day: int, part: Part, solution: str | None):
+def print_solution(day: int, part: Part, solution: str | None, timing: str | None = None):
     title = f"Solution to Day {day}, {part.name.capitalize()} Part"
     if solution is None:
         print(f"No {title} ❌")
@@ -18,35 +30,287 @@ def print_solution(day: int, part: Part, solution: str | None):
         print("-" * len(title))
         print(solution)
         print("-" * len(title))
+        if timing:
+            print(timing)
     print()
 
 
+def describe_timing(result: 'PartResult') -> str:
+    if result.cached:
+        return "From the result cache"
+    if result.parse_time is None:
+        return f"Solved in {result.wall_time:.3f}s"
+    shared = " (shared by all parts)" if result.shared_parse else ""
+    return f"Parsed in {result.parse_time:.3f}s{shared}, solved in {result.wall_time:.3f}s"
+
+
+def _shorten(text: str, width: int) -> str:
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def print_summary(results: list['PartResult']):
+    rows = [("Day", "Part", "Status", "Answer", "Parse (s)", "Wall (s)", "CPU (s)")]
+    for result in results:
+        rows.append((
+            str(result.day),
+            result.part.name.lower(),
+            result.status.name,
+            _shorten(result.answer or result.error or "", MAX_ANSWER_WIDTH),
+            f"{result.parse_time:.3f}" if result.parse_time is not None else "-",
+            f"{result.wall_time:.3f}",
+            f"{result.cpu_time:.3f}",
+        ))
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    for index, row in enumerate(rows):
+        print("  ".join(cell.rjust(width) if col >= 4 else cell.ljust(width)
+                        for col, (cell, width) in enumerate(zip(row, widths))))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
+    print()
+
+
+def write_json(results: list['PartResult'], output: Path):
+    content = json.dumps([result.as_dict() for result in results], indent=2)
+    if str(output) == "-":
+        print(content)
+    else:
+        output.write_text(content + "\n")
+
+
+def result_cache(args: argparse.Namespace) -> 'ResultCache | None':
+    if not args.cache:
+        return None
+    from aoc.utils.cache import ResultCache
+    return ResultCache()
+
+
+def run_batch(args: argparse.Namespace):
+    """
+    Run several days at once, each day in a worker process. Fails if any part
+    failed or hit a limit.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from aoc.launcher.runner import FAILED_STATUSES, Status, run_day
+    workers = max(1, min(len(args.days), os.cpu_count() or 1))
+    log.debug("Running days %s with %d workers", args.days, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_day, day, args.part, cache=result_cache(args), refresh=args.refresh,
+                               limits=args.limits)
+                   for day in args.days]
+        results = [result for future in futures for result in future.result()]
+
+    # Stubs are not worth a row in the summary
+    solved = [result for result in results if result.status != Status.UNSOLVED]
+    print_summary(solved)
+    skipped = len(results) - len(solved)
+    if skipped:
+        print(f"Skipped {skipped} unimplemented parts")
+    if args.json is not None:
+        write_json(solved, args.json)
+    return 1 if any(result.status in FAILED_STATUSES for result in results) else 0
+
+
+def _ignore_sigint():
+    """Leave Ctrl-C to the parent process, which terminates the workers"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_parts_in_parallel(args: argparse.Namespace):
+    """
+    Solve both parts at the same time, each in its own process. Solutions are
+    printed as soon as they are ready, but always first part first.
+    """
+    import multiprocessing
+    from aoc.launcher.runner import SINGLE_PARTS, solve_single_part
+    pool = multiprocessing.Pool(len(SINGLE_PARTS), initializer=_ignore_sigint)
+    try:
+        pending = [
+            pool.apply_async(solve_single_part, (args.day, part, args.input),
+                             dict(cache=result_cache(args), refresh=args.refresh))
+            for part in SINGLE_PARTS
+        ]
+        pool.close()
+        for task in pending:
+            result = task.get()
+            print_solution(args.day, result.part, solution=result.answer, timing=describe_timing(result))
+    except KeyboardInterrupt:
+        log.debug("Interrupted, terminating the workers")
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def print_results(results: list['PartResult']):
+    from aoc.launcher.runner import FAILED_STATUSES, Status
+    for result in results:
+        if result.status in FAILED_STATUSES:
+            reason = "failed" if result.status == Status.ERROR else f"hit a limit ({result.status.name})"
+            print(f"Day {result.day}, {result.part.name.capitalize()} Part {reason}: {result.error} ❌")
+            print()
+        else:
+            print_solution(result.day, result.part, solution=result.answer, timing=describe_timing(result))
+
+
+def run_via_daemon(args: argparse.Namespace):
+    from aoc.launcher.daemon import DaemonClient, DaemonError
+    from aoc.launcher.runner import FAILED_STATUSES
+    if isinstance(args.input, InputSource):
+        input_kwargs = dict(input_data=args.input.read_text())
+    else:
+        input_kwargs = dict(input_path=args.input)
+    try:
+        with DaemonClient(args.socket) as client:
+            results = client.solve(args.day, args.part, cache=args.cache, refresh=args.refresh, limits=args.limits,
+                                   **input_kwargs)
+    except DaemonError as e:
+        print(f"{e} ❌")
+        return 1
+    print_results(results)
+    return 1 if any(result.status in FAILED_STATUSES for result in results) else 0
+
+
+def run_many_inputs(args: argparse.Namespace):
+    from aoc.launcher.inputs import run_inputs
+    output = sys.stdout if args.json is None or str(args.json) == '-' else open(args.json, 'w')
+    try:
+        throughput = run_inputs(args.day, args.part, args.inputs, output, jobs=args.jobs,
+                                cache=result_cache(args), refresh=args.refresh, limits=args.limits)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(throughput.summary(), file=sys.stderr)
+    return 1 if throughput.failed else 0
+
+
+def run_queries(args: argparse.Namespace):
+    """Answer a batch of queries with the solve_queries(input_file, queries_file) hook of the day"""
+    for answer in args.module.solve_queries(args.input, args.queries):
+        print(answer)
+
+
 def command_run(args: argparse.Namespace):
-    if args.part.includes(Part.FIRST):
-        first = args.module.solve_first(args.input)
-        print_solution(args.day, Part.FIRST, solution=first)
-    if args.part.includes(Part.SECOND):
-        second = args.module.solve_second(args.input)
-        print_solution(args.day, Part.SECOND, solution=second)
+    if args.queries is not None:
+        run_queries(args)
+        return
+    if args.days is not None:
+        return run_batch(args)
+    if args.inputs is not None:
+        return run_many_inputs(args)
+    if args.watch:
+        from aoc.launcher.watch import watch
+        watch(args.day, args.module, args.part, args.input, print_results)
+        return
+    if args.via_daemon:
+        return run_via_daemon(args)
+    if args.parallel_parts and args.part == Part.ALL:
+        run_parts_in_parallel(args)
+        return
+
+    from aoc.launcher.runner import FAILED_STATUSES, solve_parts
+    profiles = {}
+    memory_trackers = {}
+    instrument = None
+    if args.profile:
+        from aoc.launcher.profiler import SamplingProfiler
+
+        def instrument(label: str):
+            return profiles.setdefault(label, SamplingProfiler(args.profile_interval / 1000))
+    elif args.trace_memory:
+        from aoc.utils.memory import MemoryTracker
+
+        def instrument(label: str):
+            return memory_trackers.setdefault(label, MemoryTracker())
+
+    results = solve_parts(args.day, args.module, args.part, args.input, capture_errors=False,
+                          cache=result_cache(args), refresh=args.refresh, instrument=instrument, limits=args.limits,
+                          jobs=args.jobs)
+    print_results(results)
+
+    for label, profile in profiles.items():
+        output = args.profile_output / f"day{args.day:02d}-{label}.collapsed"
+        profile.write_collapsed(output)
+        print(profile.summary(f"Profile of Day {args.day}, {label.capitalize()}", args.profile_top))
+        print(f"Collapsed stacks written to {output}")
+        print()
+
+    for label, tracker in memory_trackers.items():
+        print(tracker.report.summary(f"Memory of Day {args.day}, {label.capitalize()}"))
+        print()
+
+    return 1 if any(result.status in FAILED_STATUSES for result in results) else 0
+
+
+def command_scaling(args: argparse.Namespace):
+    from aoc.utils import scaling
+    seed = args.seed if args.seed is not None else scaling.DEFAULT_SEED
+    results = scaling.check_scaling(args.module, args.part, seed=seed)
+    for result in results:
+        print(result.summary())
+    return 0 if all(result.ok for result in results) else 1
+
+
+def command_bench(args: argparse.Namespace):
+    if args.scaling:
+        return command_scaling(args)
+    from aoc.launcher import bench
+    report = bench.run_bench(args.day, args.module, args.part, args.input,
+                             warmup=args.warmup, repeat=args.repeat, cold=args.cold)
+    bench.print_report(report)
+    if args.output is not None:
+        bench.save_report(report, args.output)
+    if args.baseline is not None:
+        regressions = bench.find_regressions(report, bench.load_report(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression} ❌")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} ✅")
+    return 0
 
 
 def command_test(args: argparse.Namespace):
     import pytest
     pytest_args = []
+    if args.debug:
+        pytest_args.extend(['--log-cli-level=DEBUG', '--aoc-trace'])
+    if args.timeout is not None:
+        pytest_args.append(f'--aoc-timeout={args.timeout}')
+    if args.max_memory is not None:
+        pytest_args.append(f'--aoc-max-memory={args.max_memory}')
+    if args.all and args.jobs > 1:
+        from aoc.launcher.shards import run_sharded
+        return run_sharded(args.jobs, pytest_args)
     if not args.all:
         pytest_args.append(Path(args.module.__file__).parent)
-    if args.debug:
-        pytest_args.append('--log-cli-level=DEBUG')
     log.debug("running pytest with %s", pytest_args)
-    pytest.main(pytest_args)
+    return int(pytest.main(pytest_args))
 
 
 def command_download(args: argparse.Namespace):
     from aocd.get import current_day
+    from aoc.utils.download import download_inputs
     last_day = current_day()
     days = [day for day in range(1, last_day + 1)] if args.all else [last_day]
-    for day in days:
-        fetch_input(day)
+    results = download_inputs(days, jobs=args.jobs, force=args.force)
+    failed = False
+    for day, result in results.items():
+        if isinstance(result, Exception):
+            failed = True
+            print(f"Day {day}: download failed: {result} ❌")
+        else:
+            print(f"Day {day}: {'downloaded' if result else 'already there'} ✅")
+    return 1 if failed else 0
+
+
+def command_serve(args: argparse.Namespace):
+    from aoc.launcher.daemon import DaemonError, default_socket_path, serve
+    try:
+        serve(args.socket or default_socket_path(), args.jobs)
+    except DaemonError as e:
+        print(f"{e} ❌")
+        return 1
+    return 0
 
 
 def main(argv=None):
@@ -56,11 +320,15 @@ def main(argv=None):
     args = parse_args(argv)
     try:
         if args.command == 'run':
-            command_run(args)
+            return command_run(args)
+        elif args.command == 'bench':
+            return command_bench(args)
         elif args.command == 'test':
-            command_test(args)
+            return command_test(args)
         elif args.command == 'dl':
-            command_download(args)
+            return command_download(args)
+        elif args.command == 'serve':
+            return command_serve(args)
         else:
             raise NotImplementedError(f"Command not implemented: {args.command}")
     except KeyboardInterrupt:
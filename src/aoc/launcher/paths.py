@@ -0,0 +1,11 @@
+"""
+Where the code lives on disk, for the launcher commands that run or watch it
+from outside of this process
+"""
+from pathlib import Path
+
+import aoc
+
+SRC_DIR = Path(aoc.__file__).resolve().parent.parent  # The directory with the aoc package, to run from
+DAYS_DIR = SRC_DIR / 'aoc' / 'days'
+UTILS_DIR = SRC_DIR / 'aoc' / 'utils'
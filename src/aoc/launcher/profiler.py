@@ -0,0 +1,104 @@
+"""
+Low overhead sampling profiler for solver runs.
+
+A CPU time interval timer (ITIMER_PROF) interrupts the process every so often,
+and the signal handler records the stack of the code running in the main
+thread. Unlike tracing profilers, the solver runs untouched between samples, so
+tight loops keep their real cost and the overhead stays small.
+
+Stacks can be written in the collapsed format understood by flamegraph tools
+(flamegraph.pl, inferno, speedscope) and summarised as the hottest functions.
+"""
+import signal
+import sys
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+
+from aoc.launcher.paths import SRC_DIR
+
+DEFAULT_INTERVAL = 0.001  # Seconds of CPU time between samples
+
+_SRC_DIR = f"{SRC_DIR}/"
+
+
+def is_supported() -> bool:
+    return hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+
+def describe_code(code: CodeType) -> str:
+    filename = code.co_filename
+    if filename.startswith(_SRC_DIR):
+        filename = filename[len(_SRC_DIR):]
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Context manager that samples the stack of the code running inside its block.
+    Stacks are cut at the frame that entered the block, so they start at
+    whatever was called from there.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples: Counter[tuple[CodeType, ...]] = Counter()
+        self._base_frame: FrameType | None = None
+        self._previous_handler = None
+
+    def _sample(self, signum, frame: FrameType | None):
+        stack = []
+        while frame is not None and frame is not self._base_frame:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if stack:
+            stack.reverse()
+            self.samples[tuple(stack)] += 1
+
+    def __enter__(self) -> 'SamplingProfiler':
+        self._base_frame = sys._getframe(1)
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        self._base_frame = None
+        return False
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> list[str]:
+        """Stacks in collapsed format: frames separated by ; and a sample count"""
+        lines = []
+        for stack, count in self.samples.most_common():
+            lines.append(f"{';'.join(describe_code(code) for code in stack)} {count}")
+        return lines
+
+    def write_collapsed(self, path: Path):
+        path.write_text("".join(f"{line}\n" for line in self.collapsed()))
+
+    def hot_functions(self, top: int) -> list[tuple[str, int, int]]:
+        """
+        The functions with most samples where they were running themselves (self),
+        as (function, self samples, samples anywhere in the stack)
+        """
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            for code in set(stack):
+                inclusive[code] += count
+        return [(describe_code(code), count, inclusive[code]) for code, count in own.most_common(top)]
+
+    def summary(self, title: str, top: int) -> str:
+        total = self.total_samples
+        lines = [title, "-" * len(title), f"{total} samples every {self.interval * 1000:g}ms of CPU time"]
+        if total:
+            lines.append(f"{'self':>7} {'total':>7}  function")
+            for function, own, inclusive in self.hot_functions(top):
+                lines.append(f"{own / total:>7.1%} {inclusive / total:>7.1%}  {function}")
+        return "\n".join(lines)
@@ -0,0 +1,306 @@
+"""
+Running day solvers and collecting timed results.
+
+Everything here is picklable (plain functions, enums and dataclasses) so that it
+can be used from worker processes.
+"""
+import contextlib
+import enum
+import functools
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, ContextManager
+from pathlib import Path
+from types import ModuleType
+
+from aoc import days
+from aoc.utils import Part, day_input_path
+
+if TYPE_CHECKING:
+    # Only needed with a cache or limits, so they are left out of the cold start
+    from aoc.utils.cache import ResultCache
+    from aoc.utils.limits import Limits
+
+log = logging.getLogger(__name__)
+
+SINGLE_PARTS = (Part.FIRST, Part.SECOND)
+
+# Gets a label ("first", "second" or "parse") and returns a context manager to
+# run that call in, for profiling and the like
+Instrument = Callable[[str], ContextManager]
+
+
+class Status(enum.Enum):
+    OK = enum.auto()
+    UNSOLVED = enum.auto()  # The solver is a stub and returned None
+    NO_INPUT = enum.auto()
+    ERROR = enum.auto()
+    TIMEOUT = enum.auto()  # Went over the time limit
+    OOM = enum.auto()  # Went over the memory limit
+
+
+FAILED_STATUSES = frozenset({Status.ERROR, Status.TIMEOUT, Status.OOM})  # A run with any of these fails
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: Part
+    status: Status
+    answer: str | None = None
+    wall_time: float = 0.0  # Solving only, when the input was parsed separately
+    cpu_time: float = 0.0
+    error: str | None = None
+    parse_time: float | None = None  # None if the day has no parse hook
+    shared_parse: bool = True  # Whether parse_time was paid once for all the parts
+    cached: bool = False  # The answer came from the result cache
+
+    def as_dict(self) -> dict:
+        return {
+            "day": self.day,
+            "part": self.part.name.lower(),
+            "status": self.status.name,
+            "answer": self.answer,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "parse_time": self.parse_time,
+            "shared_parse": self.shared_parse,
+            "cached": self.cached,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PartResult':
+        return cls(
+            day=data["day"],
+            part=Part[data["part"].upper()],
+            status=Status[data["status"]],
+            answer=data["answer"],
+            wall_time=data["wall_time"],
+            cpu_time=data["cpu_time"],
+            error=data["error"],
+            parse_time=data["parse_time"],
+            shared_parse=data.get("shared_parse", True),
+            cached=data["cached"],
+        )
+
+
+def solver_for(module: ModuleType, part: Part):
+    if part == Part.FIRST:
+        return module.solve_first
+    if part == Part.SECOND:
+        return module.solve_second
+    raise ValueError(f"A solver is for a single part, not {part}")
+
+
+def parallel_solver_for(module: ModuleType, part: Part) -> Callable | None:
+    """
+    The parallel version of the solver of a part, solve_first_parallel(input_file, jobs)
+    or solve_second_parallel(input_file, jobs), if the day has one (see aoc.utils.mapreduce)
+    """
+    return getattr(module, f"solve_{part.name.lower()}_parallel", None)
+
+
+def has_parse_hook(module: ModuleType) -> bool:
+    """
+    Whether the day splits parsing from solving with a parse(input_file) and a
+    solve(parsed, part) function, so the parsed input can be shared by both parts
+    """
+    return callable(getattr(module, "parse", None)) and callable(getattr(module, "solve", None))
+
+
+def _no_instrument(label: str) -> ContextManager:
+    return contextlib.nullcontext()
+
+
+def _limit_status(error: Exception) -> Status | None:
+    """The status for a limit the error says was hit, None for any other error"""
+    from aoc.utils.limits import SolverOutOfMemory, SolverTimeout
+    if isinstance(error, SolverTimeout):
+        return Status.TIMEOUT
+    if isinstance(error, SolverOutOfMemory):
+        return Status.OOM
+    return None
+
+
+def _timed_call(day: int, part: Part, label: str, function, *args, capture_errors: bool,
+                instrument: Instrument | None) -> PartResult:
+    instrumentation = (instrument or _no_instrument)(label)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        with instrumentation:
+            answer = function(*args)
+    except Exception as e:
+        # Limits hit inside the solver, like those of an external solver, are
+        # a status and not a failure
+        status = _limit_status(e)
+        if status is None:
+            if not capture_errors:
+                raise
+            log.debug("Solver for day %d, part %s failed", day, part.name, exc_info=True)
+            status = Status.ERROR
+        answer, error = None, f"{type(e).__name__}: {e}"
+    else:
+        status = Status.UNSOLVED if answer is None else Status.OK
+        error = None
+    return PartResult(
+        day=day,
+        part=part,
+        status=status,
+        answer=answer,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+        error=error,
+    )
+
+
+def solve_part(day: int, module: ModuleType, part: Part, input_file: Path, *,
+               capture_errors: bool = True, instrument: Instrument | None = None) -> PartResult:
+    """Run the solver of one part, timing it and capturing any error"""
+    return _timed_call(day, part, part.name.lower(), solver_for(module, part), input_file,
+                       capture_errors=capture_errors, instrument=instrument)
+
+
+def parse_input(day: int, module: ModuleType, input_file: Path, part: Part = Part.ALL, *,
+                capture_errors: bool = True, instrument: Instrument | None = None) -> PartResult:
+    """Run the parse hook of a day, timing it. The parsed input is the answer of the result."""
+    return _timed_call(day, part, "parse", module.parse, input_file,
+                       capture_errors=capture_errors, instrument=instrument)
+
+
+def solve_parsed(day: int, module: ModuleType, parts: list[Part], parsing: PartResult, *,
+                 capture_errors: bool = True, instrument: Instrument | None = None) -> list[PartResult]:
+    """Run the solve hook of a day for every part on an input parsed by parse_input"""
+    if parsing.status == Status.ERROR:
+        return [PartResult(day, p, Status.ERROR, error=parsing.error, parse_time=parsing.wall_time)
+                for p in parts]
+    results = []
+    for single_part in parts:
+        result = _timed_call(day, single_part, single_part.name.lower(), module.solve, parsing.answer, single_part,
+                             capture_errors=capture_errors, instrument=instrument)
+        result.parse_time = parsing.wall_time
+        results.append(result)
+    return results
+
+
+def _solve_uncached(day: int, module: ModuleType, parts: list[Part], input_file: Path, *,
+                    capture_errors: bool, instrument: Instrument | None, jobs: int | None = None) -> list[PartResult]:
+    if jobs is not None:
+        results = {}
+        for single_part in parts:
+            if (solver := parallel_solver_for(module, single_part)) is not None:
+                results[single_part] = _timed_call(day, single_part, single_part.name.lower(),
+                                                   functools.partial(solver, jobs=jobs), input_file,
+                                                   capture_errors=capture_errors, instrument=instrument)
+        serial = [p for p in parts if p not in results]
+        if serial:
+            for result in _solve_uncached(day, module, serial, input_file,
+                                          capture_errors=capture_errors, instrument=instrument):
+                results[result.part] = result
+        return [results[p] for p in parts]
+    if not has_parse_hook(module):
+        return [solve_part(day, module, p, input_file, capture_errors=capture_errors, instrument=instrument)
+                for p in parts]
+    parsing = parse_input(day, module, input_file, parts[0], capture_errors=capture_errors, instrument=instrument)
+    return solve_parsed(day, module, parts, parsing, capture_errors=capture_errors, instrument=instrument)
+
+
+def _solve_limited(day: int, module: ModuleType, parts: list[Part], input_file: Path, *,
+                   capture_errors: bool, limits: 'Limits', jobs: int | None) -> list[PartResult]:
+    """
+    Solve every part in a child process of its own, under the limits. Each
+    child parses the input again, so that a part going over a limit cannot
+    take the others down with it.
+    """
+    from aoc.utils.limits import LimitExceeded, call_with_limits
+    results = []
+    for single_part in parts:
+        solve = functools.partial(_solve_uncached, day, module, [single_part], input_file,
+                                  capture_errors=capture_errors, instrument=None, jobs=jobs)
+        wall_start = time.perf_counter()
+        try:
+            [result] = call_with_limits(solve, limits=limits)
+        except LimitExceeded as e:
+            result = PartResult(day, single_part, _limit_status(e), wall_time=time.perf_counter() - wall_start,
+                                error=str(e))
+        result.shared_parse = False
+        results.append(result)
+    return results
+
+
+def _solve(day: int, module: ModuleType, parts: list[Part], input_file: Path, *, capture_errors: bool,
+           instrument: Instrument | None, limits: 'Limits | None', jobs: int | None) -> list[PartResult]:
+    if limits:
+        return _solve_limited(day, module, parts, input_file, capture_errors=capture_errors, limits=limits,
+                              jobs=jobs)
+    return _solve_uncached(day, module, parts, input_file, capture_errors=capture_errors, instrument=instrument,
+                           jobs=jobs)
+
+
+def solve_parts(day: int, module: ModuleType, part: Part, input_file: Path, *,
+                capture_errors: bool = True, cache: 'ResultCache | None' = None,
+                refresh: bool = False, instrument: Instrument | None = None,
+                limits: 'Limits | None' = None, jobs: int | None = None) -> list[PartResult]:
+    """
+    Run the requested parts of a day. Days with a parse hook get their input
+    parsed once for all the parts, and the parse time is reported separately.
+
+    With a cache, answers are taken from it when possible (unless refreshing),
+    and new answers are stored in it.
+
+    An instrument, if given, wraps every call to parse or solve.
+
+    With limits, every part is solved in a child process of its own (parsing
+    included), and going over a limit is a TIMEOUT or OOM result, not an error.
+    So is a SolverTimeout or SolverOutOfMemory raised by a solver, like that of
+    an external solver going over its own limits.
+    Instruments cannot reach into those processes and are not used.
+
+    With jobs, the parts that have a parallel solver are solved with it, over
+    chunks of the input in that many worker processes. The rest are solved as
+    usual. Answers are the same either way, and so are their cache entries.
+    """
+    parts = [p for p in SINGLE_PARTS if part.includes(p)]
+    if cache is None:
+        return _solve(day, module, parts, input_file, capture_errors=capture_errors, instrument=instrument,
+                      limits=limits, jobs=jobs)
+
+    results = {}
+    keys = {p: cache.key(day, p, module, input_file) for p in parts}
+    if not refresh:
+        for single_part, key in keys.items():
+            if (answer := cache.get(key)) is not None:
+                results[single_part] = PartResult(day, single_part, Status.OK, answer=answer, cached=True)
+    missing = [p for p in parts if p not in results]
+    if missing:
+        for result in _solve(day, module, missing, input_file, capture_errors=capture_errors,
+                             instrument=instrument, limits=limits, jobs=jobs):
+            if result.status == Status.OK:
+                cache.put(keys[result.part], result.answer)
+            results[result.part] = result
+    return [results[p] for p in parts]
+
+
+def solve_single_part(day: int, part: Part, input_file: Path, *, cache: 'ResultCache | None' = None,
+                      refresh: bool = False, limits: 'Limits | None' = None) -> PartResult:
+    """Solve one part of a day on its own, as a task for a worker process"""
+    [result] = solve_parts(day, days.get_day(day), part, input_file, capture_errors=False,
+                           cache=cache, refresh=refresh, limits=limits)
+    return result
+
+
+def run_day(day: int, part: Part = Part.ALL, input_file: Path | None = None, *,
+            cache: 'ResultCache | None' = None, refresh: bool = False,
+            limits: 'Limits | None' = None) -> list[PartResult]:
+    """Run the requested parts of a day, with its default input unless one is given"""
+    if input_file is None:
+        input_file = day_input_path(day)
+    module = days.get_day(day)
+    if not input_file.exists():
+        # Stubs do not read their input, so they are still told apart by running them
+        results = [solve_part(day, module, p, input_file) for p in SINGLE_PARTS if part.includes(p)]
+        return [result if result.status == Status.UNSOLVED
+                else PartResult(day, result.part, Status.NO_INPUT, error=f"Missing {input_file.name} file")
+                for result in results]
+    return solve_parts(day, module, part, input_file, cache=cache, refresh=refresh, limits=limits)
@@ -0,0 +1,181 @@
+"""
+Running the test suite in parallel shards.
+
+The unit of work is a test package (the ``test`` directory of a day, of the
+launcher or of the utils). Packages are spread over the workers by how long
+their tests took last time, longest first onto the least loaded worker, so
+all the workers finish at about the same time. Each worker is a pytest process
+of its own writing a JUnit XML report, and those reports are merged into one.
+"""
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from aoc.launcher.paths import SRC_DIR
+from aoc.utils.cache import default_cache_dir
+
+log = logging.getLogger(__name__)
+
+DURATIONS_FILE_NAME = 'test-durations.json'
+DEFAULT_DURATION = 1.0  # Seconds, for packages that never ran before
+
+# pytest exit codes
+EXIT_OK = 0
+EXIT_TESTS_FAILED = 1
+EXIT_NO_TESTS = 5
+
+
+def find_test_packages(root: Path = SRC_DIR / 'aoc') -> list[Path]:
+    return sorted(path for path in root.rglob('test') if path.is_dir() and (path / '__init__.py').exists())
+
+
+def package_name(package: Path) -> str:
+    return package.relative_to(SRC_DIR).as_posix()
+
+
+def durations_path() -> Path:
+    return default_cache_dir() / DURATIONS_FILE_NAME
+
+
+def load_durations(path: Path) -> dict[str, float]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path: Path, durations: dict[str, float]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def split_packages(packages: list[str], durations: dict[str, float], jobs: int) -> list[list[str]]:
+    """Spread the packages over at most ``jobs`` shards with about the same total duration"""
+    shards: list[list[str]] = [[] for _ in range(min(jobs, len(packages)))]
+    loads = [0.0] * len(shards)
+    for package in sorted(packages, key=lambda name: (-durations.get(name, DEFAULT_DURATION), name)):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(package)
+        loads[lightest] += durations.get(package, DEFAULT_DURATION)
+    return shards
+
+
+@dataclass
+class ShardResult:
+    packages: list[str]
+    returncode: int
+    output: str
+    wall_time: float
+    outcomes: Counter = field(default_factory=Counter)
+    failures: list[str] = field(default_factory=list)
+    durations: dict[str, float] = field(default_factory=dict)  # Per package
+
+
+def _outcome(testcase: ElementTree.Element) -> str:
+    for child in testcase:
+        if child.tag in ('failure', 'error'):
+            return 'failed' if child.tag == 'failure' else 'error'
+        if child.tag == 'skipped':
+            return 'xfailed' if child.get('type') == 'pytest.xfail' else 'skipped'
+    return 'passed'
+
+
+def read_junit(report: Path, result: ShardResult):
+    """Collect the outcomes and the durations per package of a JUnit XML report"""
+    if not report.exists() or report.stat().st_size == 0:
+        return
+    for testcase in ElementTree.parse(report).iter('testcase'):
+        outcome = _outcome(testcase)
+        result.outcomes[outcome] += 1
+        classname = testcase.get('classname', '')
+        if outcome in ('failed', 'error'):
+            result.failures.append(f"{classname}::{testcase.get('name')} {outcome.upper()}")
+        # Classes are dotted module paths relative to the pytest root, like
+        # src.aoc.days.day01.test.test_solve
+        package = next((package for package in result.packages
+                        if f".{package.replace('/', '.')}." in f".{classname}."), None)
+        if package is not None:
+            result.durations[package] = result.durations.get(package, 0.0) + float(testcase.get('time', 0))
+
+
+def merge_returncodes(returncodes: list[int]) -> int:
+    """
+    The exit code pytest would have given for the whole run: errors that are not
+    test failures first, then test failures, and no tests only if no shard had any
+    """
+    worst = [rc for rc in returncodes if rc not in (EXIT_OK, EXIT_TESTS_FAILED, EXIT_NO_TESTS)]
+    if worst:
+        return max(worst)
+    if EXIT_TESTS_FAILED in returncodes:
+        return EXIT_TESTS_FAILED
+    if returncodes and all(rc == EXIT_NO_TESTS for rc in returncodes):
+        return EXIT_NO_TESTS
+    return EXIT_OK
+
+
+def run_shards(shards: list[list[str]], pytest_args: list[str]) -> list[ShardResult]:
+    """Run every shard in a pytest process of its own, all at the same time"""
+    with tempfile.TemporaryDirectory(prefix='aoc-shards-') as report_dir:
+        running = []
+        for index, packages in enumerate(shards):
+            report = Path(report_dir) / f'shard-{index}.xml'
+            command = [sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider', f'--junitxml={report}',
+                       *pytest_args, *packages]
+            log.debug("Starting shard %d: %s", index, command)
+            process = subprocess.Popen(command, cwd=SRC_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True)
+            running.append((packages, report, process, time.perf_counter()))
+
+        results = []
+        for packages, report, process, start in running:
+            output, _ = process.communicate()
+            result = ShardResult(packages, process.returncode, output, time.perf_counter() - start)
+            read_junit(report, result)
+            results.append(result)
+    return results
+
+
+def print_report(results: list[ShardResult], wall_time: float):
+    for index, result in enumerate(results):
+        print(f"Shard {index}: {len(result.packages)} packages in {result.wall_time:.1f}s, "
+              f"exit code {result.returncode}")
+        if result.returncode not in (EXIT_OK, EXIT_NO_TESTS):
+            print(result.output)
+
+    failures = [failure for result in results for failure in result.failures]
+    if failures:
+        print("Failed tests:")
+        for failure in failures:
+            print(f"  {failure}")
+    outcomes = sum((result.outcomes for result in results), Counter())
+    counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())) or "no tests ran"
+    verdict = "❌" if failures or any(result.returncode not in (EXIT_OK, EXIT_NO_TESTS) for result in results) \
+        else "✅"
+    print(f"{counts} in {wall_time:.1f}s over {len(results)} shards {verdict}")
+
+
+def run_sharded(jobs: int, pytest_args: list[str] | None = None) -> int:
+    """Run all the test packages over ``jobs`` workers, and return pytest's exit code for the lot"""
+    history_path = durations_path()
+    durations = load_durations(history_path)
+    packages = [package_name(package) for package in find_test_packages()]
+    shards = split_packages(packages, durations, jobs)
+
+    start = time.perf_counter()
+    results = run_shards(shards, pytest_args or [])
+    print_report(results, time.perf_counter() - start)
+
+    for result in results:
+        durations.update(result.durations)
+    try:
+        save_durations(history_path, durations)
+    except OSError as e:
+        log.warning("Could not save test durations to %s: %s", history_path, e)
+    return merge_returncodes([result.returncode for result in results])
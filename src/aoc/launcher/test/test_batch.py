@@ -0,0 +1,151 @@
+import argparse
+
+import pytest
+
+from aoc.launcher.args import day_range
+from aoc.launcher.runner import Status, run_day
+from aoc.utils import Part
+
+
+@pytest.mark.parametrize('spec,expected', (
+        ('5', [5]),
+        ('1-3', [1, 2, 3]),
+        ('7,1-2,2', [1, 2, 7]),
+))
+def test_day_range(spec, expected):
+    assert day_range(spec) == expected
+
+
+@pytest.mark.parametrize('spec', ('1-x', '7-1', '3,5-4', ''))
+def test_day_range_invalid(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        day_range(spec)
+
+
+def test_run_day(tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\npqr3stu8vwx\n')
+    first, second = run_day(1, Part.ALL, input_file)
+    assert (first.part, first.status, first.answer) == (Part.FIRST, Status.OK, '50')
+    assert (second.part, second.status, second.answer) == (Part.SECOND, Status.OK, '50')
+
+
+def test_run_day_stub(tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text('anything\n')
+    [result] = run_day(25, Part.FIRST, input_file)
+    assert result.status == Status.UNSOLVED
+
+
+def test_run_day_without_input(tmp_path):
+    [result] = run_day(1, Part.SECOND, tmp_path / 'input')
+    assert result.status == Status.NO_INPUT
+
+
+def test_run_day_stub_without_input(tmp_path):
+    [result] = run_day(25, Part.FIRST, tmp_path / 'input')
+    assert result.status == Status.UNSOLVED
+
+
+def test_batch_fails_with_failed_parts(tmp_path, monkeypatch, capsys):
+    from aoc.days import day01
+    from aoc.launcher import main
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\n')
+    monkeypatch.setattr('aoc.launcher.runner.day_input_path', lambda day: input_file)
+    monkeypatch.setattr(day01, 'solve_second', lambda f: 1 / 0)  # Forked workers get it too
+    assert main(['aoc', 'run', '--days', '1', '--no-cache']) == 1
+    assert 'ZeroDivisionError' in capsys.readouterr().out
+
+
+def test_summary_shortens_long_answers(capsys):
+    from aoc.launcher.main import MAX_ANSWER_WIDTH, print_summary
+    from aoc.launcher.runner import PartResult
+    print_summary([PartResult(6, Part.SECOND, Status.OK, answer='9' * 200)])
+    answer_line = capsys.readouterr().out.splitlines()[2]
+    assert '9' * (MAX_ANSWER_WIDTH - 1) + '…' in answer_line
+    assert '9' * MAX_ANSWER_WIDTH not in answer_line
+
+
+def test_solve_parts_parses_once(tmp_path, monkeypatch):
+    from aoc.days import day07
+    from aoc.launcher.runner import solve_parts
+    input_file = tmp_path / 'input'
+    input_file.write_text('32T3K 765\nT55J5 684\nKK677 28\nKTJJT 220\nQQQJA 483\n')
+    parse_calls = []
+    original_parse = day07.parse
+    monkeypatch.setattr(day07, 'parse', lambda f: parse_calls.append(f) or original_parse(f))
+
+    first, second = solve_parts(7, day07, Part.ALL, input_file)
+    assert (first.answer, second.answer) == ('6440', '5905')
+    assert parse_calls == [input_file]
+    assert first.parse_time is not None and first.parse_time == second.parse_time
+
+
+def test_parallel_parts(tmp_path, capsys):
+    from aoc.launcher import main
+    input_file = tmp_path / 'input'
+    input_file.write_text('32T3K 765\nT55J5 684\nKK677 28\nKTJJT 220\nQQQJA 483\n')
+    main(['aoc', 'run', '--day', '7', '--input', str(input_file), '--parallel-parts', '--no-cache'])
+    output = capsys.readouterr().out
+    assert output.index('First Part') < output.index('6440') < output.index('Second Part') < output.index('5905')
+
+
+def test_solve_parts_with_limits(tmp_path, monkeypatch):
+    import time
+    from aoc.days import day01
+    from aoc.launcher.runner import solve_parts
+    from aoc.utils.limits import Limits
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\npqr3stu8vwx\n')
+    monkeypatch.setattr(day01, 'solve_second', lambda f: time.sleep(10))
+
+    first, second = solve_parts(1, day01, Part.ALL, input_file, limits=Limits(timeout=1))
+    assert (first.status, first.answer) == (Status.OK, '50')
+    assert second.status == Status.TIMEOUT
+    assert second.wall_time < 5
+
+
+def test_solve_parts_with_limits_parses_per_part(tmp_path):
+    from aoc.days import day07
+    from aoc.launcher.runner import solve_parts
+    from aoc.utils.limits import Limits
+    input_file = tmp_path / 'input'
+    input_file.write_text('32T3K 765\nT55J5 684\nKK677 28\nKTJJT 220\nQQQJA 483\n')
+    results = solve_parts(7, day07, Part.ALL, input_file, limits=Limits(timeout=10))
+    assert [result.answer for result in results] == ['6440', '5905']
+    assert all(result.parse_time is not None and not result.shared_parse for result in results)
+
+
+def test_limit_raised_by_a_solver_is_a_status(tmp_path, monkeypatch):
+    from aoc.days import day01
+    from aoc.launcher.runner import solve_parts
+    from aoc.utils.limits import SolverOutOfMemory
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\n')
+
+    def external_solver(input_file):
+        raise SolverOutOfMemory("Command ran out of memory (rc=1)")
+
+    monkeypatch.setattr(day01, 'solve_second', external_solver)
+    first, second = solve_parts(1, day01, Part.ALL, input_file, capture_errors=False)
+    assert (first.status, second.status) == (Status.OK, Status.OOM)
+    assert 'ran out of memory' in second.error
+
+
+def test_solve_parts_with_jobs(tmp_path, monkeypatch):
+    from aoc.days import day04
+    from aoc.launcher.runner import solve_parts
+    input_file = tmp_path / 'input'
+    input_file.write_text('Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53\n'
+                          'Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19\n')
+    parallel_calls = []
+    original_parallel = day04.solve_first_parallel
+    monkeypatch.setattr(day04, 'solve_first_parallel',
+                        lambda f, jobs: parallel_calls.append(jobs) or original_parallel(f, jobs))
+
+    # Day 4 only has a parallel first part, the second is solved as usual
+    first, second = solve_parts(4, day04, Part.ALL, input_file, jobs=2)
+    assert (first.status, first.answer) == (Status.OK, '10')
+    assert (second.status, second.answer) == (Status.OK, day04.solve_second(input_file))
+    assert parallel_calls == [2]
@@ -0,0 +1,59 @@
+from dataclasses import asdict
+
+import pytest
+
+from aoc.launcher.args import parse_args
+from aoc.launcher.bench import Stats, find_regressions, percentile
+
+
+@pytest.mark.parametrize('pct,expected', (
+        (0, 1.0),
+        (50, 5.0),
+        (95, 10.0),
+        (100, 10.0),
+))
+def test_percentile(pct, expected):
+    assert percentile([float(n) for n in range(10, 0, -1)], pct) == expected
+
+
+def test_stats():
+    stats = Stats.from_samples([1.0, 2.0, 3.0, 6.0])
+    assert (stats.runs, stats.min, stats.median, stats.mean, stats.p95) == (4, 1.0, 2.5, 3.0, 6.0)
+
+
+def _report(warm_median, cold_median=None):
+    part = {"answer": "1", "warm": asdict(Stats.from_samples([warm_median]))}
+    if cold_median is not None:
+        part["cold"] = asdict(Stats.from_samples([cold_median]))
+    return {"day": 1, "parts": {"first": part}}
+
+
+def test_find_regressions():
+    baseline = _report(1.0, 2.0)
+    assert find_regressions(_report(1.05, 2.0), baseline, threshold=0.1) == []
+    regressions = find_regressions(_report(1.5, 2.0), baseline, threshold=0.1)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("first part, warm")
+
+
+def test_find_regressions_skips_missing_measurements():
+    assert find_regressions(_report(5.0, 5.0), _report(1.0), threshold=0.1) != []
+    assert find_regressions(_report(1.0, 5.0), _report(1.0), threshold=0.1) == []
+
+
+@pytest.mark.parametrize('option', (['--warmup', '0'], ['--warmup', '-1'], ['--cold', '-1'], ['--repeat', '0'],
+                                    ['--threshold', '-0.1']))
+def test_bench_rejects_invalid_counts(option, tmp_path, capsys):
+    input_file = tmp_path / 'input'
+    input_file.write_text("1\n")
+    with pytest.raises(SystemExit):
+        parse_args(['aoc', 'bench', '--day', '1', '--input', str(input_file), *option])
+    assert "Must be" in capsys.readouterr().err
+
+
+def test_bench_counts(tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text("1\n")
+    args = parse_args(['aoc', 'bench', '--day', '1', '--input', str(input_file), '--warmup', '2', '--cold', '0',
+                       '--threshold', '0'])
+    assert (args.warmup, args.cold, args.threshold) == (2, 0, 0)
@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from aoc.launcher.paths import SRC_DIR
+
+# Ceiling for importing the launcher and resolving one day, about twice what
+# it takes. Importing every day module eagerly, or the process pools, the
+# runner and the cache up front, used to eat most of it on a cold interpreter.
+COLD_START_BUDGET_SECONDS = 0.2
+
+# Only the commands that use them import these
+DEFERRED_MODULES = ('multiprocessing', 'concurrent.futures', 'hashlib', 'aoc.launcher.runner', 'aoc.utils.limits')
+
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from aoc.launcher.args import parse_args
+parse_args(['aoc', 'run', '--day', '1', '--input', sys.argv[1]])
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in sys.modules if name.startswith('aoc.days.'))
+print(json.dumps({'elapsed': elapsed, 'loaded': loaded, 'modules': sorted(sys.modules)}))
+"""
+
+
+def _cold_start(input_file: Path) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT, str(input_file)],
+        cwd=SRC_DIR, capture_output=True, check=True, encoding="utf-8",
+    )
+    return json.loads(result.stdout)
+
+
+def test_only_requested_day_is_imported(tmp_path):
+    input_file = tmp_path / "input"
+    input_file.write_text("1abc2\n")
+    assert _cold_start(input_file)["loaded"] == ["aoc.days.day01"]
+
+
+def test_deferred_imports(tmp_path):
+    input_file = tmp_path / "input"
+    input_file.write_text("1abc2\n")
+    assert not set(DEFERRED_MODULES) & set(_cold_start(input_file)["modules"])
+
+
+def test_cold_start_budget(tmp_path):
+    input_file = tmp_path / "input"
+    input_file.write_text("1abc2\n")
+    # Best of a few runs, to keep a busy machine from failing the test
+    elapsed = min(_cold_start(input_file)["elapsed"] for _ in range(3))
+    assert elapsed < COLD_START_BUDGET_SECONDS
+
+
+def test_lazy_attribute_access():
+    from aoc import days
+    assert days.get_day(1) is days.day01
+    assert days.get_day(99) is None
+    assert "day25" in dir(days)
@@ -0,0 +1,126 @@
+import argparse
+import os
+import signal
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from aoc.launcher.daemon import DaemonClient, DaemonError, SolverDaemon
+from aoc.launcher.main import run_via_daemon
+from aoc.launcher.runner import Status
+from aoc.utils import Part
+from aoc.utils.limits import Limits
+
+EXAMPLE = "1abc2\npqr3stu8vwx\na1b2c3d4e5f\ntreb7uchet\n"
+
+
+@pytest.fixture(scope='module')
+def daemon():
+    # Unix socket paths have to be short, which pytest's tmp_path might not be
+    with tempfile.TemporaryDirectory(prefix='aoc-') as directory:
+        server = SolverDaemon(Path(directory) / 'daemon.sock', jobs=1)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_solve_inline_input(daemon):
+    with DaemonClient(daemon.socket_path) as client:
+        results = client.solve(1, Part.ALL, input_data=EXAMPLE)
+    assert [(result.part, result.status, result.answer) for result in results] == [
+        (Part.FIRST, Status.OK, '142'), (Part.SECOND, Status.OK, '142')]
+
+
+def test_solve_input_path(daemon, tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text(EXAMPLE)
+    with DaemonClient(daemon.socket_path) as client:
+        [result] = client.solve(1, Part.FIRST, input_path=input_file)
+        # Several requests over the same connection
+        [again] = client.solve(1, Part.FIRST, input_path=input_file)
+    assert result.answer == again.answer == '142'
+
+
+def test_errors(daemon):
+    with DaemonClient(daemon.socket_path) as client:
+        with pytest.raises(DaemonError, match="day 99"):
+            client.solve(99, input_data=EXAMPLE)
+        with pytest.raises(DaemonError, match="FileNotFoundError"):
+            client.solve(1, input_path=Path('/does/not/exist'))
+        # Errors in the solver are results, as in a batch run
+        [result] = client.solve(2, Part.FIRST, input_data="not a game\n")
+    assert result.status == Status.ERROR
+
+
+def test_limits(daemon, tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text(EXAMPLE * 100_000)
+    with DaemonClient(daemon.socket_path) as client:
+        results = client.solve(1, Part.ALL, input_path=input_file, limits=Limits(timeout=0.001))
+        assert [result.status for result in results] == [Status.TIMEOUT, Status.TIMEOUT]
+        [result] = client.solve(1, Part.FIRST, input_data=EXAMPLE, limits=Limits(timeout=10))
+        assert result.answer == '142'
+        with pytest.raises(DaemonError, match="timeout must be more than 0"):
+            client.solve(1, input_data=EXAMPLE, limits=Limits(timeout=-1))
+
+
+def test_run_via_daemon_fails_on_limits(daemon, tmp_path, capsys):
+    input_file = tmp_path / 'input'
+    input_file.write_text(EXAMPLE * 100_000)
+    args = argparse.Namespace(input=input_file, socket=daemon.socket_path, day=1, part=Part.FIRST, cache=False,
+                              refresh=False, limits=Limits(timeout=0.001))
+    assert run_via_daemon(args) == 1
+    assert "hit a limit (TIMEOUT)" in capsys.readouterr().out
+
+
+def test_dead_worker_restarts_the_pool(daemon):
+    pool = daemon.pool
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+    with DaemonClient(daemon.socket_path) as client:
+        with pytest.raises(DaemonError, match="worker died"):
+            client.solve(1, Part.FIRST, input_data=EXAMPLE)
+        assert daemon.pool is not pool
+        assert client.solve(1, Part.FIRST, input_data=EXAMPLE)[0].answer == '142'
+
+
+def test_code_changes_restart_the_pool(daemon, monkeypatch):
+    pool = daemon.pool
+    monkeypatch.setattr(daemon, '_code_stamp', ())  # As if every source changed since the workers started
+    with DaemonClient(daemon.socket_path) as client:
+        assert client.solve(1, Part.FIRST, input_data=EXAMPLE)[0].answer == '142'
+    assert daemon.pool is not pool
+    assert daemon._code_stamp != ()
+
+
+def test_concurrent_clients_and_stats(daemon):
+    def solve(_):
+        with DaemonClient(daemon.socket_path) as client:
+            return client.solve(1, Part.FIRST, input_data=EXAMPLE)[0].answer
+
+    with DaemonClient(daemon.socket_path) as client:
+        before = client.stats()
+        with ThreadPoolExecutor(4) as pool:
+            assert list(pool.map(solve, range(8))) == ['142'] * 8
+        stats = client.stats()
+    assert stats["requests"] == before["requests"] + 8
+    assert stats["active"] == 0
+    assert stats["throughput"] > 0
+    assert 0 < stats["latency"]["p50"] <= stats["latency"]["max"]
+
+
+def test_one_daemon_per_socket(daemon):
+    with pytest.raises(DaemonError, match="already listening"):
+        SolverDaemon(daemon.socket_path, jobs=1)
+
+
+def test_no_daemon():
+    with pytest.raises(DaemonError, match="No daemon"):
+        DaemonClient(Path('/tmp/aoc-no-such-daemon.sock'))
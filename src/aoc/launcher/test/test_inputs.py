@@ -0,0 +1,45 @@
+import io
+import json
+
+from aoc.launcher.inputs import expand_inputs, run_inputs
+from aoc.utils import Part
+
+
+def _write_inputs(directory, count):
+    directory.mkdir()
+    for index in range(count):
+        (directory / f'input{index}').write_text(f"{index + 1}abc{index + 1}\n")
+    (directory / '.hidden').write_text("not an input\n")
+    return directory
+
+
+def test_expand_inputs(tmp_path):
+    directory = _write_inputs(tmp_path / 'inputs', 3)
+    (directory / 'nested').mkdir()
+    assert [path.name for path in expand_inputs(str(directory))] == ['input0', 'input1', 'input2']
+    assert [path.name for path in expand_inputs(str(directory / 'input[12]'))] == ['input1', 'input2']
+    assert expand_inputs(str(tmp_path / 'missing*')) == []
+
+
+def test_run_inputs(tmp_path):
+    paths = expand_inputs(str(_write_inputs(tmp_path / 'inputs', 4)))
+    output = io.StringIO()
+    throughput = run_inputs(1, Part.FIRST, paths, output, jobs=2)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted((line["input"], line["answer"]) for line in lines) == [
+        (str(path), f"{index + 1}{index + 1}") for index, path in enumerate(paths)]
+    assert throughput.inputs == 4
+    assert throughput.size == sum(path.stat().st_size for path in paths)
+    assert throughput.failed == 0
+    assert "4 inputs" in throughput.summary()
+
+
+def test_run_inputs_counts_failures(tmp_path):
+    paths = expand_inputs(str(_write_inputs(tmp_path / 'inputs', 2)))
+    output = io.StringIO()
+    throughput = run_inputs(2, Part.ALL, paths, output, jobs=1)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(lines) == 4
+    assert {line["status"] for line in lines} == {"ERROR"}
+    assert throughput.failed == 2
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from aoc.launcher import profiler
+from aoc.launcher.args import parse_args
+
+pytestmark = pytest.mark.skipif(not profiler.is_supported(), reason="Needs interval timers")
+
+
+def _busy_leaf(seconds: float):
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += 1
+    return total
+
+
+def _busy_caller():
+    return _busy_leaf(0.1)
+
+
+def test_sampling_profiler(tmp_path):
+    with profiler.SamplingProfiler(interval=0.001) as profile:
+        _busy_caller()
+
+    assert profile.total_samples > 10
+    function, own, inclusive = profile.hot_functions(1)[0]
+    assert function.startswith("_busy_leaf ")
+    assert own <= inclusive
+
+    output = tmp_path / "stacks.collapsed"
+    profile.write_collapsed(output)
+    top_stack, count = output.read_text().splitlines()[0].rsplit(" ", 1)
+    # Stacks start at the code called from the profiled block
+    assert [frame.split()[0] for frame in top_stack.split(";")] == ["_busy_caller", "_busy_leaf"]
+    assert int(count) > 0
+
+
+def test_sampling_stops_on_exit():
+    with profiler.SamplingProfiler(interval=0.001) as profile:
+        _busy_leaf(0.05)
+    samples = profile.total_samples
+    _busy_leaf(0.05)
+    assert profile.total_samples == samples
+
+
+@pytest.mark.parametrize('interval', ('0', '-1'))
+def test_profile_interval_must_be_positive(interval, tmp_path, capsys):
+    input_file = tmp_path / 'input'
+    input_file.write_text("1\n")
+    with pytest.raises(SystemExit):
+        parse_args(['aoc', 'run', '--day', '1', '--input', str(input_file), '--profile-interval', interval])
+    assert "Must be more than 0" in capsys.readouterr().err
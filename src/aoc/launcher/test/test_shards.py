@@ -0,0 +1,64 @@
+from aoc.launcher.shards import (DEFAULT_DURATION, ShardResult, find_test_packages, merge_returncodes, package_name,
+                                 read_junit, run_shards, split_packages)
+
+JUNIT_REPORT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" errors="1" failures="1" skipped="2" tests="5">
+<testcase classname="src.aoc.days.day01.test.test_solve" name="test_first_example" time="0.5" />
+<testcase classname="src.aoc.days.day01.test.test_solve" name="test_first_solution" time="1.0">
+  <error message="no input">...</error>
+</testcase>
+<testcase classname="src.aoc.days.day02.test.test_solve" name="test_first_example" time="0.25">
+  <failure message="assert 1 == 2">...</failure>
+</testcase>
+<testcase classname="src.aoc.days.day02.test.test_solve" name="test_second_example" time="0.25">
+  <skipped type="pytest.xfail" message="" />
+</testcase>
+<testcase classname="src.aoc.utils.test.test_scaling" name="test_scaling[1]" time="0.0">
+  <skipped type="pytest.skip" message="Scaling tests only run with --scaling" />
+</testcase>
+</testsuite></testsuites>
+"""
+
+
+def test_find_test_packages():
+    packages = [package_name(package) for package in find_test_packages()]
+    assert 'aoc/days/day01/test' in packages
+    assert 'aoc/launcher/test' in packages
+    assert 'aoc/utils/test' in packages
+
+
+def test_split_packages_balances_durations():
+    durations = {'a': 8.0, 'b': 5.0, 'c': 4.0, 'd': 3.0}
+    shards = split_packages(['a', 'b', 'c', 'd', 'e'], durations, 2)
+    loads = [sum(durations.get(package, DEFAULT_DURATION) for package in shard) for shard in shards]
+    assert sorted(loads) == [10.0, 11.0]
+    assert sorted(package for shard in shards for package in shard) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_split_packages_never_makes_empty_shards():
+    assert split_packages(['a', 'b'], {}, 8) == [['a'], ['b']]
+
+
+def test_merge_returncodes():
+    assert merge_returncodes([0, 0]) == 0
+    assert merge_returncodes([0, 5]) == 0
+    assert merge_returncodes([5, 5]) == 5
+    assert merge_returncodes([0, 1, 5]) == 1
+    assert merge_returncodes([1, 2, 0]) == 2
+
+
+def test_read_junit(tmp_path):
+    report = tmp_path / 'report.xml'
+    report.write_text(JUNIT_REPORT)
+    result = ShardResult(['aoc/days/day01/test', 'aoc/days/day02/test', 'aoc/utils/test'], 1, '', 1.0)
+    read_junit(report, result)
+    assert result.outcomes == {'passed': 1, 'error': 1, 'failed': 1, 'xfailed': 1, 'skipped': 1}
+    assert len(result.failures) == 2
+    assert result.durations == {'aoc/days/day01/test': 1.5, 'aoc/days/day02/test': 0.5, 'aoc/utils/test': 0.0}
+
+
+def test_run_shards():
+    results = run_shards([['aoc/days/day24/test'], ['aoc/days/day25/test']], ['-p', 'no:logging'])
+    assert [result.returncode for result in results] == [0, 0]
+    assert [result.outcomes['xfailed'] for result in results] == [4, 4]
+    assert set(results[0].durations) == {'aoc/days/day24/test'}
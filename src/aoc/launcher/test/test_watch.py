@@ -0,0 +1,196 @@
+import importlib
+import os
+import sys
+from textwrap import dedent
+
+import pytest
+
+from aoc.launcher.watch import Watcher, code_fingerprint
+from aoc.utils import Part
+
+SOLVERS = """
+def solve_first(input_file):
+    return str(len(input_file.read_text()))
+
+
+def solve_second(input_file):
+    return helper(input_file)
+
+
+def helper(input_file):
+    return "second"
+"""
+
+HOOKS = """
+def parse(input_file):
+    return input_file.read_text().split()
+
+
+def solve(parsed, part):
+    return str(len(parsed))
+
+
+def solve_first(input_file):
+    return solve(parse(input_file), None)
+
+
+def solve_second(input_file):
+    return solve(parse(input_file), None)
+"""
+
+
+GLOBALS = """
+import re
+
+WORD = re.compile(r"[a-z]+")
+SCALE = 2
+UNUSED = 1
+
+
+class Counter:
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def count(self, text):
+        return len(self.pattern.findall(text))
+
+
+COUNTER = Counter(re.compile(r"[abc]"))
+
+
+def solve_first(input_file):
+    return str(len(WORD.findall(input_file.read_text())) * SCALE)
+
+
+def solve_second(input_file):
+    return str(COUNTER.count(input_file.read_text()))
+"""
+
+
+class FakeDay:
+    """A day module in a temporary directory that tests can edit"""
+
+    def __init__(self, tmp_path, monkeypatch, source: str):
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+        self.path = tmp_path / 'watched_day.py'
+        self.input_file = tmp_path / 'input'
+        self._mtime = 1_000_000_000
+        self.write(self.path, source)
+        self.write(self.input_file, 'a b c\n')
+        self.module = importlib.import_module('watched_day')
+        self.runs = []
+
+    def write(self, path, content: str):
+        # Explicit and increasing times, as a quick edit can keep the same mtime
+        path.write_text(dedent(content))
+        self._mtime += 10
+        os.utime(path, (self._mtime, self._mtime))
+
+    def edit(self, old: str, new: str):
+        self.write(self.path, self.path.read_text().replace(old, new))
+
+    def watcher(self) -> Watcher:
+        return Watcher(1, self.module, Part.ALL, self.input_file, self.runs.append)
+
+    def last_run(self) -> dict:
+        return {result.part: result for result in self.runs[-1]}
+
+
+@pytest.fixture
+def fake_day(tmp_path, monkeypatch):
+    fake = FakeDay(tmp_path, monkeypatch, SOLVERS)
+    yield fake
+    sys.modules.pop('watched_day', None)
+
+
+@pytest.fixture
+def fake_day_with_hooks(tmp_path, monkeypatch):
+    fake = FakeDay(tmp_path, monkeypatch, HOOKS)
+    yield fake
+    sys.modules.pop('watched_day', None)
+
+
+@pytest.mark.parametrize('old,new,changed', (
+        ('SCALE = 2', 'SCALE = 3', {'solve_first'}),
+        ('r"[a-z]+"', 'r"[a-c]+"', {'solve_first'}),
+        ('re.compile(r"[abc]")', 're.compile(r"[ab]")', {'solve_second'}),
+        ('UNUSED = 1', 'UNUSED = 2', set()),
+))
+def test_code_fingerprint_follows_globals(tmp_path, monkeypatch, old, new, changed):
+    fake_day = FakeDay(tmp_path, monkeypatch, GLOBALS)
+    try:
+        names = ('solve_first', 'solve_second')
+        before = {name: code_fingerprint(fake_day.module, name) for name in names}
+        # The same globals, in a fresh module, are the same code
+        module = importlib.reload(fake_day.module)
+        assert {name: code_fingerprint(module, name) for name in names} == before
+        fake_day.edit(old, new)
+        module = importlib.reload(module)
+        assert {name for name in names if code_fingerprint(module, name) != before[name]} == changed
+    finally:
+        sys.modules.pop('watched_day', None)
+
+
+def test_code_fingerprint_follows_helpers(fake_day):
+    before = code_fingerprint(fake_day.module, 'solve_second')
+    fake_day.edit('return "second"', 'return "2nd"')
+    module = importlib.reload(fake_day.module)
+    assert code_fingerprint(module, 'solve_second') != before
+    assert code_fingerprint(module, 'missing') is None
+
+
+def test_only_changed_parts_run_again(fake_day):
+    watcher = fake_day.watcher()
+    watcher.run(watcher.parts)
+    assert {part: result.answer for part, result in fake_day.last_run().items()} == {
+        Part.FIRST: '6', Part.SECOND: 'second'}
+
+    assert not watcher.check()
+
+    fake_day.edit('return "second"', 'return "2nd"')
+    assert watcher.check()
+    assert {part: result.answer for part, result in fake_day.last_run().items()} == {Part.SECOND: '2nd'}
+
+    # Comments and formatting do not change the code
+    fake_day.edit('def helper', '# A helper\ndef helper')
+    runs = len(fake_day.runs)
+    assert watcher.check()
+    assert len(fake_day.runs) == runs
+
+
+def test_new_input_runs_everything(fake_day):
+    watcher = fake_day.watcher()
+    watcher.run(watcher.parts)
+    fake_day.write(fake_day.input_file, 'a b c d\n')
+    assert watcher.check()
+    assert fake_day.last_run()[Part.FIRST].answer == '8'
+    assert set(fake_day.last_run()) == {Part.FIRST, Part.SECOND}
+
+
+def test_parsed_input_is_kept(fake_day_with_hooks):
+    fake_day = fake_day_with_hooks
+    watcher = fake_day.watcher()
+    watcher.run(watcher.parts)
+    assert all(result.parse_time is not None for result in fake_day.runs[-1])
+
+    # A solver change reuses the parsed input
+    fake_day.edit('return str(len(parsed))', 'return str(len(parsed) * 2)')
+    assert watcher.check()
+    assert [result.answer for result in fake_day.runs[-1]] == ['6', '6']
+    assert all(result.parse_time is None for result in fake_day.runs[-1])
+
+    # A parser change does not
+    fake_day.edit('.split()', '.split() + ["d"]')
+    assert watcher.check()
+    assert [result.answer for result in fake_day.runs[-1]] == ['8', '8']
+    assert all(result.parse_time is not None for result in fake_day.runs[-1])
+
+
+def test_broken_edit_keeps_the_old_module(fake_day, capsys):
+    watcher = fake_day.watcher()
+    watcher.run(watcher.parts)
+    fake_day.edit('def helper(input_file):', 'def helper(input_file')
+    assert watcher.check()
+    assert "Could not reload" in capsys.readouterr().out
+    assert watcher.module.solve_second(fake_day.input_file) == 'second'
@@ -0,0 +1,264 @@
+"""
+Watch mode: solve again whenever the code of a day or its input changes.
+
+The interpreter stays alive between runs, so every edit only pays for reloading
+the day module and running what the edit could have changed:
+
+* A new input is parsed again, and every part is solved again.
+* Edited day code is reloaded with importlib.reload. The parsed input is kept
+  while the code of the parse hook stays the same, and only the parts whose
+  solver code changed are solved again. The code of a solver includes the
+  module globals it reads, like constants and compiled patterns.
+* Edited aoc.utils submodules are reloaded too, followed by the day module,
+  and everything runs again. aoc.utils itself cannot be reloaded without
+  leaving stale copies of Part around, that needs a restart.
+
+Changes are found by polling modification times, which needs no dependencies.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import logging
+import re
+import sys
+import time
+import traceback
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import Callable
+
+from aoc.launcher.paths import UTILS_DIR
+from aoc.launcher.runner import (SINGLE_PARTS, PartResult, has_parse_hook, parse_input, solve_part,
+                                 solve_parsed)
+from aoc.utils import InputSource, Part
+from aoc.utils.tracing import enable_tracing, is_tracing
+
+log = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.5  # Seconds between checks for changes
+
+
+def _code_digest(code: CodeType, digest, module: ModuleType, seen: set):
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _code_digest(const, digest, module, seen)  # Nested functions, lambdas and comprehensions
+        else:
+            digest.update(repr(const).encode())
+    for name in code.co_names:
+        digest.update(name.encode())
+        value = getattr(module, name, None)
+        if inspect.isfunction(value) or inspect.isclass(value):
+            _object_digest(value, digest, module, seen)
+        elif name in vars(module):
+            _value_digest(value, digest, module, seen)
+
+
+def _object_digest(obj, digest, module: ModuleType, seen: set):
+    """Follow the functions and classes of the module that the code uses"""
+    if id(obj) in seen or getattr(obj, '__module__', None) != module.__name__:
+        return
+    seen.add(id(obj))
+    if inspect.isfunction(obj):
+        _code_digest(obj.__code__, digest, module, seen)
+    elif inspect.isclass(obj):
+        for name, member in sorted(vars(obj).items()):
+            digest.update(name.encode())
+            if inspect.isfunction(member):
+                _code_digest(member.__code__, digest, module, seen)
+            elif not name.startswith('__'):
+                _value_digest(member, digest, module, seen)
+
+
+def _value_digest(value, digest, module: ModuleType, seen: set):
+    """
+    Follow the data the code uses: constants, compiled patterns, containers,
+    and instances of the classes of the module, like a global scanner
+    """
+    if isinstance(value, ModuleType) or id(value) in seen:
+        return
+    if inspect.isfunction(value) or inspect.isclass(value):
+        _object_digest(value, digest, module, seen)  # Like the functions of a dispatch table
+    elif isinstance(value, re.Pattern):
+        digest.update(repr((value.pattern, value.flags)).encode())  # The repr is cut short for long patterns
+    elif isinstance(value, (tuple, list, dict)):
+        seen.add(id(value))
+        for key, item in value.items() if isinstance(value, dict) else enumerate(value):
+            digest.update(repr(key).encode())
+            _value_digest(item, digest, module, seen)
+    elif isinstance(value, (set, frozenset)):
+        digest.update(repr(sorted(map(repr, value))).encode())  # Iteration order changes between runs
+    elif isinstance(value, functools.partial):
+        _value_digest((value.func, value.args, value.keywords), digest, module, seen)
+    elif hasattr(value, '__dict__') and not callable(value):
+        seen.add(id(value))
+        _object_digest(type(value), digest, module, seen)
+        for name, item in sorted(vars(value).items()):
+            digest.update(name.encode())
+            _value_digest(item, digest, module, seen)
+    elif type(value).__repr__ is object.__repr__:
+        digest.update(type(value).__qualname__.encode())  # Its repr would be a new address on every reload
+    else:
+        digest.update(repr(value).encode())
+
+
+def code_fingerprint(module: ModuleType, name: str) -> str | None:
+    """
+    Hash of the code of a function of a module and of every function and class
+    of the module it uses, directly or not. None if there is no such function.
+    """
+    function = getattr(module, name, None)
+    if not inspect.isfunction(function):
+        return None
+    digest = hashlib.sha256()
+    _object_digest(function, digest, module, set())
+    return digest.hexdigest()
+
+
+def part_fingerprints(module: ModuleType) -> dict[str, str | None]:
+    """Fingerprint of the code behind each stage: parse, and solving each part"""
+    if has_parse_hook(module):
+        solve = code_fingerprint(module, 'solve')
+        return {'parse': code_fingerprint(module, 'parse'), 'first': solve, 'second': solve}
+    return {'parse': None, 'first': code_fingerprint(module, 'solve_first'),
+            'second': code_fingerprint(module, 'solve_second')}
+
+
+def _modification_times(paths: list[Path]) -> dict[Path, int | None]:
+    times = {}
+    for path in paths:
+        try:
+            times[path] = path.stat().st_mtime_ns
+        except OSError:
+            times[path] = None
+    return times
+
+
+class Watcher:
+    """Keeps a day module and its (parsed) input warm, and runs what changes affect"""
+
+    def __init__(self, day: int, module: ModuleType, part: Part, input_file: Path,
+                 on_results: Callable[[list[PartResult]], None]):
+        self.day = day
+        self.module = module
+        self.parts = [p for p in SINGLE_PARTS if part.includes(p)]
+        self.input_file = Path(input_file)
+        self.on_results = on_results
+        self._source: InputSource | None = None
+        self._parsing: PartResult | None = None
+        self._fingerprints = part_fingerprints(module)
+        self._times = _modification_times(self.watched_files())
+
+    @property
+    def module_file(self) -> Path:
+        return Path(self.module.__file__).resolve()
+
+    def watched_files(self) -> list[Path]:
+        utils = sorted(path for path in UTILS_DIR.rglob('*.py') if 'test' not in path.relative_to(UTILS_DIR).parts)
+        return [self.module_file, self.input_file, *utils]
+
+    def changed_files(self) -> list[Path]:
+        times = _modification_times(self.watched_files())
+        changed = [path for path, mtime in times.items() if self._times.get(path) != mtime]
+        self._times = times
+        return changed
+
+    def _close_input(self):
+        try:
+            self._source.close()
+        except BufferError:
+            pass  # The parsed input still points into the mapped file, let the GC unmap it
+        self._source = None
+
+    def _load_input(self):
+        self._parsing = None
+        if self._source is not None:
+            self._close_input()
+        self._source = InputSource.from_path(self.input_file)
+
+    def run(self, parts: list[Part]):
+        if self._source is None:
+            self._load_input()
+        if not has_parse_hook(self.module):
+            results = [solve_part(self.day, self.module, p, self._source) for p in parts]
+        else:
+            parse_time = None
+            if self._parsing is None:
+                self._parsing = parse_input(self.day, self.module, self._source)
+                parse_time = self._parsing.wall_time
+            results = solve_parsed(self.day, self.module, parts, self._parsing)
+            for result in results:
+                result.parse_time = parse_time  # Only report it when it was just paid for
+        self.on_results(results)
+
+    def reload(self, changed: list[Path]) -> list[Part]:
+        """Reload what changed, and return the parts to solve again"""
+        changed_utils = [path for path in changed if path.is_relative_to(UTILS_DIR)]
+        if UTILS_DIR / '__init__.py' in changed_utils:
+            print("aoc.utils changed, restart to use the new version")
+            changed_utils.remove(UTILS_DIR / '__init__.py')
+        for path in changed_utils:
+            name = 'aoc.utils.' + '.'.join(path.relative_to(UTILS_DIR).with_suffix('').parts)
+            if name in sys.modules:
+                log.debug("Reloading %s", name)
+                importlib.reload(sys.modules[name])
+
+        if self.input_file in changed:
+            self._load_input()
+        if changed_utils or self.module_file in changed:
+            log.debug("Reloading %s", self.module.__name__)
+            tracing = is_tracing(self.module)
+            self.module = importlib.reload(self.module)
+            enable_tracing(self.module, tracing)  # Reloading runs `_debug = False` again
+
+        fingerprints = part_fingerprints(self.module)
+        if changed_utils or self.input_file in changed or fingerprints['parse'] != self._fingerprints['parse']:
+            self._parsing = None
+            stale_parts = self.parts
+        else:
+            stale_parts = [p for p in self.parts
+                           if fingerprints[p.name.lower()] != self._fingerprints[p.name.lower()]]
+        self._fingerprints = fingerprints
+        return stale_parts
+
+    def check(self) -> bool:
+        """Handle the changes since the last check, returns whether there were any"""
+        changed = self.changed_files()
+        if not changed:
+            return False
+        if not self.input_file.exists():
+            print(f"Waiting for {self.input_file} to come back")
+            return True
+        print(f"Changed: {', '.join(path.name for path in changed)}")
+        try:
+            parts = self.reload(changed)
+        except Exception:
+            traceback.print_exc()
+            print("Could not reload, waiting for the next change")
+            return True
+        if parts:
+            self.run(parts)
+        else:
+            print("Nothing to solve again")
+        return True
+
+    def close(self):
+        if self._source is not None:
+            self._close_input()
+
+
+def watch(day: int, module: ModuleType, part: Part, input_file: Path,
+          on_results: Callable[[list[PartResult]], None], *, interval: float = DEFAULT_INTERVAL):
+    """Solve, then solve again on every change until interrupted"""
+    watcher = Watcher(day, module, part, input_file, on_results)
+    try:
+        watcher.run(watcher.parts)
+        print(f"Watching day {day} for changes, Ctrl+C to stop")
+        while True:
+            time.sleep(interval)
+            watcher.check()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -1,12 +1,16 @@
+import functools
 import logging
 import os
 import subprocess
+import sys
 from enum import Enum, auto
 
 import argparse
 import enum
 from pathlib import Path
 
+from aoc.utils.input_source import InputSource
+
 log = logging.getLogger(__name__)
 
 
@@ -53,24 +57,45 @@ class Part(Enum):
 
 
 def run_external_solver(command: list[str], *, debug: bool = False,
-                        input_path: Path | None = None):
+                        input_path: Path | None = None, timeout: float | None = None,
+                        max_memory: int | None = None):
     """
     Run an external solver.
     You can choose to pass anything as command line parameters, and these can
     be optionally included in the environment
     * If we are in debug mode, pass the var AOC_DEBUG set to 1
     * If the input path is given, pass it in the AOC_INPUT_PATH var
+
+    A solver that takes longer than the timeout (in seconds) is killed and
+    raises SolverTimeout. With max_memory (in bytes) its address space is
+    capped, and dying from going over it raises SolverOutOfMemory. To tell
+    that apart from other failures, stderr is captured, and it is passed on
+    once the solver exits.
     """
+    from aoc.utils.limits import SolverOutOfMemory, SolverTimeout, ran_out_of_memory, set_memory_limit
     env = os.environ.copy()
     if debug:
         env['AOC_DEBUG'] = '1'
     if input_path is not None:
         env['AOC_INPUT_PATH'] = str(input_path)
 
-    solver = subprocess.Popen(command, stdout=subprocess.PIPE, env=env, encoding='utf-8')
-    stdout, _ = solver.communicate()
-    solver.wait()
+    preexec_fn = None if max_memory is None else functools.partial(set_memory_limit, max_memory)
+    stderr = None if max_memory is None else subprocess.PIPE
+    solver = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, env=env, encoding='utf-8',
+                              preexec_fn=preexec_fn)
+    errors = None
+    try:
+        stdout, errors = solver.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        solver.kill()
+        _, errors = solver.communicate()
+        raise SolverTimeout(f"Command took longer than {timeout:g}s") from None
+    finally:
+        if stderr is not None and errors:
+            sys.stderr.write(errors)
     if solver.returncode != 0:
+        if max_memory is not None and ran_out_of_memory(solver.returncode, errors):
+            raise SolverOutOfMemory(f"Command ran out of memory (rc={solver.returncode})")
         raise Exception(f"Command exited with rc={solver.returncode}")
     return stdout
 
@@ -81,10 +106,16 @@ def emojify_flag(flag: bool | None):
     return "✅" if flag else "❌"
 
 
-def fetch_input(day: int):
-    from aocd import get_data
+def day_input_path(day: int) -> Path:
+    """The default input file of a day, under the data directory of the day module"""
     from aoc import days as days_module
-    input_path = Path(days_module.__file__).resolve().parent / f"day{day:02d}" / "data" / "input"
-    log.debug("Downloading input data for day %d to %s", day, input_path)
-    input_data = get_data(day=day, year=2023)
-    input_path.write_text(input_data)
+    return Path(days_module.__file__).resolve().parent / days_module.module_name(day) / "data" / "input"
+
+
+def fetch_input(day: int, **kwargs) -> bool:
+    """
+    Download the input of a day, unless it is already there.
+    See aoc.utils.download.download_input for the options.
+    """
+    from aoc.utils.download import download_input
+    return download_input(day, **kwargs)
@@ -0,0 +1,83 @@
+"""
+Performance budgets of the solvers on the real input.
+
+A day can have a ``budget.json`` in its data directory, next to the solution
+files, with the time and peak memory each part is allowed to take::
+
+    {
+        "first": {"seconds": 0.5, "memory_mib": 50},
+        "second": {"seconds": 2}
+    }
+
+Both limits are optional. Memory is the peak RSS while solving, which can only
+be told apart from that of the rest of the process on Linux.
+"""
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from aoc.utils import Part
+from aoc.utils.memory import format_size, peak_rss, reset_peak_rss
+
+FILE_NAME_BUDGET = 'budget.json'
+MIB = 1024 * 1024
+
+
+@dataclass
+class Budget:
+    seconds: float | None = None
+    memory: int | None = None  # Bytes
+
+
+def load_budgets(path: Path) -> dict[Part, Budget]:
+    """The budget of each part in a budget file, none if there is no file"""
+    if not path.exists():
+        return {}
+    budgets = {}
+    for part_name, limits in json.loads(path.read_text()).items():
+        unknown = set(limits) - {'seconds', 'memory_mib'}
+        if unknown:
+            raise ValueError(f"Unknown limits in {path}: {', '.join(sorted(unknown))}")
+        memory_mib = limits.get('memory_mib')
+        budgets[Part[part_name.upper()]] = Budget(
+            seconds=limits.get('seconds'),
+            memory=int(memory_mib * MIB) if memory_mib is not None else None,
+        )
+    return budgets
+
+
+@dataclass
+class SolverRun:
+    name: str
+    seconds: float
+    memory: int | None  # None if the peak could not be told apart from earlier ones
+    budget: Budget | None = None
+
+    def overruns(self) -> list[str]:
+        if self.budget is None:
+            return []
+        overruns = []
+        if self.budget.seconds is not None and self.seconds > self.budget.seconds:
+            overruns.append(f"took {self.seconds:.3f}s, over the budget of {self.budget.seconds:g}s")
+        if self.budget.memory is not None and self.memory is not None and self.memory > self.budget.memory:
+            overruns.append(f"peaked at {format_size(self.memory)}, "
+                            f"over the budget of {format_size(self.budget.memory)}")
+        return overruns
+
+    def summary(self) -> str:
+        memory = format_size(self.memory) if self.memory is not None else "?"
+        line = f"{self.seconds:>9.3f}s {memory:>11}  {self.name}"
+        if self.budget is not None:
+            line += " ❌" if self.overruns() else " ✅"
+        return line
+
+
+def measure(name: str, solver: Callable, input_file, budget: Budget | None = None) -> tuple[str | None, SolverRun]:
+    """Solve, and measure the time and peak RSS it took"""
+    own_peak = reset_peak_rss()
+    start = time.perf_counter()
+    answer = solver(input_file)
+    seconds = time.perf_counter() - start
+    return answer, SolverRun(name, seconds, peak_rss() if own_peak else None, budget)
@@ -0,0 +1,163 @@
+"""
+On-disk cache of solver answers.
+
+Entries are keyed by day, part, a hash of the input file and a hash of the
+source code of the day module and of aoc.utils, so editing either one
+invalidates them without any bookkeeping. The cache keeps a bounded number of
+entries, evicting the least recently used ones.
+
+Hashing the sources is only done again when their modification times or sizes
+change, so long-lived processes like the solver daemon notice edits too.
+"""
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from types import ModuleType
+
+from aoc.utils import InputSource, Part
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1000
+ENV_CACHE = 'AOC_CACHE'  # Set to 1 to enable the cache by default
+ENV_CACHE_DIR = 'AOC_CACHE_DIR'
+
+_UTILS_DIR = Path(__file__).resolve().parent
+_source_digests: dict[str, tuple[tuple, str]] = {}  # Module name to the stamp of its sources and their digest
+
+
+def cache_enabled_by_env() -> bool:
+    return os.environ.get(ENV_CACHE, '') not in ('', '0')
+
+
+def default_cache_dir() -> Path:
+    if ENV_CACHE_DIR in os.environ:
+        return Path(os.environ[ENV_CACHE_DIR])
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'aoc-2023'
+
+
+def file_digest(path: Path | InputSource) -> str:
+    import hashlib  # Loading OpenSSL is a noticeable part of a cold start, only pay for it when caching
+    if isinstance(path, InputSource):
+        return hashlib.sha256(path.buffer).hexdigest()
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fin:
+        while chunk := fin.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_files(directory: Path, *, exclude: tuple[str, ...] = ()) -> list[Path]:
+    """The Python sources under a directory, but the tests and the excluded directories"""
+    files = []
+    for path in sorted(directory.rglob('*.py')):
+        relative = path.relative_to(directory).parts
+        if 'test' in relative or any(part in exclude for part in relative):
+            continue
+        files.append(path)
+    return files
+
+
+def source_stamp(files: list[Path]) -> tuple:
+    """A cheap stand-in for the contents of some files: their names, sizes and modification times"""
+    stamp = []
+    for path in files:
+        stat = path.stat()
+        stamp.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return tuple(stamp)
+
+
+def day_source_files(module: ModuleType) -> list[Path]:
+    """The sources a day module depends on: all of its package but the tests, and aoc.utils"""
+    module_dir = Path(module.__file__).resolve().parent
+    return source_files(module_dir) + source_files(_UTILS_DIR, exclude=('day_template',))
+
+
+def source_digest(module: ModuleType) -> str:
+    """
+    Hash of the source of a day module (all of its package but the tests) and
+    of the aoc.utils package it builds on
+    """
+    files = day_source_files(module)
+    stamp = source_stamp(files)
+    if module.__name__ in _source_digests and _source_digests[module.__name__][0] == stamp:
+        return _source_digests[module.__name__][1]
+    import hashlib
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.name).encode())
+        digest.update(path.read_bytes())
+    _source_digests[module.__name__] = stamp, digest.hexdigest()
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+
+    def key(self, day: int, part: Part, module: ModuleType, input_file: Path) -> str:
+        import hashlib
+        parts = (str(day), part.name, file_digest(input_file), source_digest(module))
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            answer = json.loads(path.read_text())['answer']
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return answer
+
+    def put(self, key: str, answer: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fout:
+            json.dump({'answer': answer}, fout)
+        os.replace(temp_name, self._entry_path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:  # Evicted by someone else
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            log.debug("Evicting cached answer %s", path.name)
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+
+def cached_solver(cache: ResultCache, day: int, part: Part, module: ModuleType, solver, *, refresh: bool = False):
+    """
+    Wrap a solve_first/solve_second like function so that it takes its answer
+    from the cache if possible, and stores it there otherwise
+    """
+
+    def solve(input_file: Path) -> str | None:
+        key = cache.key(day, part, module, input_file)
+        if not refresh and (answer := cache.get(key)) is not None:
+            log.debug("Cached answer for day %d, %s part", day, part.name.lower())
+            return answer
+        answer = solver(input_file)
+        if answer is not None:
+            cache.put(key, answer)
+        return answer
+
+    return solve
@@ -0,0 +1,191 @@
+"""
+Downloading of puzzle inputs.
+
+Inputs never change once published, so an input that is already on disk is
+not downloaded again unless forced, and a forced download that brings the same
+content leaves the file alone. Files are written atomically (to a temporary
+file that is then renamed), so an interrupted download never leaves a partial
+input behind.
+
+Next to every input goes a record of the hash of what was downloaded (a hidden
+``.input.sha256``), and an input only counts as already there if it still
+matches it. Inputs that were emptied, cut short or edited since, or that did
+not come from a download, are downloaded again.
+
+The actual fetching goes through a transport: aocd by default, or plain HTTP
+against any server that follows the AoC URL layout, which is what the tests use
+with a local stand-in server.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Protocol
+
+from aoc.utils import day_input_path
+
+log = logging.getLogger(__name__)
+
+YEAR = 2023
+DEFAULT_JOBS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0  # Seconds before the first retry, doubling after every attempt
+ENV_SESSION = 'AOC_SESSION'
+USER_AGENT = 'github.com/jdevera/advent-of-code-2023 launcher'
+
+
+class TransientError(Exception):
+    """A failure that might go away when trying again"""
+
+
+def is_transient_status(status: int) -> bool:
+    """Server errors and rate limiting can go away, other error responses will not"""
+    return status >= 500 or status == 429
+
+
+class Transport(Protocol):
+    def fetch(self, day: int, year: int) -> str:
+        ...
+
+
+class AocdTransport:
+    """Fetch inputs with aocd, which takes care of finding the session token"""
+
+    def fetch(self, day: int, year: int) -> str:
+        from aocd import get_data
+        from aocd.exceptions import AocdError, DeadTokenError, PuzzleLockedError
+        from urllib3.exceptions import HTTPError
+        try:
+            return get_data(day=day, year=year)
+        except (DeadTokenError, PuzzleLockedError):
+            raise  # Trying again will not bring a token back to life, or unlock a puzzle
+        except AocdError as e:
+            # aocd reports error responses as "HTTP <status> at <url>"
+            status = re.match(r'HTTP (\d+)', str(e))
+            if status is not None and is_transient_status(int(status.group(1))):
+                raise TransientError(f"HTTP {status.group(1)} for day {day}") from e
+            raise
+        except (HTTPError, OSError) as e:
+            raise TransientError(f"Could not reach the AoC site: {e}") from e
+
+
+class HttpTransport:
+    """Fetch inputs over plain HTTP from the AoC site, or a stand-in for it"""
+
+    def __init__(self, base_url: str = 'https://adventofcode.com', session: str | None = None,
+                 timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.session = session if session is not None else os.environ.get(ENV_SESSION, '')
+        self.timeout = timeout
+
+    def fetch(self, day: int, year: int) -> str:
+        request = urllib.request.Request(
+            f"{self.base_url}/{year}/day/{day}/input",
+            headers={'Cookie': f'session={self.session}', 'User-Agent': USER_AGENT},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            if is_transient_status(e.code):
+                raise TransientError(f"HTTP {e.code} for day {day}") from e
+            raise
+        except (urllib.error.URLError, OSError) as e:
+            raise TransientError(f"Could not reach {self.base_url}: {e}") from e
+
+
+def write_atomically(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fout:
+            fout.write(content)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _record_path(input_path: Path) -> Path:
+    return input_path.with_name(f'.{input_path.name}.sha256')
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_downloaded(input_path: Path) -> bool:
+    """Whether the input is on disk just as it was downloaded"""
+    try:
+        recorded = _record_path(input_path).read_text().strip()
+        return _digest(input_path.read_bytes()) == recorded
+    except FileNotFoundError:
+        return False
+
+
+def fetch_with_retries(transport: Transport, day: int, *, retries: int = DEFAULT_RETRIES,
+                       backoff: float = DEFAULT_BACKOFF) -> str:
+    for attempt in range(retries + 1):
+        try:
+            return transport.fetch(day, YEAR)
+        except TransientError as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            log.info("Download of day %d failed (%s), retrying in %.1fs", day, e, delay)
+            time.sleep(delay)
+
+
+def download_input(day: int, *, transport: Transport | None = None, force: bool = False,
+                   retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                   input_path: Path | None = None) -> bool:
+    """
+    Download the input of a day unless it is already there. Returns whether the
+    file was written.
+    """
+    input_path = input_path or day_input_path(day)
+    if not force and is_downloaded(input_path):
+        log.debug("Input for day %d already in %s", day, input_path)
+        return False
+
+    log.debug("Downloading input data for day %d to %s", day, input_path)
+    content = fetch_with_retries(transport or AocdTransport(), day, retries=retries, backoff=backoff)
+    data = content.encode()
+    written = not (input_path.exists() and input_path.read_bytes() == data)
+    if written:
+        write_atomically(input_path, content)
+    else:
+        log.debug("Input for day %d did not change", day)
+    write_atomically(_record_path(input_path), _digest(data) + '\n')
+    return written
+
+
+def download_inputs(days: list[int], *, jobs: int = DEFAULT_JOBS, transport: Transport | None = None,
+                    force: bool = False, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                    input_path_for: Callable[[int], Path] = day_input_path) -> dict[int, bool | Exception]:
+    """
+    Download the inputs of several days concurrently. Returns, for each day,
+    whether its file was written or the error that prevented it.
+    """
+    transport = transport or AocdTransport()
+
+    def download(day: int) -> bool:
+        return download_input(day, transport=transport, force=force, retries=retries, backoff=backoff,
+                              input_path=input_path_for(day))
+
+    results: dict[int, bool | Exception] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(days)))) as pool:
+        futures = {day: pool.submit(download, day) for day in days}
+        for day, future in futures.items():
+            try:
+                results[day] = future.result()
+            except Exception as e:
+                log.debug("Download of day %d failed", day, exc_info=True)
+                results[day] = e
+    return results
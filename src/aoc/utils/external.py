@@ -0,0 +1,215 @@
+"""
+Long-lived external solver workers.
+
+run_external_solver starts a process for every solve, which is most of the
+runtime for solvers in languages with a slow startup (JVM, .NET, ...). A worker
+instead starts once and then answers solve requests over its stdin and stdout.
+
+Protocol: every message is a frame made of a 4 byte big-endian length followed
+by that many bytes of UTF-8 JSON.
+
+* Requests: ``{"id": 1, "day": 5, "part": "first", "input_path": "/path/input"}``,
+  or with ``"input": "<the input itself>"`` instead of ``input_path``.
+* Responses: ``{"id": 1, "answer": "1234"}`` (``null`` if not implemented) or
+  ``{"id": 1, "error": "what went wrong"}``.
+
+The worker exits when its stdin is closed. Its stdout is only for responses,
+so anything else the solver prints has to go to stderr. ``serve`` implements
+the worker side for solvers written in Python, and is a reference for other
+languages.
+"""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from aoc.utils import InputSource, Part
+
+log = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+
+class ExternalSolverError(Exception):
+    pass
+
+
+class ExternalSolverTimeout(ExternalSolverError):
+    pass
+
+
+def encode_frame(message: dict) -> bytes:
+    payload = json.dumps(message).encode('utf-8')
+    return _HEADER.pack(len(payload)) + payload
+
+
+def read_frame(stream: BinaryIO) -> dict | None:
+    """Read a frame from a blocking stream, None at the end of the stream"""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload)
+
+
+def serve(solve: Callable[[int, Part, Path | InputSource], str | None],
+          stdin: BinaryIO | None = None, stdout: BinaryIO | None = None):
+    """
+    Answer solve requests until stdin is closed. Errors in the solver are sent
+    back as error responses, and the worker carries on. Whatever the solver
+    prints goes to stderr, so that it does not get mixed with the responses.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    while (request := read_frame(stdin)) is not None:
+        response = {"id": request.get("id")}
+        try:
+            part = Part[request["part"].upper()]
+            if "input_path" in request:
+                input_file = Path(request["input_path"])
+            else:
+                input_file = InputSource.from_text(request["input"])
+            with contextlib.redirect_stdout(sys.stderr):
+                response["answer"] = solve(request["day"], part, input_file)
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        stdout.write(encode_frame(response))
+        stdout.flush()
+
+
+class ExternalSolverWorker:
+    """
+    Client side of a worker process, started on the first request and again
+    after it died or timed out
+    """
+
+    def __init__(self, command: list[str], *, debug: bool = False, timeout: float | None = None):
+        self.command = command
+        self.debug = debug
+        self.timeout = timeout
+        self._process: subprocess.Popen | None = None
+        self._next_id = 1
+
+    def _start(self):
+        env = os.environ.copy()
+        env['AOC_WORKER'] = '1'
+        if self.debug:
+            env['AOC_DEBUG'] = '1'
+        log.debug("Starting external solver worker %s", self.command)
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _read_exactly(self, size: int, deadline: float | None) -> bytes:
+        fd = self._process.stdout.fileno()
+        data = b''
+        while len(data) < size:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    raise ExternalSolverTimeout(f"No answer from {self.command} in time")
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                rc = self._process.wait()
+                raise ExternalSolverError(f"Worker {self.command} exited with rc={rc}")
+            data += chunk
+        return data
+
+    def solve(self, day: int, part: Part, *, input_path: Path | None = None, input_data: str | None = None,
+              timeout: float | None = None) -> str | None:
+        if (input_path is None) == (input_data is None):
+            raise ValueError("Give either an input path or the input data")
+        if not self.running:
+            self._start()
+
+        request = {"id": self._next_id, "day": day, "part": part.name.lower()}
+        self._next_id += 1
+        if input_path is not None:
+            request["input_path"] = str(Path(input_path).resolve())
+        else:
+            request["input"] = input_data
+
+        timeout = timeout if timeout is not None else self.timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            self._process.stdin.write(encode_frame(request))
+            self._process.stdin.flush()
+            (length,) = _HEADER.unpack(self._read_exactly(_HEADER.size, deadline))
+            payload = self._read_exactly(length, deadline)
+            try:
+                response = json.loads(payload)
+            except ValueError as e:
+                raise ExternalSolverError(f"Invalid response from {self.command}: {payload[:80]!r}") from e
+            if not isinstance(response, dict):
+                raise ExternalSolverError(f"Invalid response from {self.command}: {payload[:80]!r}")
+        except (ExternalSolverError, BrokenPipeError) as e:
+            self.kill()  # Out of sync with the protocol, start afresh next time
+            if isinstance(e, BrokenPipeError):
+                raise ExternalSolverError(f"Worker {self.command} is gone") from e
+            raise
+
+        if response.get("id") != request["id"]:
+            self.kill()
+            raise ExternalSolverError(f"Unexpected response id {response.get('id')}, expected {request['id']}")
+        if "error" in response:
+            raise ExternalSolverError(response["error"])
+        return response.get("answer")
+
+    def kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    def close(self, timeout: float = 5.0):
+        """Ask the worker to exit by closing its stdin, killing it if it does not"""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout)
+        except (BrokenPipeError, subprocess.TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def __enter__(self) -> 'ExternalSolverWorker':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+_workers: dict[tuple[str, ...], ExternalSolverWorker] = {}
+
+
+def get_worker(command: list[str], *, debug: bool = False) -> ExternalSolverWorker:
+    """
+    A worker for the command shared by everyone in this process, so it only
+    starts once. Shared workers are closed at exit.
+    """
+    key = tuple(command)
+    if key not in _workers:
+        _workers[key] = ExternalSolverWorker(command, debug=debug)
+    return _workers[key]
+
+
+@atexit.register
+def _close_workers():
+    for worker in _workers.values():
+        worker.close()
+    _workers.clear()
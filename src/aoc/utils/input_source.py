@@ -0,0 +1,155 @@
+"""
+Puzzle input that does not need to be a file on disk.
+
+An InputSource can be backed by a memory mapped file, by whatever comes in
+through stdin or by an in-memory buffer. It gives zero-copy access to the raw
+bytes and their lines, and it also has the few methods of pathlib.Path that
+solvers use (open, read_text, read_bytes), so it can be passed to any solver
+that expects a Path.
+
+It is also path-like: os.fspath (and str) give the file behind it. Sources that
+are only in memory are written to a temporary file the first time a real path
+is needed, which is removed when the source is closed or collected.
+"""
+import io
+import mmap
+import os
+import sys
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Iterator
+
+ENCODING = 'utf-8'
+
+
+class InputSource:
+    def __init__(self, data: bytes | bytearray | mmap.mmap, *, name: str, path: Path | None = None):
+        self._data = data
+        self.name = name
+        self.path = path  # The file behind this input, if there is one
+        self._temp_path: Path | None = None  # Where in-memory data was written to, if it had to be
+        self._remove_temp_file = None
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> 'InputSource':
+        path = Path(path)
+        with open(path, 'rb') as fin:
+            if path.stat().st_size == 0:
+                data = b''  # Empty files cannot be mapped
+            else:
+                data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, name=str(path), path=path)
+
+    @classmethod
+    def from_stdin(cls) -> 'InputSource':
+        return cls(sys.stdin.buffer.read(), name='<stdin>')
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = '<bytes>') -> 'InputSource':
+        return cls(data, name=name)
+
+    @classmethod
+    def from_text(cls, text: str, name: str = '<text>') -> 'InputSource':
+        return cls(text.encode(ENCODING), name=name)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+    def __fspath__(self) -> str:
+        return str(self.path or self._write_temp_file())
+
+    def __str__(self):
+        return self.__fspath__()
+
+    def _write_temp_file(self) -> Path:
+        if self._temp_path is None:
+            fd, temp_path = tempfile.mkstemp(prefix='aoc-input-')
+            with open(fd, 'wb') as fout:
+                fout.write(self._data)
+            self._temp_path = Path(temp_path)
+            self._remove_temp_file = weakref.finalize(self, self._temp_path.unlink, missing_ok=True)
+        return self._temp_path
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def size_hint(self) -> int:
+        """Size in bytes, to size buffers or decide whether to go parallel"""
+        return len(self._data)
+
+    @property
+    def buffer(self) -> memoryview:
+        """All the raw bytes, without copying them"""
+        return memoryview(self._data)
+
+    def lines(self) -> Iterator[memoryview]:
+        """
+        Every line as a view of the raw bytes, without the line terminator and
+        without copying anything
+        """
+        data, view = self._data, self.buffer
+        start, end = 0, len(data)
+        while start < end:
+            newline = data.find(b'\n', start)
+            if newline == -1:
+                newline = end
+            stop = newline - 1 if newline > start and data[newline - 1] == 0x0d else newline  # \r\n
+            yield view[start:stop]
+            start = newline + 1
+
+    def line_chunks(self, chunk_size: int) -> list[tuple[int, int]]:
+        """
+        Start and end offsets of consecutive chunks of about chunk_size bytes,
+        each ending at the end of a line, that cover the whole input
+        """
+        data, end = self._data, len(self._data)
+        chunks = []
+        start = 0
+        while start < end:
+            newline = data.find(b'\n', min(start + chunk_size, end) - 1)
+            stop = end if newline == -1 else newline + 1
+            chunks.append((start, stop))
+            start = stop
+        return chunks
+
+    def text(self) -> str:
+        return str(self.buffer, ENCODING)
+
+    # pathlib.Path compatibility, so existing solvers can take an InputSource
+
+    def exists(self) -> bool:
+        return True
+
+    def read_bytes(self) -> bytes:
+        # In-memory bytes are immutable, so they are shared instead of copied
+        return self._data if isinstance(self._data, bytes) else bytes(self._data)
+
+    def read_text(self) -> str:
+        # Universal newlines, same as Path.read_text
+        return self.text().replace('\r\n', '\n').replace('\r', '\n')
+
+    def open(self, mode: str = 'r'):
+        if mode not in ('r', 'rb'):
+            raise ValueError(f"Input sources are read only, cannot open with mode {mode!r}")
+        if self.path is not None:
+            # Read from the file, instead of copying the whole map into a buffer
+            return open(self.path, mode) if mode == 'rb' else open(self.path, mode, encoding=ENCODING)
+        # BytesIO shares a bytes object it starts with, until it is written to
+        binary = io.BytesIO(self.read_bytes())
+        return binary if mode == 'rb' else io.TextIOWrapper(binary, encoding=ENCODING)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._remove_temp_file is not None:
+            self._remove_temp_file()
+            self._temp_path = self._remove_temp_file = None
+
+    def __enter__(self) -> 'InputSource':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,156 @@
+"""
+Wall time and memory limits for solvers.
+
+A limited call runs in a child process, with its address space capped by
+``resource.setrlimit(RLIMIT_AS)``, and is killed if it goes over its time. The
+caller gets the result back, or a SolverTimeout or SolverOutOfMemory if a
+limit was hit, never a hung or swapping parent.
+
+Memory limits cap the whole address space of the child, interpreter included,
+so they must leave room for the few tens of MiB that takes.
+
+External programs under a memory limit tell of running out of it in their own
+ways: dying from a signal, or printing an error like Python's MemoryError or
+Java's OutOfMemoryError to stderr before exiting.
+"""
+import os
+import resource
+import signal
+import sys
+from dataclasses import dataclass
+from typing import Callable
+
+from aoc.utils.memory import format_size
+
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+# Exit code of a limited child that had no memory left even to report running
+# out of it. Python itself only uses 0, 1 and 2.
+OUT_OF_MEMORY_EXIT_CODE = 86
+
+# How programs die when an allocation fails: from these signals, or printing
+# one of these to stderr
+OUT_OF_MEMORY_SIGNALS = (signal.SIGKILL, signal.SIGSEGV, signal.SIGABRT)
+OUT_OF_MEMORY_MARKERS = (
+    'MemoryError',  # Python
+    'OutOfMemoryError',  # JVM
+    'bad_alloc',  # C++
+    'memory allocation of',  # Rust
+    'out of memory',  # Go, and many others
+    'Cannot allocate memory',  # ENOMEM from the C library
+)
+
+
+class LimitExceeded(Exception):
+    pass
+
+
+class SolverTimeout(LimitExceeded):
+    pass
+
+
+class SolverOutOfMemory(LimitExceeded):
+    pass
+
+
+def parse_size(value: str) -> int:
+    """Parse a size like 512M, 2G or 1048576 into bytes"""
+    text = value.strip().upper().removesuffix('IB').removesuffix('B')
+    unit = text[-1:] if text[-1:] in SIZE_UNITS else ''
+    try:
+        size = int(float(text[:len(text) - len(unit)]) * SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Not a size: {value}") from None
+    if size <= 0:
+        raise ValueError(f"Sizes must be positive: {value}")
+    return size
+
+
+@dataclass(frozen=True)
+class Limits:
+    timeout: float | None = None  # Seconds of wall time
+    max_memory: int | None = None  # Bytes of address space
+
+    def __bool__(self):
+        return self.timeout is not None or self.max_memory is not None
+
+
+def set_memory_limit(max_memory: int):
+    """Cap the address space of this process, to run in children before they start working"""
+    resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def ran_out_of_memory(returncode: int, stderr: str = '') -> bool:
+    """Whether an external program that exited like this, under a memory limit, ran out of it"""
+    if returncode < 0:
+        return -returncode in OUT_OF_MEMORY_SIGNALS
+    return returncode != 0 and any(marker in stderr for marker in OUT_OF_MEMORY_MARKERS)
+
+
+def _limited_child(connection, function: Callable, args: tuple, max_memory: int | None):
+    try:
+        if max_memory is not None:
+            set_memory_limit(max_memory)
+        try:
+            outcome = ('ok', function(*args))
+        except MemoryError:
+            outcome = ('oom', None)
+        except BaseException as e:
+            outcome = ('error', e)
+        try:
+            connection.send(outcome)
+        except MemoryError:
+            connection.send(('oom', None))
+        except Exception as e:  # The result or the error could not be pickled
+            connection.send(('error', RuntimeError(f"Could not send back the outcome: {e!r}")))
+        connection.close()
+    except MemoryError:
+        # Not even enough left to say so, and the exit code is all there is.
+        # Exiting right away also keeps multiprocessing from making it a 1.
+        os._exit(OUT_OF_MEMORY_EXIT_CODE)
+
+
+def _context():
+    import multiprocessing  # Only limited runs need it, keep it off the cold start of the launcher
+    # Forking does not need to pickle the function and its arguments, and skips
+    # the imports a fresh interpreter would need
+    if sys.platform != 'win32' and 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def call_with_limits(function: Callable, *args, limits: Limits):
+    """
+    Call a function in a child process under some limits, and return what it
+    returns. Errors in the function are raised again here.
+    """
+    context = _context()
+    receiver, sender = context.Pipe(duplex=False)
+    # Not a daemon process, so the solver can start processes of its own
+    child = context.Process(target=_limited_child, args=(sender, function, args, limits.max_memory))
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(limits.timeout):
+            raise SolverTimeout(f"Took longer than {limits.timeout:g}s")
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            # Died without a word: killed for memory by the kernel, crashed
+            # when an allocation failed in C code, or left no memory to report
+            child.join()
+            if limits.max_memory is not None and child.exitcode in (-signal.SIGKILL, -signal.SIGSEGV,
+                                                                    OUT_OF_MEMORY_EXIT_CODE):
+                raise SolverOutOfMemory(f"Used more than {format_size(limits.max_memory)}") from None
+            raise RuntimeError(f"The solver process died with exit code {child.exitcode}") from None
+    finally:
+        receiver.close()
+        if child.is_alive():
+            child.kill()
+        child.join()
+
+    if status == 'oom':
+        raise SolverOutOfMemory(f"Used more than {format_size(limits.max_memory)}")
+    if status == 'error':
+        raise value
+    return value
@@ -0,0 +1,79 @@
+"""
+Parallel map-reduce over the lines of an input, for solvers that fold lines
+independently of each other.
+
+The input file is split into chunks that end at line ends, and every chunk is
+mapped in a worker process. Workers get only the path of the file and the
+offsets of their chunk, and read the chunk through their own memory map of the
+file, so the input itself is never pickled. Mappers get the text of their
+chunk with the line ends as they are in the file, so they should split it with
+splitlines. Binary mappers get the raw bytes of their chunk instead.
+
+What goes back to the parent is the result of the mapper on each chunk, which
+the reducer combines in the order of the chunks. The reducer must be
+associative, and the mapper must give a result for an empty input that the
+reducer can combine with anything (0 for a sum, an empty list for
+concatenation).
+
+Mappers and reducers are sent to the workers, so they have to be picklable:
+functions at the top level of a module, or functools.partial of them.
+
+Inputs that are not files (stdin, generated text), small inputs and a single
+job are mapped in this process, in one go.
+"""
+import functools
+import os
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from aoc.utils.input_source import ENCODING, InputSource
+
+T = TypeVar('T')
+
+MIN_CHUNK_SIZE = 1024 * 1024  # Bytes, smaller chunks are not worth a trip to a worker
+CHUNKS_PER_JOB = 4  # More chunks than workers, so that a slow chunk does not hold everyone up
+
+
+def _file_path(input_file: Path | InputSource) -> Path | None:
+    if isinstance(input_file, InputSource):
+        return input_file.path
+    return Path(input_file)
+
+
+def _whole_input(input_file: Path | InputSource, binary: bool) -> str | bytes:
+    # Decoded the same way as the chunks, line ends left as they are
+    data = input_file.read_bytes()
+    return data if binary else str(data, ENCODING)
+
+
+def _map_chunk(path: Path, start: int, end: int, mapper: Callable[[str | bytes], T], binary: bool) -> T:
+    with InputSource.from_path(path) as source, source.buffer as buffer:
+        chunk = bytes(buffer[start:end]) if binary else str(buffer[start:end], ENCODING)
+    return mapper(chunk)
+
+
+def map_reduce(input_file: Path | InputSource, mapper: Callable[[str | bytes], T], reducer: Callable[[T, T], T], *,
+               jobs: int | None = None, chunk_size: int | None = None, binary: bool = False) -> T:
+    """
+    Map the text of every chunk of the input and reduce the results. By
+    default there is a worker per CPU, and chunks are sized to give each one
+    a few of them. With binary, the mapper gets bytes instead of text.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    path = _file_path(input_file)
+    if jobs == 1 or path is None:
+        return mapper(_whole_input(input_file, binary))
+
+    with InputSource.from_path(path) as source:
+        if chunk_size is None:
+            chunk_size = max(MIN_CHUNK_SIZE, len(source) // (jobs * CHUNKS_PER_JOB) + 1)
+        chunks = source.line_chunks(chunk_size)
+    if len(chunks) < 2:
+        return mapper(_whole_input(input_file, binary))
+
+    from concurrent.futures import ProcessPoolExecutor  # Only when there is something to split
+    starts, ends = zip(*chunks)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+        results = pool.map(_map_chunk, repeat(path), starts, ends, repeat(mapper), repeat(binary))
+        return functools.reduce(reducer, results)
@@ -0,0 +1,157 @@
+"""
+Memory usage of solver calls: peak RSS, tracemalloc peak and top allocation sites.
+
+The allocation sites are those alive at (close to) the peak. A watcher thread
+polls the traced memory and takes a new snapshot every time it grows past the
+size of the last one by some margin, so only a handful of snapshots are taken
+even for long runs.
+"""
+import resource
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_TOP = 5
+SNAPSHOT_GROWTH = 1.1  # Take a new snapshot when traced memory grows 10% over the last
+POLL_INTERVAL = 0.005
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak RSS to the current RSS, so the next peak is that of the code
+    that runs after this. Only possible on Linux, returns whether it worked.
+    """
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+@dataclass
+class AllocationSite:
+    where: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryReport:
+    peak_rss: int
+    peak_rss_is_own: bool  # False if the peak RSS could not be reset, and may be older
+    traced_peak: int
+    top_sites: list[AllocationSite] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "peak_rss": self.peak_rss,
+            "peak_rss_is_own": self.peak_rss_is_own,
+            "traced_peak": self.traced_peak,
+            "top_sites": [vars(site) for site in self.top_sites],
+        }
+
+    def summary(self, title: str) -> str:
+        rss_note = "" if self.peak_rss_is_own else " (of the process, could not reset)"
+        lines = [
+            title,
+            "-" * len(title),
+            f"Peak RSS: {format_size(self.peak_rss)}{rss_note}",
+            f"Peak traced: {format_size(self.traced_peak)}",
+        ]
+        if self.top_sites:
+            lines.append("Top allocation sites near the peak:")
+            lines.extend(f"  {format_size(site.size):>10} in {site.count:>8} blocks  {site.where}"
+                         for site in self.top_sites)
+        return "\n".join(lines)
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class MemoryTracker:
+    """
+    Context manager that measures the memory used by the code in its block
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP):
+        self.top = top
+        self.report: MemoryReport | None = None
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_size = 0
+        self._started_tracing = False
+        self._rss_reset = False
+
+    def _take_snapshot(self, size: int):
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+        self._snapshot_size = size
+
+    def _watch(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._snapshot_size * SNAPSHOT_GROWTH:
+                self._take_snapshot(current)
+
+    def __enter__(self) -> 'MemoryTracker':
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._rss_reset = reset_peak_rss()
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="memory-tracker", daemon=True)
+        self._watcher.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._watcher.join()
+        current, traced_peak = tracemalloc.get_traced_memory()
+        if self._snapshot is None or current > self._snapshot_size:
+            self._take_snapshot(current)
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        top_sites = [
+            AllocationSite(where=str(stat.traceback), size=stat.size, count=stat.count)
+            for stat in self._snapshot.statistics("lineno")[:self.top]
+        ]
+        self.report = MemoryReport(
+            peak_rss=peak_rss(),
+            peak_rss_is_own=self._rss_reset,
+            traced_peak=traced_peak,
+            top_sites=top_sites,
+        )
+        self._snapshot = None
+        return False
@@ -0,0 +1,119 @@
+"""
+Scaling benchmarks: how solver runtime grows with the size of the input.
+
+Each day with synthetic inputs has a ``generator`` module in its package with:
+
+* ``generate(size: int, seed: int) -> str``, a valid input of the given size,
+* ``BASE_SIZE``, the size used as 1x,
+* ``EXPECTED_COMPLEXITY``, the expected growth exponent of each part
+  (1 for linear, 2 for quadratic...). Parts missing from it are not checked.
+* ``FACTORS``, optionally, the multiples of the base size to time when the
+  default ones would take too long or produce unusable inputs.
+
+The solvers are timed at several multiples of the base size, and a power law
+``time = c * size ** k`` is fitted to the results. Every size gets the best of
+a few samples, and fast solvers are called many times in each sample, so that
+a single hiccup of the machine does not bend the fit. A solver fails the check if
+``k`` is over the expected exponent by more than a tolerance.
+"""
+import importlib
+import math
+import time
+from dataclasses import dataclass
+from types import ModuleType
+
+from aoc.utils import InputSource, Part
+
+FACTORS = (1, 10, 100, 1000)
+TOLERANCE = 0.3
+MIN_FIT_TIME = 0.001  # Faster runs are mostly fixed overhead, and only distort the fit
+MIN_SAMPLE_TIME = 0.05  # Fast solvers are called in batches that take at least this long, to even out noise
+STABLE_TIME = 0.1  # Runs this long are not repeated, they are stable enough
+REPEAT = 5  # Samples per size, the best one counts
+DEFAULT_SEED = 2023
+
+
+@dataclass
+class ScalingResult:
+    part: Part
+    sizes: list[int]
+    times: list[float]
+    exponent: float
+    expected: float
+
+    @property
+    def ok(self) -> bool:
+        return self.exponent <= self.expected + TOLERANCE
+
+    def summary(self) -> str:
+        timings = ", ".join(f"{size}: {seconds:.4f}s" for size, seconds in zip(self.sizes, self.times))
+        verdict = "✅" if self.ok else "❌"
+        return (f"{self.part.name.capitalize()} part: size^{self.exponent:.2f} "
+                f"(expected size^{self.expected:g}) {verdict}  [{timings}]")
+
+
+def get_generator(module: ModuleType) -> ModuleType | None:
+    """The generator module of a day, None if it does not have one"""
+    try:
+        return importlib.import_module(f"{module.__name__}.generator")
+    except ModuleNotFoundError as e:
+        if e.name != f"{module.__name__}.generator":
+            raise
+        return None
+
+
+def fit_exponent(sizes: list[int], times: list[float]) -> float:
+    """
+    Least squares slope of log(time) over log(size), from the runs that took long
+    enough to be meaningful (at least the two largest)
+    """
+    points = [(size, seconds) for size, seconds in zip(sizes, times) if seconds >= MIN_FIT_TIME]
+    if len(points) < 2:
+        points = list(zip(sizes, times))[-2:]
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(max(seconds, 1e-9)) for _, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def _time_calls(solver, source: InputSource, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        solver(source)
+    return time.perf_counter() - start
+
+
+def time_solver(solver, source: InputSource, repeat: int) -> float:
+    """
+    Best time of a call over repeat samples. Samples of fast solvers batch
+    enough calls to take MIN_SAMPLE_TIME, slow ones are timed only once.
+    """
+    best = _time_calls(solver, source, 1)
+    if best >= STABLE_TIME:
+        return best
+    calls = max(1, math.ceil(MIN_SAMPLE_TIME / max(best, 1e-6)))
+    for _ in range(repeat):
+        best = min(best, _time_calls(solver, source, calls) / calls)
+    return best
+
+
+def check_scaling(module: ModuleType, part: Part = Part.ALL, *, factors: tuple[int, ...] | None = None,
+                  seed: int = DEFAULT_SEED, repeat: int = REPEAT) -> list[ScalingResult]:
+    """Time the solvers of a day over generated inputs of growing sizes"""
+    generator = get_generator(module)
+    if generator is None:
+        raise ValueError(f"{module.__name__} has no input generator")
+    factors = factors or getattr(generator, 'FACTORS', FACTORS)
+    sizes = [generator.BASE_SIZE * factor for factor in factors]
+    sources = [InputSource.from_text(generator.generate(size, seed)) for size in sizes]
+
+    results = []
+    for checked_part, expected in generator.EXPECTED_COMPLEXITY.items():
+        if not part.includes(checked_part):
+            continue
+        solver = module.solve_first if checked_part == Part.FIRST else module.solve_second
+        times = [time_solver(solver, source, repeat) for source in sources]
+        results.append(ScalingResult(checked_part, sizes, times, fit_exponent(sizes, times), expected))
+    return results
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from aoc.utils import Part
+from aoc.utils.budget import MIB, Budget, SolverRun, load_budgets, measure
+
+
+def test_load_budgets(tmp_path):
+    path = tmp_path / 'budget.json'
+    assert load_budgets(path) == {}
+
+    path.write_text(json.dumps({"first": {"seconds": 0.5, "memory_mib": 50}, "second": {"seconds": 2}}))
+    assert load_budgets(path) == {
+        Part.FIRST: Budget(seconds=0.5, memory=50 * MIB),
+        Part.SECOND: Budget(seconds=2),
+    }
+
+
+def test_load_budgets_rejects_unknown_limits(tmp_path):
+    path = tmp_path / 'budget.json'
+    path.write_text(json.dumps({"first": {"minutes": 1}}))
+    with pytest.raises(ValueError, match="minutes"):
+        load_budgets(path)
+
+
+def test_overruns():
+    budget = Budget(seconds=1, memory=10 * MIB)
+    assert SolverRun('solver', 0.5, 5 * MIB, budget).overruns() == []
+    assert len(SolverRun('solver', 1.5, 20 * MIB, budget).overruns()) == 2
+    # Unknown peaks and missing budgets are never over
+    assert SolverRun('solver', 0.5, None, budget).overruns() == []
+    assert SolverRun('solver', 100, 100 * MIB).overruns() == []
+
+
+def test_measure():
+    answer, run = measure('solver', lambda input_file: input_file.upper(), 'abc', Budget(seconds=60))
+    assert answer == 'ABC'
+    assert run.name == 'solver'
+    assert 0 <= run.seconds < 60
+    assert run.overruns() == []
+    assert run.summary().endswith('solver ✅')
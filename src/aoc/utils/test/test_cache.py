@@ -0,0 +1,73 @@
+import os
+import types
+
+from aoc.days import day01
+from aoc.utils import Part
+from aoc.utils.cache import ResultCache, cached_solver, source_digest
+
+
+def _counting_solver(calls: list):
+    def solve(input_file):
+        calls.append(input_file)
+        return str(len(calls))
+
+    return solve
+
+
+def test_cached_solver(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\n')
+    calls = []
+    solver = cached_solver(cache, 1, Part.FIRST, day01, _counting_solver(calls))
+
+    assert solver(input_file) == '1'
+    assert solver(input_file) == '1'
+    assert len(calls) == 1
+
+    # A different input is a different entry
+    input_file.write_text('2abc3\n')
+    assert solver(input_file) == '2'
+
+
+def test_cached_solver_refresh(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\n')
+    calls = []
+    cached_solver(cache, 1, Part.FIRST, day01, _counting_solver(calls))(input_file)
+    refreshed = cached_solver(cache, 1, Part.FIRST, day01, _counting_solver(calls), refresh=True)
+    assert refreshed(input_file) == '2'
+    assert cache.get(cache.key(1, Part.FIRST, day01, input_file)) == '2'
+
+
+def test_key_depends_on_part(tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    input_file = tmp_path / 'input'
+    input_file.write_text('1abc2\n')
+    assert cache.key(1, Part.FIRST, day01, input_file) != cache.key(1, Part.SECOND, day01, input_file)
+
+
+def test_eviction(tmp_path):
+    cache = ResultCache(tmp_path / 'cache', max_entries=3)
+    for n in range(5):
+        cache.put(f'key{n}', str(n))
+        # Make the use order clear to the eviction regardless of timestamp resolution
+        os.utime(cache.directory / f'key{n}.json', (n, n))
+    cache.evict()
+    assert sorted(path.stem for path in cache.directory.glob('*.json')) == ['key2', 'key3', 'key4']
+
+
+def test_source_digest_follows_edits(tmp_path):
+    package = tmp_path / 'day_edited'
+    package.mkdir()
+    source = package / '__init__.py'
+    source.write_text('ANSWER = 1\n')
+    module = types.ModuleType('day_edited')
+    module.__file__ = str(source)
+
+    before = source_digest(module)
+    assert source_digest(module) == before
+    # Long-lived processes see the edit without importing anything again
+    source.write_text('ANSWER = 22\n')
+    assert source_digest(module) != before
@@ -0,0 +1,162 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aocd
+import pytest
+from aocd.exceptions import AocdError, DeadTokenError, PuzzleLockedError
+from urllib3.exceptions import MaxRetryError
+
+from aoc.utils.download import AocdTransport, HttpTransport, TransientError, download_input, download_inputs
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves inputs with the AoC URL layout, failing the first requests if asked"""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.inputs = {}
+        self.failures_left = 0
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append((self.path, self.headers.get('Cookie')))
+            failing = self.server.failures_left > 0
+            self.server.failures_left -= failing
+        parts = self.path.strip('/').split('/')  # 2023/day/N/input
+        day = int(parts[2]) if len(parts) == 4 else None
+        if failing:
+            self.send_response(503)
+            self.end_headers()
+        elif day not in self.server.inputs:
+            self.send_response(404)
+            self.end_headers()
+        else:
+            body = self.server.inputs[day].encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def transport(server):
+    return HttpTransport(server.base_url, session='secret')
+
+
+def test_download_input(server, transport, tmp_path):
+    server.inputs[1] = "1abc2\n"
+    input_path = tmp_path / 'day01' / 'input'
+    assert download_input(1, transport=transport, input_path=input_path)
+    assert input_path.read_text() == "1abc2\n"
+    assert server.requests == [('/2023/day/1/input', 'session=secret')]
+    # No temporary files left behind, only the record of what was downloaded
+    assert sorted(path.name for path in input_path.parent.iterdir()) == ['.input.sha256', 'input']
+
+
+def test_existing_input_is_not_downloaded(server, transport, tmp_path):
+    server.inputs[1] = "already here\n"
+    input_path = tmp_path / 'input'
+    assert download_input(1, transport=transport, input_path=input_path)
+    assert not download_input(1, transport=transport, input_path=input_path)
+    assert len(server.requests) == 1
+
+
+@pytest.mark.parametrize('damaged', ("", "1abc", "1abc2\nedited\n"))
+def test_damaged_input_is_downloaded_again(server, transport, tmp_path, damaged):
+    server.inputs[1] = "1abc2\n"
+    input_path = tmp_path / 'input'
+    download_input(1, transport=transport, input_path=input_path)
+    input_path.write_text(damaged)
+    assert download_input(1, transport=transport, input_path=input_path)
+    assert input_path.read_text() == "1abc2\n"
+
+
+def test_input_that_was_not_downloaded_is_checked(server, transport, tmp_path):
+    server.inputs[1] = "same\n"
+    input_path = tmp_path / 'input'
+    input_path.write_text("same\n")
+    # Fetched to check it, but left alone
+    assert not download_input(1, transport=transport, input_path=input_path)
+    assert not download_input(1, transport=transport, input_path=input_path)
+    assert len(server.requests) == 1
+
+
+def test_forced_download_of_same_content(server, transport, tmp_path):
+    server.inputs[1] = "same\n"
+    input_path = tmp_path / 'input'
+    input_path.write_text("same\n")
+    assert not download_input(1, transport=transport, input_path=input_path, force=True)
+    assert len(server.requests) == 1
+
+
+def test_retries(server, transport, tmp_path):
+    server.inputs[1] = "content\n"
+    server.failures_left = 2
+    input_path = tmp_path / 'input'
+    assert download_input(1, transport=transport, input_path=input_path, retries=2, backoff=0)
+    assert len(server.requests) == 3
+
+
+def test_retries_exhausted(server, transport, tmp_path):
+    server.failures_left = 5
+    input_path = tmp_path / 'input'
+    with pytest.raises(TransientError):
+        download_input(1, transport=transport, input_path=input_path, retries=1, backoff=0)
+    assert not input_path.exists()
+
+
+def test_download_inputs(server, transport, tmp_path):
+    server.inputs.update({day: f"input {day}\n" for day in range(1, 10)})
+    download_input(3, transport=transport, input_path=tmp_path / 'input3')
+    server.requests.clear()
+    results = download_inputs(list(range(1, 11)), jobs=4, transport=transport, retries=0,
+                              input_path_for=lambda day: tmp_path / f'input{day}')
+
+    assert results[3] is False
+    assert all(results[day] is True for day in range(1, 10) if day != 3)
+    assert isinstance(results[10], Exception)  # Not found
+    assert all((tmp_path / f'input{day}').read_text() == f"input {day}\n" for day in range(1, 10))
+    assert len(server.requests) == 9  # All but the one already there
+
+
+@pytest.mark.parametrize('error,transient', (
+        (AocdError("HTTP 503 at https://adventofcode.com/2023/day/1/input"), True),
+        (AocdError("HTTP 429 at https://adventofcode.com/2023/day/1/input"), True),
+        (AocdError("HTTP 400 at https://adventofcode.com/2023/day/1/input"), False),
+        (MaxRetryError(None, "https://adventofcode.com/2023/day/1/input"), True),
+        (ConnectionResetError(), True),
+        (DeadTokenError("the token expired"), False),
+        (PuzzleLockedError("2023/25 not available yet"), False),
+))
+def test_aocd_transport_errors(monkeypatch, error, transient):
+    def get_data(day, year):
+        raise error
+
+    monkeypatch.setattr(aocd, 'get_data', get_data)
+    with pytest.raises(Exception) as raised:
+        AocdTransport().fetch(1, 2023)
+    assert isinstance(raised.value, TransientError) == transient
@@ -0,0 +1,105 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import aoc
+from aoc.utils import Part
+from aoc.utils import external
+from aoc.utils.external import ExternalSolverError, ExternalSolverTimeout, ExternalSolverWorker, get_worker
+
+SRC_DIR = str(Path(aoc.__file__).resolve().parent.parent)
+
+WORKER_SCRIPT = """
+import os, sys, time
+sys.path.insert(0, sys.argv[1])
+from aoc.utils.external import serve
+
+def solve(day, part, input_file):
+    if day == 1:
+        return f"{part.name} {len(input_file.read_text())} {os.getpid()}"
+    if day == 2:
+        raise ValueError("bad input")
+    if day == 3:
+        time.sleep(10)
+    if day == 4:
+        sys.exit(3)
+    if day == 6:
+        print("chatty solver")
+        return "6"
+    if day == 7:
+        os.write(1, b"\\x00\\x00\\x00\\x03bad")  # Past the redirection of print to stderr
+        time.sleep(10)
+    return None
+
+serve(solve)
+"""
+
+
+@pytest.fixture
+def worker():
+    with ExternalSolverWorker([sys.executable, "-c", WORKER_SCRIPT, SRC_DIR]) as worker:
+        yield worker
+
+
+def test_worker_is_reused(worker, tmp_path):
+    input_file = tmp_path / "input"
+    input_file.write_text("12345")
+    first = worker.solve(1, Part.FIRST, input_path=input_file)
+    second = worker.solve(1, Part.SECOND, input_data="123")
+    assert first.split()[:2] == ["FIRST", "5"]
+    assert second.split()[:2] == ["SECOND", "3"]
+    assert first.split()[2] == second.split()[2] != str(os.getpid())
+
+
+def test_unimplemented(worker):
+    assert worker.solve(5, Part.FIRST, input_data="") is None
+
+
+def test_error_propagation(worker):
+    with pytest.raises(ExternalSolverError, match="ValueError: bad input"):
+        worker.solve(2, Part.FIRST, input_data="")
+    # The worker survives errors in the solver
+    assert worker.running
+    assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+
+
+def test_timeout(worker):
+    with pytest.raises(ExternalSolverTimeout):
+        worker.solve(3, Part.FIRST, input_data="", timeout=0.5)
+    assert not worker.running
+    # And it comes back for the next request
+    assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+
+
+def test_worker_exit(worker):
+    with pytest.raises(ExternalSolverError, match="rc=3"):
+        worker.solve(4, Part.FIRST, input_data="")
+    assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+
+
+def test_solver_output_goes_to_stderr(worker):
+    assert worker.solve(6, Part.FIRST, input_data="") == "6"
+    assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+
+
+def test_invalid_response(worker):
+    with pytest.raises(ExternalSolverError, match="Invalid response"):
+        worker.solve(7, Part.FIRST, input_data="", timeout=5)
+    # Out of sync with the protocol, so it is started again for the next request
+    assert not worker.running
+    assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+
+
+def test_shared_workers(monkeypatch):
+    monkeypatch.setattr(external, '_workers', {})
+    command = [sys.executable, "-c", WORKER_SCRIPT, SRC_DIR]
+    worker = get_worker(command)
+    try:
+        assert get_worker(list(command)) is worker
+        assert get_worker([*command, "other"]) is not worker
+        assert worker.solve(1, Part.FIRST, input_data="1").startswith("FIRST")
+    finally:
+        external._close_workers()
+    assert not worker.running
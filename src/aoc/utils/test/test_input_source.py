@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from aoc.utils import InputSource
+
+CONTENT = "first line\nsecond\r\n\nlast"
+LINES = ["first line", "second", "", "last"]
+
+
+@pytest.fixture(params=['path', 'bytes', 'text'])
+def source(request, tmp_path):
+    if request.param == 'path':
+        input_file = tmp_path / 'input'
+        input_file.write_bytes(CONTENT.encode())
+        with InputSource.from_path(input_file) as source:
+            yield source
+    elif request.param == 'bytes':
+        with InputSource.from_bytes(CONTENT.encode()) as source:
+            yield source
+    else:
+        with InputSource.from_text(CONTENT) as source:
+            yield source
+
+
+def test_lines(source):
+    lines = list(source.lines())
+    assert all(isinstance(line, memoryview) for line in lines)
+    assert [str(line, 'utf-8') for line in lines] == LINES
+    del lines  # Release the views before closing the map
+
+
+def test_path_compatibility(source):
+    assert source.read_bytes() == CONTENT.encode()
+    assert source.read_text().splitlines() == LINES
+    with source.open("r") as fin:
+        assert [line.rstrip("\n") for line in fin] == LINES
+    with source.open("rb") as fin:
+        assert fin.read() == CONTENT.encode()
+    assert source.size_hint == len(CONTENT.encode())
+
+
+def test_empty_file(tmp_path):
+    input_file = tmp_path / 'input'
+    input_file.write_text('')
+    source = InputSource.from_path(input_file)
+    assert list(source.lines()) == []
+    assert source.text() == ''
+
+
+def test_trailing_newline():
+    assert [bytes(line) for line in InputSource.from_text("a\nb\n").lines()] == [b"a", b"b"]
+
+
+def test_read_only():
+    with pytest.raises(ValueError):
+        InputSource.from_text("a").open("w")
+
+
+def test_path_like(source):
+    with open(source, 'rb') as fin:
+        assert fin.read() == CONTENT.encode()
+    assert str(source) == os.fspath(source)
+
+
+def test_temporary_file_is_removed_on_close():
+    source = InputSource.from_text(CONTENT)
+    path = Path(source)
+    assert path.read_bytes() == CONTENT.encode()
+    source.close()
+    assert not path.exists()
+
+
+def test_in_memory_bytes_are_not_copied():
+    data = CONTENT.encode()
+    source = InputSource.from_bytes(data)
+    assert source.read_bytes() is data
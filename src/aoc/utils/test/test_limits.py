@@ -0,0 +1,82 @@
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+from aoc.utils import run_external_solver
+from aoc.utils.limits import (Limits, SolverOutOfMemory, SolverTimeout, call_with_limits, parse_size,
+                              ran_out_of_memory)
+
+MIB = 1024 * 1024
+LIMITS = Limits(timeout=2, max_memory=512 * MIB)
+
+
+@pytest.mark.parametrize('value,expected', (
+        ('1048576', MIB),
+        ('512M', 512 * MIB),
+        ('512MiB', 512 * MIB),
+        ('1.5g', 1536 * MIB),
+        ('64k', 64 * 1024),
+))
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize('value', ('', 'lots', '-1M', '0'))
+def test_parse_size_invalid(value):
+    with pytest.raises(ValueError):
+        parse_size(value)
+
+
+def _fail():
+    raise ValueError("broken solver")
+
+
+def test_call_with_limits():
+    assert call_with_limits(sum, [1, 2, 3], limits=LIMITS) == 6
+    with pytest.raises(ValueError, match="broken solver"):
+        call_with_limits(_fail, limits=LIMITS)
+
+
+def test_call_with_limits_timeout():
+    start = time.monotonic()
+    with pytest.raises(SolverTimeout):
+        call_with_limits(time.sleep, 10, limits=Limits(timeout=0.2))
+    assert time.monotonic() - start < 5
+
+
+def test_call_with_limits_memory():
+    with pytest.raises(SolverOutOfMemory):
+        call_with_limits(bytearray, 1024 * MIB, limits=LIMITS)
+
+
+def test_call_with_limits_crash_is_not_out_of_memory():
+    with pytest.raises(RuntimeError, match="exit code 1"):
+        call_with_limits(os._exit, 1, limits=LIMITS)
+
+
+def test_external_solver_limits():
+    assert run_external_solver([sys.executable, '-c', 'print(42)'], timeout=10).strip() == '42'
+    with pytest.raises(SolverTimeout):
+        run_external_solver([sys.executable, '-c', 'import time; time.sleep(10)'], timeout=0.5)
+    # Python exits with a MemoryError and rc=1, told apart from other failures by its stderr
+    with pytest.raises(SolverOutOfMemory):
+        run_external_solver([sys.executable, '-c', 'bytearray(1 << 30)'], max_memory=256 * MIB)
+    with pytest.raises(Exception, match="rc=1") as failure:
+        run_external_solver([sys.executable, '-c', 'raise SystemExit(1)'], max_memory=256 * MIB)
+    assert not isinstance(failure.value, SolverOutOfMemory)
+
+
+@pytest.mark.parametrize('returncode,stderr,expected', (
+        (-signal.SIGKILL, '', True),
+        (-signal.SIGABRT, 'memory allocation of 1073741824 bytes failed', True),
+        (1, 'Traceback (most recent call last):\nMemoryError', True),
+        (1, 'Exception in thread "main" java.lang.OutOfMemoryError: Java heap space', True),
+        (1, 'ValueError: invalid literal', False),
+        (-signal.SIGTERM, '', False),
+        (0, 'MemoryError', False),
+))
+def test_ran_out_of_memory(returncode, stderr, expected):
+    assert ran_out_of_memory(returncode, stderr) == expected
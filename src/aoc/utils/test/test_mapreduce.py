@@ -0,0 +1,73 @@
+import operator
+
+import pytest
+
+from aoc import days
+from aoc.utils import InputSource, Part, mapreduce
+from aoc.utils.mapreduce import map_reduce
+from aoc.utils.scaling import get_generator
+
+CONTENT = "".join(f"{number}\n" for number in range(1, 101))
+TOTAL = sum(range(1, 101))
+
+
+def _line_sum(text: str) -> int:
+    return sum(int(line) for line in text.splitlines())
+
+
+def _lines(text: str) -> list[str]:
+    return text.splitlines()
+
+
+@pytest.fixture
+def input_path(tmp_path):
+    path = tmp_path / 'input'
+    path.write_text(CONTENT)
+    return path
+
+
+@pytest.mark.parametrize('content', ("a\nbb\nccc\n", "a\nbb\nccc", "a\r\nbb\r\n", "\n\n\n", "one long line", ""))
+@pytest.mark.parametrize('chunk_size', (1, 2, 3, 100))
+def test_line_chunks(content, chunk_size):
+    source = InputSource.from_text(content)
+    chunks = source.line_chunks(chunk_size)
+    assert [start for start, _ in chunks] == [0, *(end for _, end in chunks)][:len(chunks)]
+    assert (chunks[-1][1] if chunks else 0) == len(content)
+    for start, end in chunks:
+        assert end - start >= min(chunk_size, len(content) - start)
+        assert end == len(content) or content[end - 1] == '\n'
+
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 64, 10_000))
+def test_map_reduce(input_path, chunk_size):
+    assert map_reduce(input_path, _line_sum, operator.add, jobs=3, chunk_size=chunk_size) == TOTAL
+
+
+def test_map_reduce_keeps_the_order_of_the_chunks(input_path):
+    lines = map_reduce(input_path, _lines, operator.iadd, jobs=4, chunk_size=16)
+    assert lines == CONTENT.splitlines()
+
+
+def test_map_reduce_input_sources(input_path):
+    with InputSource.from_path(input_path) as source:
+        assert map_reduce(source, _line_sum, operator.add, jobs=2, chunk_size=16) == TOTAL
+    # Without a file behind them, they are mapped in this process
+    assert map_reduce(InputSource.from_text(CONTENT), _line_sum, operator.add, jobs=2, chunk_size=16) == TOTAL
+
+
+def test_map_reduce_empty_input(tmp_path):
+    path = tmp_path / 'input'
+    path.write_text("")
+    assert map_reduce(path, _line_sum, operator.add, jobs=2) == 0
+
+
+@pytest.mark.parametrize('day', (1, 2, 4, 7))
+def test_parallel_solvers(day, tmp_path, monkeypatch):
+    monkeypatch.setattr(mapreduce, 'MIN_CHUNK_SIZE', 256)
+    module = days.get_day(day)
+    path = tmp_path / 'input'
+    path.write_text(get_generator(module).generate(200, seed=day))
+    for part, name in ((Part.FIRST, 'solve_first'), (Part.SECOND, 'solve_second')):
+        parallel = getattr(module, f"{name}_parallel", None)
+        if parallel is not None:
+            assert parallel(path, jobs=3) == getattr(module, name)(path), part
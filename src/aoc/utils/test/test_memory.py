@@ -0,0 +1,28 @@
+import time
+
+from aoc.utils.memory import MemoryTracker, format_size
+
+
+def _allocate(blocks: int):
+    return [bytes(1000) for _ in range(blocks)]
+
+
+def test_memory_tracker():
+    tracker = MemoryTracker()
+    with tracker:
+        data = _allocate(2000)
+        time.sleep(0.05)  # Long enough for the watcher to catch the peak
+        del data
+    report = tracker.report
+    assert report.traced_peak >= 2000 * 1000
+    assert report.peak_rss > 0
+    # The peak was gone at the end, but the sites still show what made it
+    top = report.top_sites[0]
+    assert top.where.startswith(__file__)
+    assert top.size >= 1000 * 1000
+
+
+def test_format_size():
+    assert format_size(10) == "10 B"
+    assert format_size(1536) == "1.5 KiB"
+    assert format_size(3 * 1024 ** 3) == "3.0 GiB"
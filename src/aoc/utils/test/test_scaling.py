@@ -0,0 +1,75 @@
+import pytest
+
+from aoc import days
+from aoc.utils import InputSource, Part
+from aoc.utils.scaling import (FACTORS, MIN_SAMPLE_TIME, ScalingResult, check_scaling, fit_exponent,
+                               get_generator, time_solver)
+
+GENERATED_DAYS = [day for day in days.available_days() if get_generator(days.get_day(day)) is not None]
+
+
+def test_fit_exponent():
+    sizes = [1, 10, 100, 1000]
+    assert fit_exponent(sizes, [0.001 * size for size in sizes]) == pytest.approx(1)
+    assert fit_exponent(sizes, [0.001 * size ** 2 for size in sizes]) == pytest.approx(2)
+    # Runs too fast to measure are left out of the fit
+    assert fit_exponent(sizes, [1e-7, 1e-6, 0.01, 1.0]) == pytest.approx(2)
+
+
+def test_time_solver_batches_fast_calls():
+    calls = []
+    best = time_solver(calls.append, InputSource.from_text(""), repeat=2)
+    assert len(calls) > 3  # One call to size it up, then two samples of many calls
+    assert best < MIN_SAMPLE_TIME
+
+
+def test_scaling_result_ok():
+    assert ScalingResult(Part.FIRST, [1, 10], [0.1, 1.0], 1.0, 1).ok
+    assert ScalingResult(Part.FIRST, [1, 10], [0.1, 1.0], 1.2, 1).ok
+    assert not ScalingResult(Part.FIRST, [1, 10], [0.1, 10.0], 2.0, 1).ok
+
+
+def test_days_have_generators():
+    assert GENERATED_DAYS
+
+
+@pytest.mark.parametrize('day', GENERATED_DAYS)
+def test_generator_interface(day):
+    generator = get_generator(days.get_day(day))
+    assert callable(generator.generate)
+    assert isinstance(generator.BASE_SIZE, int) and generator.BASE_SIZE > 0
+    assert generator.EXPECTED_COMPLEXITY and set(generator.EXPECTED_COMPLEXITY) <= {Part.FIRST, Part.SECOND}
+    assert all(factor > 0 for factor in getattr(generator, 'FACTORS', FACTORS))
+
+
+@pytest.mark.parametrize('day', GENERATED_DAYS)
+def test_generator_is_deterministic(day):
+    generator = get_generator(days.get_day(day))
+    size = generator.BASE_SIZE * 3
+    assert generator.generate(size, seed=1) == generator.generate(size, seed=1)
+    assert generator.generate(size, seed=1) != generator.generate(size, seed=2)
+
+
+@pytest.mark.parametrize('day', GENERATED_DAYS)
+def test_generated_input_is_solvable(day):
+    module = days.get_day(day)
+    generator = get_generator(module)
+    source = InputSource.from_text(generator.generate(generator.BASE_SIZE * 10, seed=1))
+    for part in generator.EXPECTED_COMPLEXITY:
+        solver = module.solve_first if part == Part.FIRST else module.solve_second
+        assert solver(source) is not None
+
+
+def test_check_scaling_only_checks_the_part_asked_for():
+    module = days.get_day(1)
+    results = check_scaling(module, Part.SECOND, factors=(1, 2), repeat=1)
+    assert [result.part for result in results] == [Part.SECOND]
+    base_size = get_generator(module).BASE_SIZE
+    assert results[0].sizes == [base_size, base_size * 2]
+
+
+@pytest.mark.scaling
+@pytest.mark.parametrize('day', GENERATED_DAYS)
+def test_scaling(day):
+    results = check_scaling(days.get_day(day))
+    assert all(result.ok for result in results), "\n".join(result.summary() for result in results)
@@ -0,0 +1,89 @@
+import logging
+import types
+
+import pytest
+
+from aoc import days
+from aoc.launcher.args import parse_args
+from aoc.utils.tracing import enable_tracing, is_tracing, lazy, measure_overhead
+
+
+@pytest.fixture
+def module():
+    module = types.ModuleType('aoc.days.day_traced')
+    module._debug = False
+    yield module
+    logging.getLogger(module.__name__).setLevel(logging.NOTSET)
+
+
+class _Recorder(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+
+def test_lazy_is_only_computed_when_formatted(module):
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return 42
+
+    log = logging.getLogger(module.__name__)
+    recorder = _Recorder()
+    log.addHandler(recorder)
+    log.propagate = False  # Only format it once, for the recorder
+    try:
+        log.setLevel(logging.INFO)
+        log.debug("value=%s", lazy(expensive))
+        assert calls == []
+
+        log.setLevel(logging.DEBUG)
+        log.debug("value=%s", lazy(expensive))
+        assert calls == [1]
+        assert recorder.messages == ["value=42"]
+    finally:
+        log.removeHandler(recorder)
+        log.propagate = True
+
+
+def test_enable_tracing(module):
+    assert not is_tracing(module)
+    enable_tracing(module)
+    assert module._debug is True
+    assert logging.getLogger(module.__name__).level == logging.DEBUG
+
+    enable_tracing(module, False)
+    assert module._debug is False
+    assert logging.getLogger(module.__name__).level == logging.NOTSET
+
+
+def test_debug_flag_enables_tracing_of_the_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging, 'basicConfig', lambda **kwargs: None)
+    input_file = tmp_path / 'input'
+    input_file.write_text("1abc2\n")
+    module = days.get_day(1)
+    try:
+        parse_args(['aoc', '--debug', 'run', '--day', '1', '--input', str(input_file)])
+        assert is_tracing(module)
+    finally:
+        enable_tracing(module, False)
+
+
+def test_measure_overhead(module):
+    log = logging.getLogger(module.__name__)
+    traced = []
+
+    def solver(_input_file):
+        if module._debug:
+            log.debug("tracing %s", lazy(lambda: traced.append(1)))
+        return "1"
+
+    timings = measure_overhead(solver, None, module, repeat=2)
+    assert set(timings) == {"off", "on"}
+    assert len(traced) == 2  # Formatted on every run with tracing on, never with it off
+    assert not is_tracing(module)
+    assert log.propagate and log.handlers == []
@@ -0,0 +1,100 @@
+"""
+Debug tracing that costs nothing when it is off.
+
+Every day module has a ``_debug`` flag, False unless the launcher runs with
+``--debug``. Tracing in a hot loop goes behind it, with the message formatted
+by logging only if it is emitted::
+
+    if _debug:
+        log.debug("digits=%s calibration=%s", digits, calibration)
+
+When off, that is a global lookup and a jump, where an unguarded
+``log.debug(f"{digits=}")`` builds the string every time just to throw it
+away, and even ``log.debug("%s", digits)`` pays for a call and a level check.
+
+Arguments that are expensive to compute, and not just to format, can be
+wrapped in ``lazy`` so they are only computed when the message is emitted.
+"""
+import logging
+import time
+from types import ModuleType
+from typing import Callable
+
+DEBUG_FLAG = '_debug'
+
+
+class lazy:
+    """A log message argument computed when, and only if, the message is formatted"""
+    __slots__ = ('function',)
+
+    def __init__(self, function: Callable[[], object]):
+        self.function = function
+
+    def __str__(self):
+        return str(self.function())
+
+    def __repr__(self):
+        return repr(self.function())
+
+
+def is_tracing(module: ModuleType) -> bool:
+    return bool(getattr(module, DEBUG_FLAG, False))
+
+
+def enable_tracing(module: ModuleType, enabled: bool = True):
+    """Switch the tracing of a module on or off, and let its DEBUG messages through when on"""
+    setattr(module, DEBUG_FLAG, enabled)
+    logger = logging.getLogger(module.__name__)
+    logger.setLevel(logging.DEBUG if enabled else logging.NOTSET)
+
+
+class _FormatAndDrop(logging.Handler):
+    def emit(self, record: logging.LogRecord):
+        self.format(record)
+
+
+def measure_overhead(solver: Callable, input_file, module: ModuleType, repeat: int = 5) -> dict[str, float]:
+    """
+    Best time of a solver with tracing off, and with it on but with every
+    message formatted and dropped, which is the cost of the tracing itself
+    """
+    logger = logging.getLogger(module.__name__)
+    was_tracing, propagate, handlers = is_tracing(module), logger.propagate, logger.handlers
+    timings = {}
+    try:
+        logger.propagate, logger.handlers = False, [_FormatAndDrop()]
+        for label, enabled in (("off", False), ("on", True)):
+            enable_tracing(module, enabled)
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                solver(input_file)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+    finally:
+        enable_tracing(module, was_tracing)
+        logger.propagate, logger.handlers = propagate, handlers
+    return timings
+
+
+def main():
+    """Overhead of tracing in the solvers of the days with a generator, on large generated inputs"""
+    from aoc import days
+    from aoc.utils import InputSource, Part
+    from aoc.utils.scaling import get_generator
+
+    for day in days.available_days():
+        module = days.get_day(day)
+        generator = get_generator(module)
+        if generator is None:
+            continue
+        source = InputSource.from_text(generator.generate(generator.BASE_SIZE * 100, seed=day))
+        for part in generator.EXPECTED_COMPLEXITY:  # The parts that can take generated inputs
+            name = 'solve_first' if part == Part.FIRST else 'solve_second'
+            timings = measure_overhead(getattr(module, name), source, module)
+            print(f"Day {day:2d} {name:<12}  off: {timings['off'] * 1000:8.2f} ms  "
+                  f"on: {timings['on'] * 1000:8.2f} ms  (x{timings['on'] / timings['off']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,163 @@
+import datetime
+import json
 import logging
+import warnings
 from pathlib import Path
 from textwrap import dedent
 import pytest
 
+from aoc import days
+from aoc.utils import InputSource, Part
+from aoc.utils.budget import FILE_NAME_BUDGET, SolverRun, load_budgets, measure
+from aoc.utils.cache import ResultCache, cache_enabled_by_env, cached_solver
+from aoc.utils.limits import Limits, LimitExceeded, SolverTimeout, call_with_limits, parse_size
+from aoc.utils.memory import MemoryReport, MemoryTracker
+from aoc.utils.tracing import enable_tracing, is_tracing
+
 FILE_NAME_INPUT = 'input'
 FILE_NAME_SOLUTION_PART_1 = 'part1.solution'
 FILE_NAME_SOLUTION_PART_2 = 'part2.solution'
 
+# Tests that solve the real input, and the part they solve
+SOLUTION_TESTS = {
+    'test_first_solution': Part.FIRST,
+    'test_second_solution': Part.SECOND,
+}
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup('aoc')
+    group.addoption('--aoc-cache', action='store_true',
+                    help='Take the answers of the real input tests from the result cache when code and '
+                         'input did not change')
+    group.addoption('--aoc-cache-refresh', action='store_true',
+                    help='Solve the real input tests again and update the result cache')
+    group.addoption('--trace-memory', action='store_true',
+                    help='Report peak RSS, tracemalloc peak and top allocation sites of every solver call '
+                         'in the real input tests')
+    group.addoption('--trace-memory-log', default=None, metavar='FILE',
+                    help='Append the memory reports of --trace-memory to FILE as JSON lines')
+    group.addoption('--perf-budget', choices=('warn', 'fail', 'off'), default='warn',
+                    help='What to do when a real input test goes over the time or memory budget of its '
+                         'day: warn (default), fail the test, or not even measure')
+    group.addoption('--aoc-timeout', type=float, default=None, metavar='SECONDS',
+                    help='Fail a real input test whose solver takes longer than this, instead of waiting')
+    group.addoption('--aoc-max-memory', type=parse_size, default=None, metavar='SIZE',
+                    help='Fail a real input test whose solver needs more memory than this (like 512M, '
+                         'interpreter included)')
+    group.addoption('--aoc-trace', action='store_true',
+                    help='Switch on the debug tracing of the days under test, see aoc.utils.tracing')
+    group.addoption('--scaling', action='store_true',
+                    help='Run the scaling tests, which time the solvers over large generated inputs')
+
+
+def pytest_configure(config: pytest.Config):
+    config.addinivalue_line('markers', 'scaling: slow test of how a solver grows with its input, '
+                                       'only runs with --scaling')
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    if config.getoption('scaling', default=False):
+        return
+    skip_scaling = pytest.mark.skip(reason='Scaling tests only run with --scaling')
+    for item in items:
+        if 'scaling' in item.keywords:
+            item.add_marker(skip_scaling)
+
+
+memory_reports_key = pytest.StashKey[list[tuple[str, MemoryReport]]]()
+solver_runs_key = pytest.StashKey[list[SolverRun]]()
+
+
+class PerfBudgetWarning(UserWarning):
+    pass
+
+
+def _solver_name(part: Part) -> str:
+    return 'solve_first' if part == Part.FIRST else 'solve_second'
+
+
+@pytest.fixture(autouse=True)
+def bounded_solution(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """
+    Run the solver of a real input test in a child process under the time and
+    memory limits, if any. Autouse fixtures are set up in alphabetical order, so
+    this is the innermost wrapper of the solver, and the others (cache, memory,
+    budgets) stay in this process.
+    """
+    part = SOLUTION_TESTS.get(request.node.originalname)
+    limits = Limits(request.config.getoption('aoc_timeout', default=None),
+                    request.config.getoption('aoc_max_memory', default=None))
+    if part is None or not limits:
+        return
+    module = days.get_day(request.getfixturevalue('tested_day'))
+    solver_name = _solver_name(part)
+    solver = getattr(module, solver_name)
+
+    def bounded_solver(input_file):
+        try:
+            return call_with_limits(solver, input_file, limits=limits)
+        except LimitExceeded as e:
+            status = 'TIMEOUT' if isinstance(e, SolverTimeout) else 'OOM'
+            pytest.fail(f"{status} in {module.__name__}.{solver_name}: {e}", pytrace=False)
+
+    monkeypatch.setattr(module, solver_name, bounded_solver)
+
+
+@pytest.fixture(autouse=True)
+def day_tracing(request: pytest.FixtureRequest):
+    """
+    Switch on the tracing of the day under test for the length of the test, if enabled
+    """
+    if not request.config.getoption('aoc_trace', default=False):
+        yield
+        return
+    day_module_name = request.path.resolve().parent.parent.name
+    module = days.get_day(int(day_module_name[3:])) if day_module_name.startswith('day') else None
+    if module is None:
+        yield
+        return
+    was_tracing = is_tracing(module)
+    enable_tracing(module)
+    yield
+    enable_tracing(module, was_tracing)
+
+
+@pytest.fixture(autouse=True)
+def cached_solution(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """
+    Route the solver of a real input test through the result cache, if enabled
+    """
+    part = SOLUTION_TESTS.get(request.node.originalname)
+    refresh = request.config.getoption('aoc_cache_refresh', default=False)
+    enabled = refresh or request.config.getoption('aoc_cache', default=False) or cache_enabled_by_env()
+    if part is None or not enabled:
+        return
+    day = request.getfixturevalue('tested_day')
+    module = days.get_day(day)
+    solver_name = _solver_name(part)
+    solver = cached_solver(ResultCache(), day, part, module, getattr(module, solver_name), refresh=refresh)
+    monkeypatch.setattr(module, solver_name, solver)
+
 
 @pytest.fixture
-def input_file_factory(tmp_path):
+def input_file_factory():
     """
-    Creates a temporary input file with the given contents
+    Creates an input with the given contents. It is an in-memory InputSource,
+    which solvers can use like the Path of a file. It is only written to a
+    temporary file if a solver needs a real path, like an external solver.
     """
+    sources = []
 
     def mkinput(content):
         assert content[0] == '\n'
         content = dedent(content)[1:]
-        file = tmp_path / FILE_NAME_INPUT
-        file.write_text(content)
-        return file
+        sources.append(InputSource.from_text(content, name=FILE_NAME_INPUT))
+        return sources[-1]
 
     yield mkinput
+    for source in sources:
+        source.close()
 
 
 @pytest.fixture
@@ -73,3 +209,85 @@ def part1_solution(day_data_dir: Path) -> str | None:
 @pytest.fixture
 def part2_solution(day_data_dir: Path) -> str | None:
     return _get_solution(day_data_dir / FILE_NAME_SOLUTION_PART_2)
+
+
+@pytest.fixture(autouse=True)
+def traced_memory(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """
+    Measure the memory used by every solver call of a real input test, if enabled
+    """
+    part = SOLUTION_TESTS.get(request.node.originalname)
+    if part is None or not request.config.getoption('trace_memory', default=False):
+        return
+    module = days.get_day(request.getfixturevalue('tested_day'))
+    solver_name = _solver_name(part)
+    solver = getattr(module, solver_name)
+    reports = request.config.stash.setdefault(memory_reports_key, [])
+
+    def traced_solver(input_file):
+        tracker = MemoryTracker()
+        with tracker:
+            answer = solver(input_file)
+        reports.append((f"{module.__name__}.{solver_name}", tracker.report))
+        return answer
+
+    monkeypatch.setattr(module, solver_name, traced_solver)
+
+
+@pytest.fixture(autouse=True)
+def perf_budget(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """
+    Measure the time and peak memory of every solver call of a real input
+    test, and hold them to the budget of the day
+    """
+    part = SOLUTION_TESTS.get(request.node.originalname)
+    mode = request.config.getoption('perf_budget', default='warn')
+    if part is None or mode == 'off':
+        return
+    # Neither cached answers nor solvers slowed down by tracemalloc say anything
+    config = request.config
+    if (config.getoption('aoc_cache', default=False) or config.getoption('aoc_cache_refresh', default=False)
+            or cache_enabled_by_env() or config.getoption('trace_memory', default=False)):
+        return
+    module = days.get_day(request.getfixturevalue('tested_day'))
+    budget = load_budgets(request.getfixturevalue('day_data_dir') / FILE_NAME_BUDGET).get(part)
+    solver_name = _solver_name(part)
+    solver = getattr(module, solver_name)
+    runs = config.stash.setdefault(solver_runs_key, [])
+
+    def measured_solver(input_file):
+        answer, run = measure(f"{module.__name__}.{solver_name}", solver, input_file, budget)
+        runs.append(run)
+        overruns = run.overruns()
+        if overruns:
+            message = f"{run.name} {' and '.join(overruns)}"
+            if mode == 'fail':
+                pytest.fail(message)
+            warnings.warn(PerfBudgetWarning(message))
+        return answer
+
+    monkeypatch.setattr(module, solver_name, measured_solver)
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    runs = config.stash.get(solver_runs_key, [])
+    if runs:
+        terminalreporter.section('slowest solvers')
+        terminalreporter.write_line(f"{'Time':>10} {'Peak RSS':>11}  Solver")
+        for run in sorted(runs, key=lambda run: run.seconds, reverse=True):
+            terminalreporter.write_line(run.summary())
+
+    reports = config.stash.get(memory_reports_key, [])
+    if not reports:
+        return
+    terminalreporter.section('solver memory')
+    for name, report in reports:
+        terminalreporter.write_line(report.summary(name))
+        terminalreporter.write_line('')
+
+    log_file = config.getoption('trace_memory_log', default=None)
+    if log_file:
+        timestamp = datetime.datetime.now().isoformat(timespec='seconds')
+        with open(log_file, 'a') as fout:
+            for name, report in reports:
+                fout.write(json.dumps(dict(report.as_dict(), solver=name, timestamp=timestamp)) + '\n')